@@ -0,0 +1,208 @@
+"""Group and total parsed payslips; and format tables of the results."""
+
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Tuple
+
+from .payslip import Payslip
+
+ZERO = Decimal(0)
+
+
+class Table(NamedTuple):
+    """Rows of values, under column names.
+
+    Rows may be an iterator, to format a table once as it's produced.
+    """
+
+    columns: Tuple[str, ...]
+    rows: Iterable[tuple]
+
+
+class Listing(NamedTuple):
+    """The fields of a `Payslip` that are listed; and totalled by `aggregate` by period.
+
+    A few hundred bytes, to keep many of, instead of whole payslips.
+    """
+
+    period_begin: date
+    period_end: date
+    payment_date: date
+    total_hours_worked: Decimal
+    gross: Decimal
+    net_pay: Decimal
+
+    @classmethod
+    def from_payslip(cls, payslip: Payslip) -> "Listing":
+        """Return the listed fields of `payslip`."""
+
+        return cls(
+            payslip.period_begin,
+            payslip.period_end,
+            payslip.payment_date,
+            payslip.total_hours_worked,
+            payslip.gross,
+            payslip.net_pay,
+        )
+
+
+def month(payslip: Payslip) -> str:
+    """Return the month the pay period begins; e.g., "2023-09"."""
+    return f"{payslip.period_begin:%Y-%m}"
+
+
+def quarter(payslip: Payslip) -> str:
+    """Return the quarter the pay period begins; e.g., "2023-Q3"."""
+    return f"{payslip.period_begin.year}-Q{(payslip.period_begin.month + 2) // 3}"
+
+
+def year(payslip: Payslip) -> str:
+    """Return the year the pay period begins; e.g., "2023"."""
+    return str(payslip.period_begin.year)
+
+
+PERIODS: Dict[str, Callable[[Payslip], str]] = {
+    "month": month,
+    "quarter": quarter,
+    "year": year,
+}
+GROUPINGS = [*PERIODS, "deduction"]
+
+
+def aggregate(payslips: Iterable[Payslip], by: str) -> Table:
+    """Return the totals of `payslips`, in any order, grouped `by` one of `GROUPINGS`.
+
+    Totals are accumulated in one pass, in a dict keyed by group; only
+    the groups are sorted.
+    """
+
+    if by == "deduction":
+        return _by_deduction(payslips)
+
+    key = PERIODS[by]
+    totals: Dict[str, list] = {}
+    for payslip in payslips:
+        group = totals.get(k := key(payslip))
+        if group is None:
+            group = totals[k] = [0, ZERO, ZERO, ZERO]
+        group[0] += 1
+        group[1] += payslip.total_hours_worked or ZERO
+        group[2] += payslip.gross or ZERO
+        group[3] += payslip.net_pay or ZERO
+
+    return Table(
+        (by, "payslips", "hours", "gross", "net"),
+        [(k, *v) for k, v in sorted(totals.items())],
+    )
+
+
+def _by_deduction(payslips: Iterable[Payslip]) -> Table:
+    """Return the totals of `payslips` grouped by deduction name."""
+
+    totals: Dict[str, list] = {}
+    for payslip in payslips:
+        for line in payslip.deductions:
+            group = totals.get(line.name)
+            if group is None:
+                group = totals[line.name] = [0, ZERO]
+            group[0] += 1
+            group[1] += line.current or ZERO
+
+    return Table(
+        ("deduction", "payslips", "current"), [(k, *v) for k, v in sorted(totals.items())]
+    )
+
+
+def listing(payslips: Iterable[Payslip]) -> Table:
+    """Return a `Listing` row for each of `payslips`; produced as the table is formatted."""
+
+    return Table(
+        ("begin", "end", "paydate", "hours", "gross", "net"),
+        map(Listing.from_payslip, payslips),
+    )
+
+
+def format_txt(table: Table) -> Iterator[str]:
+    """Yield the lines of `table` as aligned text; numbers to the right."""
+
+    rows = list(table.rows)
+    cells = [[_text(value) for value in row] for row in rows]
+    widths = [
+        max([len(column), *(len(row[i]) for row in cells)])
+        for i, column in enumerate(table.columns)
+    ]
+    right = [
+        bool(rows) and isinstance(rows[0][i], (int, Decimal)) for i in range(len(table.columns))
+    ]
+
+    def _line(values) -> str:
+        return " ".join(
+            value.rjust(width) if r else value.ljust(width)
+            for value, width, r in zip(values, widths, right)
+        ).rstrip()
+
+    yield _line([x.capitalize() for x in table.columns])
+    for row in cells:
+        yield _line(row)
+
+
+def format_csv(table: Table) -> Iterator[str]:
+    """Yield the lines of `table` in `CSV` file format, a row at a time."""
+
+    file = io.StringIO()
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(table.columns)
+    for row in table.rows:
+        writer.writerow([_text(value) for value in row])
+        yield from file.getvalue().splitlines()
+        file.seek(0)
+        file.truncate()
+    yield from file.getvalue().splitlines()
+
+
+def format_json(table: Table) -> Iterator[str]:
+    """Yield `table` as a `JSON` list of objects; amounts are strings, to keep them exact.
+
+    Objects are yielded a row at a time; the lines are those of `json.dumps(..., indent=1)`.
+    """
+
+    last = None  # line of the previous object; followed by "," if another follows.
+    for row in table.rows:
+        lines = json.dumps(
+            {
+                column: value if isinstance(value, int) else _text(value)
+                for column, value in zip(table.columns, row)
+            },
+            indent=1,
+        ).splitlines()
+        yield "[" if last is None else f"{last},"
+        yield from (f" {line}" for line in lines[:-1])
+        last = f" {lines[-1]}"
+
+    if last is None:
+        yield "[]"
+    else:
+        yield last
+        yield "]"
+
+
+FORMATTERS: Dict[str, Callable[[Table], Iterator[str]]] = {
+    "txt": format_txt,
+    "csv": format_csv,
+    "json": format_json,
+}
+
+
+def _text(value) -> str:
+    """Return table cell `value` as text."""
+
+    if value is None:
+        return ""
+    if isinstance(value, Decimal):
+        return f"{value:.2f}"
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
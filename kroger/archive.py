@@ -1,19 +1,28 @@
 """Kroger payslip-pdf tools; signon, parse, print, and archive payslips."""
 
+import contextlib
+import errno
 import os
 import shutil
-import subprocess
+import stat
+import sys
 from datetime import datetime
 from pathlib import Path
+from typing import List, Tuple
 
 from libcli import BaseCmd
 
-from .pdfparser import KrogerPdfParser
+from .batch import parse_payslips
+from .manifest import ArchiveManifest
+from .metrics import metrics
+from .watch import DirectoryWatcher
 
 
 class KrogerArchiveCmd(BaseCmd):
     """Copy and rename `payslip-pdf` to reflect its `paydate`."""
 
+    methods = ["copy", "hardlink", "reflink", "move"]
+
     def init_command(self) -> None:
         """Docstring."""
 
@@ -26,18 +35,79 @@ class KrogerArchiveCmd(BaseCmd):
             to `archive-path`, naming the copy, and touching its
             modification-time, to reflect the payslip's `paydate`.
 
+            With `--method`, place the archived file with a hard link or a
+            reflink (copy-on-write clone) instead of a copy, or move it;
+            unsupported links (e.g., across filesystems) fallback to a copy.
+            Note that a hard link shares the modification-time it touches.
+
+            Files whose contents are already archived are skipped, without
+            parsing them; see the manifest `archive-path/{ArchiveManifest.filename}`.
+
+            With `--sync`, also archive any new `downloads-pattern` files
+            in directory `DIR`; e.g., `%(prog)s --sync` after downloading
+            payslips with the `myinfo` command. Previously seen downloads
+            are recognized by their size and modification-time alone.
+
+            With `--watch`, keep running, and archive `downloads-pattern`
+            files as they are downloaded into directory `DIR`; each once its
+            size and modification-time have settled, and bursts of downloads
+            together, across `--jobs` processes.
+
             Configuration file `~/.kroger.toml` defines:
                 archive-path = `{self.cli.config["archive-path"]}`
+                downloads-path = `{self.cli.config["downloads-path"]}`
+                downloads-pattern = `{self.cli.config["downloads-pattern"]}`
+                pdf-engine = `{self.cli.config["pdf-engine"]}`
                 """
             ),
         )
 
+        arg = parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Parse files across `N` processes; `0` for one per cpu",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        arg = parser.add_argument(
+            "--method",
+            choices=self.methods,
+            default="copy",
+            help="Place archived files by `copy`, `hardlink`, `reflink` or `move`",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        group = parser.add_mutually_exclusive_group()
+
+        arg = group.add_argument(
+            "--sync",
+            nargs="?",
+            const=self.cli.config["downloads-path"],
+            type=Path,
+            metavar="DIR",
+            help="Archive new `downloads-pattern` files in `DIR`",
+        )
+        arg.help += f" (default: `{self.cli.config['downloads-path']}`)"
+
+        arg = group.add_argument(
+            "--watch",
+            nargs="?",
+            const=self.cli.config["downloads-path"],
+            type=Path,
+            metavar="DIR",
+            help="Archive `downloads-pattern` files as they land in `DIR`",
+        )
+        arg.help += f" (default: `{self.cli.config['downloads-path']}`)"
+
         parser.add_argument(
             "PAYSLIP_PDF_FILES",
-            nargs="+",
+            nargs="*",
             metavar="PAYSLIP-PDF",
             type=Path,
-            help="List of one or more Kroger payslip `.pdf` files",
+            help="List of zero or more Kroger payslip `.pdf` files",
         )
 
     def run(self) -> None:
@@ -48,24 +118,169 @@ class KrogerArchiveCmd(BaseCmd):
                 2, f"error: Missing `archive-path` in `{self.options['config-file']}`\n"
             )
 
-        for payslip_pdf in self.options.PAYSLIP_PDF_FILES:
-            pdf = KrogerPdfParser(payslip_pdf, archive_flag=True)
-            self._archive(payslip_pdf, pdf.payslip["payment_date"])
+        payslip_pdfs = list(self.options.PAYSLIP_PDF_FILES)
+        if self.options.sync:
+            downloads = self.options.sync.expanduser()
+            payslip_pdfs += sorted(downloads.glob(self.cli.config["downloads-pattern"]))
+        elif not payslip_pdfs and not self.options.watch:
+            self.cli.parser.exit(2, "error: Missing `PAYSLIP-PDF`, `--sync` or `--watch`\n")
+
+        archive_path = Path(self.cli.config["archive-path"]).expanduser()
+        archive_path.mkdir(parents=True, exist_ok=True)  # mkdir -p
+        manifest = ArchiveManifest(archive_path / ArchiveManifest.filename)
+
+        if payslip_pdfs:
+            self._archive_new(payslip_pdfs, manifest)
+
+        if self.options.watch:
+            self._watch(self.options.watch.expanduser(), manifest)
+
+    def _watch(self, directory: Path, manifest: ArchiveManifest) -> None:
+        """Archive new files in `directory` as they arrive, until interrupted."""
+
+        pattern = self.cli.config["downloads-pattern"]
+        print(f"# watching {str(directory)!r} for {pattern!r}")
+        with (
+            DirectoryWatcher(directory, pattern) as watcher,
+            contextlib.suppress(KeyboardInterrupt),
+        ):
+            for payslip_pdfs in watcher:
+                try:
+                    self._archive_new(payslip_pdfs, manifest)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    # Keep watching; the failed file is retried if it changes.
+                    print(f"# error archiving {[str(x) for x in payslip_pdfs]}: {e}")
 
-    def _archive(self, payslip_pdf: Path, payment_date: datetime) -> None:
-        """Copy `payslip_pdf` to `archive-path`.
+    def _archive_new(self, payslip_pdfs: List[Path], manifest: ArchiveManifest) -> None:
+        """Archive those of `payslip_pdfs` not already in `manifest`."""
+
+        # Select files not already archived, by content.
+        new_pdfs = {}
+        for payslip_pdf in payslip_pdfs:
+            with metrics.phase("digest"):
+                digest = manifest.digest(payslip_pdf)
+            if digest in new_pdfs:
+                metrics.count("duplicates")
+                continue
+            if name := manifest.lookup(digest):
+                if self.cli.options.verbose:
+                    print(f"# skipping {str(payslip_pdf)!r}; already archived as {name!r}")
+                metrics.count("already archived")
+                continue
+            new_pdfs[digest] = payslip_pdf
+
+        archived: List[Tuple[Path, Path, str]] = []
+        try:
+            for digest, pdf in zip(
+                new_pdfs,
+                parse_payslips(
+                    new_pdfs.values(),
+                    self.options.jobs,
+                    archive_flag=True,
+                    engine=self.cli.config["pdf-engine"],
+                ),
+            ):
+                with metrics.phase(self.options.method):
+                    target, method = self._archive(pdf.payslip_pdf, pdf.payslip["payment_date"])
+                metrics.count("archived")
+                manifest.add(digest, target.name)
+                archived.append((pdf.payslip_pdf, target, method))
+        finally:
+            manifest.save()
+            self._print_archived(archived)
+
+    def _archive(self, payslip_pdf: Path, payment_date: datetime) -> Tuple[Path, str]:
+        """Copy `payslip_pdf` to `archive-path`, and return the copy and method used.
 
         with unique filename based on `payment_date`,
         and touch atime and mtime to `payment_date`.
         """
 
         archive_path = Path(self.cli.config["archive-path"]).expanduser()
-        archive_path.mkdir(parents=True, exist_ok=True)  # mkdir -p
-
         filename = datetime.strftime(payment_date, "Kroger-%Y-%m-%d.pdf")
         target = archive_path / filename
-        shutil.copy(payslip_pdf, target)
+        method = self._place(payslip_pdf, target, self.options.method)
 
         payment_timestamp = int(payment_date.timestamp())
         os.utime(target, (payment_timestamp, payment_timestamp))
-        subprocess.run(["ls", "-l", target], check=True)
+        return target, method
+
+    @staticmethod
+    def _place(source: Path, target: Path, method: str) -> str:
+        """Place `source` at `target` by `method`, and return the method used.
+
+        Fallback to `copy` where `hardlink` or `reflink` is not supported.
+        """
+
+        if method == "move":
+            shutil.move(source, target)
+            return method
+
+        if source.resolve() == target.resolve():
+            return method
+
+        # Replace, rather than overwrite, `target`; it may be a hard link.
+        tmp = target.with_suffix(".tmp")
+        tmp.unlink(missing_ok=True)
+
+        if method == "hardlink":
+            try:
+                os.link(source, tmp)
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                    raise
+                method = "copy"
+        elif method == "reflink" and not _reflink(source, tmp):
+            method = "copy"
+
+        if method == "copy":
+            shutil.copy(source, tmp)
+        os.replace(tmp, target)
+        return method
+
+    @staticmethod
+    def _print_archived(archived: List[Tuple[Path, Path, str]]) -> None:
+        """Print one `ls -l` style line for each of `archived`."""
+
+        if not archived:
+            return
+        print("Mode          Size Modified   Method   Archived-as <- Source")
+        for source, target, method in archived:
+            st = target.stat()
+            print(
+                " ".join(
+                    [
+                        stat.filemode(st.st_mode),
+                        f"{st.st_size:9}",
+                        datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d"),
+                        f"{method:8}",
+                        str(target),
+                        "<-",
+                        str(source),
+                    ]
+                )
+            )
+
+
+# linux/fs.h: `ioctl(dest_fd, FICLONE, src_fd)` shares the data blocks of
+# `src_fd` with `dest_fd`, on filesystems that support it (btrfs, xfs, ...).
+_FICLONE = 0x40049409
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """Make `target` a copy-on-write clone of `source`; return False if unsupported."""
+
+    if not sys.platform.startswith("linux"):
+        return False
+
+    import fcntl  # pylint: disable=import-outside-toplevel
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EINVAL, errno.ENOTSUP, errno.ENOTTY):
+                raise
+            return False
+    shutil.copymode(source, target)
+    return True
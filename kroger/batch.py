@@ -0,0 +1,158 @@
+"""Parse many `payslip-pdf` files, optionally across a pool of processes."""
+
+import os
+from collections import deque
+from functools import partial
+from pathlib import Path
+from typing import Callable, Deque, Iterable, Iterator, Optional, Sized, Tuple, Union
+
+from .cache import PayslipCache
+from .layout import KrogerLayoutParser
+from .metrics import metrics
+from .pdfparser import KrogerPdfParser
+
+# Parsers, by the name of their engine; see `pdf-engine` in `kroger.cli`.
+ENGINES = {
+    "text": KrogerPdfParser,
+    "layout": KrogerLayoutParser,
+}
+
+
+def parse_payslips(
+    payslip_pdfs: Iterable[Path],
+    jobs: int = 1,
+    archive_flag: bool = False,
+    cache: Optional[PayslipCache] = None,
+    on_error: Optional[Callable[[Path, Exception], None]] = None,
+    engine: str = "text",
+) -> Iterator[KrogerPdfParser]:
+    """Yield a `KrogerPdfParser` for each of `payslip_pdfs`, in input order.
+
+    Parse in this process when `jobs` is 1, else across a pool of `jobs`
+    worker processes (`0` means one per cpu). Results are yielded in the
+    order of `payslip_pdfs` regardless of which worker finishes first.
+
+    Files are read as results are consumed; no more than `WINDOW` files
+    per worker are in flight ahead of the consumer. So, whether from a
+    list or a generator, any number of files are parsed in bounded memory,
+    as long as the consumer keeps only what it needs of each result.
+
+    Files found in `cache` are not parsed at all; other files are parsed
+    and, unless `archive_flag` stopped the parse early, added to `cache`.
+
+    A file that fails to parse raises its exception, ending the iteration;
+    or, with `on_error`, is passed to `on_error(payslip_pdf, exception)`,
+    and skipped.
+
+    Files are parsed by the parser of `engine`, one of `ENGINES`.
+    """
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown pdf-engine {engine!r}; choose one of {', '.join(ENGINES)}")
+
+    if jobs < 0:
+        raise ValueError(f"Invalid number of jobs {jobs!r}")
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if isinstance(payslip_pdfs, Sized) and len(payslip_pdfs) < 2:
+        jobs = 1
+
+    catch = on_error is not None
+    lookups = (_lookup(payslip_pdf, cache, engine) for payslip_pdf in payslip_pdfs)
+
+    for payslip_pdf, key, pdf, parsed in _parse(lookups, jobs, archive_flag, catch, engine):
+        if isinstance(pdf, Exception):
+            on_error(payslip_pdf, pdf)
+            continue
+        if parsed and cache is not None and not archive_flag:
+            cache.put(key, pdf)
+        yield pdf
+
+
+# Files in flight, per worker process; enough to keep every worker busy.
+WINDOW = 4
+
+# A file to parse, its cache key, and its parse if found in the cache.
+_Lookup = Tuple[Path, Optional[str], Optional[KrogerPdfParser]]
+
+# A file, its cache key, its parse (or exception), and whether parsed, not cached.
+_Parsed = Tuple[Path, Optional[str], Union[KrogerPdfParser, Exception], bool]
+
+
+def _lookup(payslip_pdf: Path, cache: Optional[PayslipCache], engine: str) -> _Lookup:
+    """Return `payslip_pdf`, its key in `cache`, and its parse if found there."""
+
+    if cache is None:
+        return payslip_pdf, None, None
+    key = cache.key(payslip_pdf, engine)
+    pdf = cache.get(key, payslip_pdf)
+    metrics.count("cache misses" if pdf is None else "cache hits")
+    return payslip_pdf, key, pdf
+
+
+def _parse(
+    lookups: Iterable[_Lookup],
+    jobs: int,
+    archive_flag: bool,
+    catch: bool = False,
+    engine: str = "text",
+) -> Iterator[_Parsed]:
+    """Yield each of `lookups`, with its parse, and whether it was parsed, not cached.
+
+    The parse is the exception raised, if `catch`.
+    """
+
+    parse = partial(_parse_one, archive_flag=archive_flag, catch=catch, engine=engine)
+    if jobs == 1:
+        for payslip_pdf, key, pdf in lookups:
+            if pdf is not None:
+                yield payslip_pdf, key, pdf, False
+            else:
+                yield payslip_pdf, key, parse(payslip_pdf), True
+        return
+
+    from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    # Workers return what they recorded, to be reported with this process's.
+    parse = partial(_parse_measured, parse)
+    window: Deque[tuple] = deque()
+
+    def _result() -> _Parsed:
+        payslip_pdf, key, pdf, future = window.popleft()
+        if future is None:
+            return payslip_pdf, key, pdf, False
+        pdf, recorded = future.result()
+        metrics.merge(recorded)
+        return payslip_pdf, key, pdf, True
+
+    # Workers are started as needed; none if every file is cached.
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for payslip_pdf, key, pdf in lookups:
+            future = None if pdf is not None else executor.submit(parse, payslip_pdf)
+            window.append((payslip_pdf, key, pdf, future))
+            if len(window) >= jobs * WINDOW:
+                yield _result()
+        while window:
+            yield _result()
+
+
+def _parse_one(
+    payslip_pdf: Path, archive_flag: bool, catch: bool, engine: str = "text"
+) -> Union[KrogerPdfParser, Exception]:
+    """Return the parse of `payslip_pdf`; or, if `catch`, the exception raised."""
+
+    try:
+        return ENGINES[engine](payslip_pdf, archive_flag=archive_flag)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        if not catch:
+            raise
+        return e
+
+
+def _parse_measured(
+    parse: Callable[[Path], Union[KrogerPdfParser, Exception]], payslip_pdf: Path
+) -> Tuple[Union[KrogerPdfParser, Exception], dict]:
+    """Return `parse(payslip_pdf)`, and the `metrics` this worker process recorded doing so."""
+
+    metrics.reset()
+    return parse(payslip_pdf), metrics.to_dict()
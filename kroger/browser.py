@@ -0,0 +1,112 @@
+"""Kroger payslip-pdf tools; serve a signed-on browser to the `myinfo` and `mytime` commands."""
+
+import contextlib
+import time
+
+from libcli import BaseCmd
+
+
+class KrogerBrowserCmd(BaseCmd):
+    """Run a browser, signed on to Kroger SSO, for `myinfo` and `mytime` to share."""
+
+    def init_command(self) -> None:
+        """Docstring."""
+
+        parser = self.add_subcommand_parser(
+            "browser",
+            help=KrogerBrowserCmd.__doc__,
+            description=self.cli.dedent(
+                f"""
+            The `%(prog)s` command starts a browser, serving the devtools
+            protocol on `browser-address`, signs on to `myinfo-url` and
+            `mytime-url`, and keeps running, checking the session every
+            `--refresh` seconds and signing on again when it has expired.
+
+            While it runs, the `myinfo` and `mytime` commands attach to this
+            browser, in a tab of their own, instead of starting a browser
+            and signing on themselves.
+
+            Whether or not it runs, browsers keep their cookies in
+            `browser-profile`, so a run within the SSO session lifetime of
+            the previous one skips signing on.
+
+            Configuration file `{self.cli.config["config-file"]}` defines these variables:
+                browser-address = `{self.cli.config["browser-address"]}`
+                browser-profile = `{self.cli.config["browser-profile"]}`
+                myinfo-url = `{self.cli.config["myinfo-url"]}`
+                mytime-url = `{self.cli.config["mytime-url"]}`
+                sso-user = "*******"
+                sso-password = "********"
+                sso-timeout = `{self.cli.config["sso-timeout"]}`
+                """,
+            ),
+        )
+
+        parser.add_argument(
+            "--headless",
+            action="store_true",
+            help="Run the browser without a window",
+        )
+
+        arg = parser.add_argument(
+            "--refresh",
+            type=float,
+            default=900,
+            metavar="SECONDS",
+            help="Check the session every `SECONDS`",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        # `selenium` is imported on first use, not with `kroger.cli`.
+        # pylint: disable=import-outside-toplevel
+        from .sso import (
+            MYINFO_HOME,
+            MYTIME_HOME,
+            SsoSession,
+            SsoTimeoutError,
+            listening,
+            new_driver,
+        )
+
+        address = self.cli.config["browser-address"]
+        if not address:
+            self.cli.parser.exit(
+                2, f"error: Missing `browser-address` in `{self.cli.config['config-file']}`\n"
+            )
+        if listening(address):
+            self.cli.parser.exit(1, f"error: A browser is already listening on {address!r}\n")
+        _, _, port = address.rpartition(":")
+
+        sites = [
+            (url, home)
+            for url, home in [
+                (self.cli.config["myinfo-url"], MYINFO_HOME),
+                (self.cli.config["mytime-url"], MYTIME_HOME),
+            ]
+            if url
+        ]
+
+        driver = new_driver(self.cli.config, headless=self.options.headless, port=int(port))
+        sso = SsoSession(driver, self.cli.config["sso-timeout"], self.cli.options.verbose)
+        print(f"# serving browser on {address!r}")
+
+        try:
+            with contextlib.suppress(KeyboardInterrupt):
+                while True:
+                    for url, home in sites:
+                        try:
+                            sso.login(
+                                url,
+                                self.cli.config["sso-user"],
+                                self.cli.config["sso-password"],
+                                signed_on=home,
+                            )
+                        except SsoTimeoutError as e:
+                            # Keep serving; try again next time.
+                            print(f"# error signing on to {url!r}: {e}")
+                    time.sleep(self.options.refresh)
+        finally:
+            driver.quit()
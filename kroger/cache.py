@@ -0,0 +1,121 @@
+"""Persistent cache of parsed payslips, keyed by `payslip-pdf` content hash."""
+
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Optional
+
+from .pdfparser import PARSER_VERSION, KrogerPdfParser
+
+
+def file_hash(path: Path) -> str:
+    """Return the sha256 hex digest of the contents of file `path`."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(1 << 16):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PayslipCache:
+    """Cache the data structures parsed from `payslip-pdf` files.
+
+    Entries live in an SQLite database, keyed by the file's content hash
+    plus `PARSER_VERSION` and the parser engine, so renamed or copied
+    files still hit, and a parser change misses. The least recently used
+    entries are evicted when there are more than `max_entries`.
+    """
+
+    filename = ".kroger-cache.sqlite"
+
+    def __init__(self, path: Path, max_entries: int = 10000, rebuild: bool = False) -> None:
+        """Open (create) cache database `path`.
+
+        With `rebuild`, `get` always misses, so every file is re-parsed
+        and its entry replaced.
+        """
+
+        self.path = path
+        self.max_entries = max_entries
+        self.rebuild = rebuild
+        self._dirty = False
+
+        import sqlite3  # pylint: disable=import-outside-toplevel
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS payslips"
+            " (key TEXT PRIMARY KEY, state BLOB NOT NULL, used INTEGER NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS payslips_used ON payslips (used)")
+
+        # recency of use; incremented on every `get` hit and `put`.
+        self._clock = self.db.execute("SELECT MAX(used) FROM payslips").fetchone()[0] or 0
+
+    @classmethod
+    def from_config(cls, config: dict, rebuild: bool = False) -> Optional["PayslipCache"]:
+        """Return cache under configured `archive-path`, or None if not configured."""
+
+        if not config["archive-path"]:
+            return None
+        path = Path(config["archive-path"]).expanduser() / cls.filename
+        return cls(path, max_entries=config["cache-size"], rebuild=rebuild)
+
+    def __enter__(self) -> "PayslipCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def key(payslip_pdf: Path, engine: str = "text") -> str:
+        """Return cache key for `payslip_pdf`, parsed by `engine`."""
+        key = f"{file_hash(payslip_pdf)}:{PARSER_VERSION}"
+        return key if engine == "text" else f"{key}:{engine}"
+
+    def get(self, key: str, payslip_pdf: Path) -> Optional[KrogerPdfParser]:
+        """Return cached parser for `key`, naming `payslip_pdf`, or None on a miss."""
+
+        if self.rebuild:
+            return None
+
+        row = self.db.execute("SELECT state FROM payslips WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        self._clock += 1
+        self.db.execute("UPDATE payslips SET used = ? WHERE key = ?", (self._clock, key))
+        self._dirty = True
+        return KrogerPdfParser.from_dict(pickle.loads(row[0]), payslip_pdf)
+
+    def put(self, key: str, pdf: KrogerPdfParser) -> None:
+        """Store the data structures of `pdf` under `key`."""
+
+        self._clock += 1
+        self.db.execute(
+            "INSERT OR REPLACE INTO payslips (key, state, used) VALUES (?, ?, ?)",
+            (key, pickle.dumps(pdf.to_dict(), pickle.HIGHEST_PROTOCOL), self._clock),
+        )
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM payslips").fetchone()[0]
+
+    def evict(self) -> None:
+        """Delete all but the `max_entries` most recently used entries."""
+
+        self.db.execute(
+            "DELETE FROM payslips WHERE key NOT IN"
+            " (SELECT key FROM payslips ORDER BY used DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+
+    def close(self) -> None:
+        """Evict, commit and close."""
+
+        if self._dirty:
+            self.evict()
+            self.db.commit()
+        self.db.close()
@@ -1,13 +1,22 @@
 """Command line interface."""
 
+import json
+import sys
+import time
+from pathlib import Path
 from typing import List, Optional
 
 from libcli import BaseCLI
 
 from .archive import KrogerArchiveCmd
+from .browser import KrogerBrowserCmd
+from .export import KrogerExportCmd
+from .metrics import IMPORTED, metrics
 from .myinfo import KrogerMyInfoCmd
 from .mytime import KrogerMyTimeCmd
 from .print import KrogerPrintCmd
+from .reconcile import KrogerReconcileCmd
+from .verify import KrogerVerifyCmd
 
 
 class KrogerCLI(BaseCLI):
@@ -22,12 +31,31 @@ class KrogerCLI(BaseCLI):
         "dist-name": "rlane-kroger",
         # archive directory.
         "archive-path": "~/kroger-payslips",
+        # where browsers save downloaded payslips; see `archive --sync`.
+        "downloads-path": "~/Downloads",
+        "downloads-pattern": "USOnlinePayslip*.pdf",
+        # maximum number of parsed payslips cached under `archive-path`.
+        "cache-size": 10000,
+        # parser of `payslip-pdf` files; "text", by line order, or "layout", by position.
+        "pdf-engine": "text",
         # signon.
         "myinfo-url": "",
         "mytime-url": "",
+        # JSON endpoint behind the MyTime schedule page; see `mytime --api`.
+        "mytime-api": "",
+        # timezone of the MyTime schedule, e.g. "America/Phoenix"; default local.
+        "timezone": "",
+        # shifts last seen by `mytime --changes`.
+        "schedule-store": "~/.cache/kroger/schedule.json",
         "google-calendar": "",
         "sso-user": "",
         "sso-password": "",
+        # seconds to wait for each page of the signon flow.
+        "sso-timeout": 30,
+        # browser cookies and profile, kept between runs to reuse the SSO session.
+        "browser-profile": "~/.cache/kroger/chrome",
+        # devtools address of the browser served by `kroger browser`.
+        "browser-address": "127.0.0.1:9222",
     }
 
     def init_parser(self) -> None:
@@ -45,8 +73,30 @@ class KrogerCLI(BaseCLI):
     def add_arguments(self) -> None:
         """Docstring."""
 
+        self.parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Print where the time went; a breakdown by phase, to `stderr`",
+        )
+
+        self.parser.add_argument(
+            "--profile-output",
+            type=Path,
+            metavar="PREFIX",
+            help="Write `cProfile` stats to `PREFIX.pstats`, and phases to `PREFIX.json`",
+        )
+
         self.add_subcommand_classes(
-            [KrogerMyInfoCmd, KrogerMyTimeCmd, KrogerArchiveCmd, KrogerPrintCmd]
+            [
+                KrogerMyInfoCmd,
+                KrogerMyTimeCmd,
+                KrogerBrowserCmd,
+                KrogerArchiveCmd,
+                KrogerPrintCmd,
+                KrogerExportCmd,
+                KrogerReconcileCmd,
+                KrogerVerifyCmd,
+            ]
         )
 
     def main(self) -> None:
@@ -56,10 +106,42 @@ class KrogerCLI(BaseCLI):
             self.parser.print_help()
             self.parser.exit(2, "error: Missing COMMAND\n")
 
+        metrics.reset()
+        metrics.add("startup", time.perf_counter() - IMPORTED)
+        profiler = None
+        if self.options.profile_output:
+            # `cProfile` is imported on first use, not with `kroger.cli`.
+            import cProfile  # pylint: disable=import-outside-toplevel
+
+            profiler = cProfile.Profile()
+
+        start = time.perf_counter()
         try:
+            if profiler:
+                profiler.enable()
             self.options.cmd()
         except Exception as e:  # pylint: disable=broad-exception-caught
             self.parser.exit(1, str(e))
+        finally:
+            if profiler:
+                profiler.disable()
+            if self.options.profile or profiler:
+                elapsed = metrics.seconds["startup"] + time.perf_counter() - start
+                self._report_profile(profiler, elapsed)
+
+    def _report_profile(self, profiler, elapsed: float) -> None:
+        """Print phases of a run of `elapsed` seconds; and write `profiler` stats, and phases."""
+
+        if self.options.profile:
+            for line in metrics.report(elapsed):
+                print(f"# profile: {line}", file=sys.stderr)
+
+        if prefix := self.options.profile_output:
+            profiler.dump_stats(f"{prefix}.pstats")
+            with open(f"{prefix}.json", "w", encoding="utf-8") as file:
+                json.dump({"elapsed": elapsed, **metrics.to_dict()}, file, indent=4)
+                file.write("\n")
+            print(f"# profile: wrote {prefix}.pstats and {prefix}.json", file=sys.stderr)
 
 
 def main(args: Optional[List[str]] = None) -> None:
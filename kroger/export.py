@@ -0,0 +1,165 @@
+"""Kroger payslip-pdf tools; export parsed payslips to a columnar file."""
+
+import dataclasses
+from pathlib import Path
+from typing import List
+
+from libcli import BaseCmd
+
+from .batch import parse_payslips
+from .cache import PayslipCache
+from .payslip import Payslip
+
+
+class KrogerExportCmd(BaseCmd):
+    """Export parsed `payslip-pdf` files to a `Parquet` file."""
+
+    def init_command(self) -> None:
+        """Docstring."""
+
+        parser = self.add_subcommand_parser(
+            "export",
+            help=KrogerExportCmd.__doc__,
+            description=self.cli.dedent(
+                f"""
+            The `%(prog)s` command parses `PAYSLIP-PDF` files, default all
+            files in `archive-path`, and writes one row per payslip to a
+            `Parquet` file, for analysis with `pandas`, `polars`, `duckdb`, etc.
+
+            Columns are every field of the payslip; amounts are decimals.
+            The `earnings` and `deductions` columns are lists of
+            `(name, current, ytd)` structs; `earnings` also have `hours`
+            and `rate`.
+
+            Rows are written in batches, so memory use doesn't grow with
+            the number of payslips. Requires `pyarrow`; install the
+            `rlane-kroger[export]` extra.
+
+            Configuration file `~/.kroger.toml` defines:
+                archive-path = `{self.cli.config["archive-path"]}`
+                pdf-engine = `{self.cli.config["pdf-engine"]}`
+                """
+            ),
+        )
+
+        arg = parser.add_argument(
+            "-o",
+            "--output",
+            type=Path,
+            default=Path("kroger-payslips.parquet"),
+            metavar="FILE",
+            help="Write to `FILE`",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        arg = parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=256,
+            metavar="N",
+            help="Write `N` rows at a time",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        arg = parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Parse files across `N` processes; `0` for one per cpu",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        parser.add_argument(
+            "PAYSLIP_PDF_FILES",
+            nargs="*",
+            metavar="PAYSLIP-PDF",
+            type=Path,
+            help="List of zero or more Kroger payslip `.pdf` files",
+        )
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        try:
+            # pylint: disable=import-outside-toplevel
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.cli.parser.exit(2, "error: `export` requires `pyarrow`\n")
+
+        payslip_pdfs = self.options.PAYSLIP_PDF_FILES
+        if not payslip_pdfs:
+            if not self.cli.config["archive-path"]:
+                self.cli.parser.exit(2, "error: Missing `archive-path` in `~/.kroger.toml`\n")
+            archive_path = Path(self.cli.config["archive-path"]).expanduser()
+            payslip_pdfs = sorted(archive_path.glob("Kroger-*.pdf"))
+
+        schema = _schema(pa)
+        rows: List[dict] = []
+        cache = PayslipCache.from_config(self.cli.config)
+
+        try:
+            with pq.ParquetWriter(self.options.output, schema) as writer:
+                for pdf in parse_payslips(
+                    payslip_pdfs,
+                    self.options.jobs,
+                    cache=cache,
+                    engine=self.cli.config["pdf-engine"],
+                ):
+                    rows.append(_row(Payslip.from_pdf(pdf)))
+                    if len(rows) >= self.options.batch_size:
+                        writer.write_batch(pa.RecordBatch.from_pylist(rows, schema))
+                        rows.clear()
+                if rows:
+                    writer.write_batch(pa.RecordBatch.from_pylist(rows, schema))
+        finally:
+            if cache:
+                cache.close()
+
+
+# `Payslip` fields that are not amounts.
+_STRINGS = ("payslip_pdf", "empno", "division", "location", "payroll", "pay_frequency")
+_DATES = ("period_begin", "period_end", "payment_date")
+_LINES = ("earnings", "deductions")
+_SKIPPED = ("distributions",)
+
+
+def _schema(pa):
+    """Return the `pyarrow.Schema` of `Payslip` rows."""
+
+    # 4 decimal places hold both cents and `hourly_rate`.
+    amount = pa.decimal128(18, 4)
+    line = [("name", pa.string()), ("current", amount), ("ytd", amount)]
+    lines = {
+        "earnings": pa.list_(pa.struct([*line, ("hours", amount), ("rate", amount)])),
+        "deductions": pa.list_(pa.struct(line)),
+    }
+
+    schema = []
+    for field in dataclasses.fields(Payslip):
+        if field.name in _STRINGS:
+            schema.append((field.name, pa.string()))
+        elif field.name in _DATES:
+            schema.append((field.name, pa.date32()))
+        elif field.name in _LINES:
+            schema.append((field.name, lines[field.name]))
+        elif field.name not in _SKIPPED:
+            schema.append((field.name, amount))
+    return pa.schema(schema)
+
+
+def _row(payslip: Payslip) -> dict:
+    """Return `payslip` as a row of `_schema`."""
+
+    row = {}
+    for field in dataclasses.fields(Payslip):
+        value = getattr(payslip, field.name)
+        if field.name in _LINES:
+            row[field.name] = [dataclasses.asdict(x) for x in value]
+        elif field.name == "payslip_pdf":
+            row[field.name] = str(value) if value else None
+        elif field.name not in _SKIPPED:
+            row[field.name] = value
+    return row
@@ -0,0 +1,183 @@
+"""Extract the text, or the text layout, of many `payslip-pdf` files, sharing resources.
+
+`pdfminer.high_level.extract_text` and `extract_pages` build a new resource
+manager, font cache and layout analyzer for every file. Payslips are all
+printed from the same template, with the same fonts; a `PdfExtractor`
+keeps one resource manager, whose fonts are cached across files.
+
+This module imports `pdfminer`; import it on first use, not with `kroger.cli`.
+"""
+
+import gc
+import hashlib
+from collections import OrderedDict
+from io import StringIO
+from pathlib import Path
+from typing import Any, Hashable, Iterator, Mapping, Optional
+
+from pdfminer.converter import PDFPageAggregator, TextConverter
+from pdfminer.layout import LAParams, LTPage
+from pdfminer.pdffont import PDFFont
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import PDFObjRef, PDFStream
+from pdfminer.psparser import PSLiteral
+
+
+class SharedResourceManager(PDFResourceManager):
+    """A `PDFResourceManager` whose fonts are cached across documents.
+
+    `PDFResourceManager` caches fonts by object id, which is only unique
+    within a document. Here, fonts are also cached by a fingerprint of
+    their specification, embedded font files and all; so a font built
+    for one payslip is reused by the next, if and only if it's the same.
+    The `max_fonts` most recently used are kept.
+    """
+
+    def __init__(self, max_fonts: int = 64) -> None:
+        """Cache up to `max_fonts` fonts across documents."""
+
+        super().__init__(caching=True)
+        self.max_fonts = max_fonts
+        self._shared_fonts: "OrderedDict[Hashable, PDFFont]" = OrderedDict()
+
+    def begin_document(self) -> None:
+        """Forget the object ids of the previous document."""
+        self._cached_fonts.clear()
+
+    def get_font(self, objid: object, spec: Mapping[str, object]) -> PDFFont:
+        if objid and objid in self._cached_fonts:
+            return self._cached_fonts[objid]
+
+        try:
+            key = _fingerprint(spec)
+        except (RecursionError, TypeError):
+            return super().get_font(objid, spec)
+
+        font = self._shared_fonts.get(key)
+        if font is None:
+            font = super().get_font(None, spec)
+            self._shared_fonts[key] = font
+            if len(self._shared_fonts) > self.max_fonts:
+                self._shared_fonts.popitem(last=False)
+        else:
+            self._shared_fonts.move_to_end(key)
+
+        if objid:
+            self._cached_fonts[objid] = font
+        return font
+
+
+def _fingerprint(obj: Any, depth: int = 0) -> Hashable:
+    """Return a hashable fingerprint of `pdf` object `obj`, and all it refers to.
+
+    Streams are fingerprinted by a digest of their data.
+    """
+
+    if depth > 8:
+        raise RecursionError("font specification too deep")
+    if isinstance(obj, PDFObjRef):
+        obj = obj.resolve()
+    if isinstance(obj, PDFStream):
+        data = obj.get_rawdata()
+        if data is None:
+            data = obj.get_data()
+        return ("stream", hashlib.sha1(data).digest(), _fingerprint(obj.attrs, depth + 1))
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _fingerprint(v, depth + 1)) for k, v in obj.items()))
+    if isinstance(obj, list):
+        return tuple(_fingerprint(x, depth + 1) for x in obj)
+    if isinstance(obj, PSLiteral):
+        return ("literal", obj.name)
+    hash(obj)
+    return obj
+
+
+class _TextOnly:
+    """Device mixin that ignores paths and images; they never hold text."""
+
+    def paint_path(self, *args) -> None:  # pylint: disable=unused-argument
+        return
+
+    def render_image(self, *args) -> None:  # pylint: disable=unused-argument
+        return
+
+
+class _TextConverter(_TextOnly, TextConverter):
+    pass
+
+
+class _PageAggregator(_TextOnly, PDFPageAggregator):
+    pass
+
+
+class PdfExtractor:
+    """Extract text, or text layout, from `payslip-pdf` files; sharing resources across files.
+
+    Output is the same as `pdfminer.high_level.extract_text` and
+    `extract_pages`, less any paths and images, which payslips parse
+    without. Not thread-safe; use one per thread, or process.
+    """
+
+    def __init__(self, max_fonts: int = 64, collect_every: int = 32) -> None:
+        """Share up to `max_fonts` fonts across the files extracted.
+
+        `pdfminer` leaves each document in reference cycles, which Python
+        collects only now and then; collect them every `collect_every`
+        documents, so they don't pile up over a long batch.
+        """
+
+        self.resources = SharedResourceManager(max_fonts)
+        self.collect_every = collect_every
+        self.documents = 0
+
+    def text(
+        self, payslip_pdf: Path, maxpages: int = 0, laparams: Optional[LAParams] = None
+    ) -> str:
+        """Return the text of `payslip_pdf`, like `extract_text`."""
+
+        with StringIO() as output:
+            device = _TextConverter(self.resources, output, laparams=laparams or LAParams())
+            for _ in self._process(payslip_pdf, maxpages, device):
+                pass
+            return output.getvalue()
+
+    def pages(
+        self, payslip_pdf: Path, maxpages: int = 0, laparams: Optional[LAParams] = None
+    ) -> Iterator[LTPage]:
+        """Yield the layout of each page of `payslip_pdf`, like `extract_pages`."""
+
+        device = _PageAggregator(self.resources, laparams=laparams or LAParams())
+        for _ in self._process(payslip_pdf, maxpages, device):
+            yield device.get_result()
+
+    def _process(self, payslip_pdf: Path, maxpages: int, device) -> Iterator[None]:
+        """Process the pages of `payslip_pdf` on `device`, yielding after each."""
+
+        self.resources.begin_document()
+        interpreter = PDFPageInterpreter(self.resources, device)
+        try:
+            with open(payslip_pdf, "rb") as file:
+                for page in PDFPage.get_pages(file, maxpages=maxpages):
+                    interpreter.process_page(page)
+                    yield
+        finally:
+            # `TextConverter.receive_layout` leaves `device` in a reference
+            # cycle; release the layout of its last page now, not when the
+            # cycle is collected.
+            device.cur_item = None
+            self.documents += 1
+            if self.documents % self.collect_every == 0:
+                gc.collect()
+
+
+_shared: Optional[PdfExtractor] = None
+
+
+def shared_extractor() -> PdfExtractor:
+    """Return this process's `PdfExtractor`, reused by every parse in the process."""
+
+    global _shared  # pylint: disable=global-statement
+    if _shared is None:
+        _shared = PdfExtractor()
+    return _shared
@@ -0,0 +1,137 @@
+"""Write, and read back, the MyTime schedule as an iCalendar (`.ics`) file."""
+
+import re
+from datetime import date, datetime, timezone, tzinfo
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, TextIO, Tuple
+
+PRODID = "-//rlane-kroger//mytime//EN"
+
+
+class Event(NamedTuple):
+    """A calendar event for a work shift; its `uid` is derived from its start and duration."""
+
+    start: datetime  # local time, in the schedule's zone.
+    minutes: int
+    hours: Optional[float] = None  # paid hours, if known.
+
+    @classmethod
+    def from_shift(cls, shift) -> "Event":
+        """Return the event for `mytime.Shift` `shift`, starting at its local time."""
+        return cls(shift.start.replace(tzinfo=None), shift.duration, shift.hours)
+
+    def aware(self, zone: tzinfo) -> datetime:
+        """Return the start, a local time in `zone`, as a tz-aware datetime."""
+        return self.start.replace(tzinfo=zone)
+
+    @property
+    def uid(self) -> str:
+        """Return a UID that is the same each time the shift is exported."""
+        return f"{self.start:%Y%m%dT%H%M}-{self.minutes}m@rlane-kroger"
+
+
+def write_ics(
+    file: TextIO,
+    events: Iterable[Event],
+    title: str,
+    cancelled: Iterable[Event] = (),
+    zone: Optional[tzinfo] = None,
+) -> None:
+    """Write `events`, and `cancelled` events, titled `title`, as a calendar to `file`.
+
+    Events start at local times in `zone`, written in UTC; without `zone`,
+    at floating times, in whatever zone the calendar is viewed.
+    """
+
+    stamp = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}"
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "METHOD:PUBLISH"]
+    for status, group in (("CONFIRMED", events), ("CANCELLED", cancelled)):
+        for event in group:
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{event.uid}",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{_dtstart(event, zone)}",
+                f"DURATION:PT{event.minutes}M",
+                f"SUMMARY:{_escape(title)}",
+                f"STATUS:{status}",
+                "END:VEVENT",
+            ]
+    lines.append("END:VCALENDAR")
+    file.write("\r\n".join(lines) + "\r\n")
+
+
+def read_ics(path: Path, zone: Optional[tzinfo] = None) -> List[Event]:
+    """Return the events, not cancelled, in calendar `path` written by `write_ics`.
+
+    Events written in UTC start at local times in `zone`; default the system's.
+    """
+
+    events = []
+    event: dict = {}
+    # Unfold continuation lines.
+    text = re.sub(r"\r?\n[ \t]", "", path.read_text(encoding="utf-8"))
+    for line in text.splitlines():
+        name, _, value = line.partition(":")
+        name = name.split(";")[0].upper()
+        if name == "BEGIN" and value == "VEVENT":
+            event = {}
+        elif name == "END" and value == "VEVENT":
+            if event.get("STATUS") != "CANCELLED":
+                events.append(
+                    Event(
+                        _start(event["DTSTART"], zone),
+                        _minutes(event["DURATION"]),
+                    )
+                )
+        else:
+            event[name] = value
+    return events
+
+
+def diff_events(
+    events: List[Event], previous: List[Event], covered: Tuple[date, date]
+) -> Tuple[List[Event], List[Event]]:
+    """Return the events to create, and to delete, to update `previous` to `events`.
+
+    `covered` is the first and last day of the schedule `events` are from;
+    previous events outside it are past, or beyond the schedule, not deleted.
+    """
+
+    first, last = covered
+    uids = {x.uid for x in events}
+    previous_uids = {x.uid for x in previous}
+    creates = [x for x in events if x.uid not in previous_uids]
+    deletes = [x for x in previous if x.uid not in uids and first <= x.start.date() <= last]
+    return creates, deletes
+
+
+def _dtstart(event: Event, zone: Optional[tzinfo]) -> str:
+    """Return the iCalendar DTSTART of `event`, in UTC if `zone` is known, else floating."""
+
+    if zone is None:
+        return f"{event.start:%Y%m%dT%H%M%S}"
+    return f"{event.aware(zone).astimezone(timezone.utc):%Y%m%dT%H%M%SZ}"
+
+
+def _start(dtstart: str, zone: Optional[tzinfo]) -> datetime:
+    """Return iCalendar `dtstart`, floating or in UTC, as a local time in `zone`."""
+
+    if not dtstart.endswith("Z"):
+        return datetime.strptime(dtstart, "%Y%m%dT%H%M%S")
+    start = datetime.strptime(dtstart, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    return start.astimezone(zone).replace(tzinfo=None)
+
+
+def _minutes(duration: str) -> int:
+    """Return the number of minutes in iCalendar `duration`; e.g., "PT6H30M"."""
+
+    m = re.fullmatch(r"PT(?:(\d+)H)?(?:(\d+)M)?", duration)
+    if not m:
+        raise ValueError(f"Can't parse duration {duration!r}")
+    return int(m[1] or 0) * 60 + int(m[2] or 0)
+
+
+def _escape(text: str) -> str:
+    """Return `text` escaped for an iCalendar TEXT value."""
+    return re.sub(r"([\\;,])", r"\\\1", text).replace("\n", "\\n")
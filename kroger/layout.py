@@ -0,0 +1,429 @@
+"""Parse Kroger `payslip-pdf` files by the position of their text, not its order."""
+
+import bisect
+import contextlib
+import math
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+from .metrics import metrics
+from .pdfparser import KrogerPdfParser
+
+DATE = r"\d\d/\d\d/\d\d"
+AMOUNT = re.compile(r"^\(?-?[\d,]*\.\d+\)?$")
+PERIOD = re.compile(rf"^{DATE} - {DATE}$")
+PAYMENT_DATE = re.compile(rf"^{DATE}$")
+PAY_FREQUENCY = re.compile(r"(?i)^[\w-]*(weekly|monthly)$")
+HOURLY_RATE = re.compile(r"^[\d,.]+ USD$")
+
+# A row of the earnings detail; e.g., "09/10/23 09/16/23 8.50 14.00 1.0 119.00".
+NUMBER = r"[\d,.]+"
+EARNING_DETAIL = re.compile(
+    rf"^{DATE} {DATE} (?P<hours>{NUMBER}) (?P<rate>{NUMBER}) {NUMBER} (?P<current>{NUMBER})"
+)
+EARNING_DETAIL_HEADER = (
+    "Start Date End Date Hours  x  Rate  xi Factor  =  Current Hrs YTD Earnings YTD"
+)
+
+# Summary column headers, over their current and year-to-date amounts.
+SUMMARY = {
+    "Gross Earnings": "gross",
+    "Non Payroll": "non_payroll",
+    "Pretax Deductions": "pretax_deductions",
+    "Tax Deductions": "tax_deductions",
+    "After Tax Deduction": "after_tax_deduction",
+    "Net Pay": "net_pay",
+}
+
+# Net pay distribution column headers, over a value for each distribution.
+DISTRIBUTION = {
+    "Bank Name": "bank_name",
+    "Branch": "branch",
+    "Account Type": "account_type",
+    "Payment Reference": "payment_reference",
+    "Payment Amount": "payment_amount",
+}
+
+
+class Line(NamedTuple):
+    """A line of text, and its bounding box; `top` and `bottom` measured down the document."""
+
+    text: str
+    x0: float
+    top: float
+    x1: float
+    bottom: float
+
+
+class LayoutIndex:
+    """Find lines of text by their text, and by their position relative to other lines.
+
+    Lines are kept in reading order (top to bottom, then left to right),
+    and in a grid of `cell`-point squares for nearest-neighbor searches.
+    """
+
+    def __init__(self, lines: Iterable[Line], cell: float = 48.0) -> None:
+        """Index `lines`, in any order."""
+
+        self.lines = sorted(lines, key=lambda x: (x.top, x.x0))
+        self._tops = [x.top for x in self.lines]
+        self._text: Dict[str, List[Line]] = {}
+        self._grid: Dict[Tuple[int, int], List[Line]] = {}
+        self.cell = cell
+        for line in self.lines:
+            self._text.setdefault(line.text, []).append(line)
+            self._grid.setdefault(self._cell(line), []).append(line)
+        # columns and rows of the grid; (first, last) of each.
+        self._cols = (
+            min((c for c, _ in self._grid), default=0),
+            max((c for c, _ in self._grid), default=0),
+        )
+        self._rows = (
+            min((r for _, r in self._grid), default=0),
+            max((r for _, r in self._grid), default=0),
+        )
+
+    def _cell(self, line: Line) -> Tuple[int, int]:
+        return int(line.x0 // self.cell), int(line.top // self.cell)
+
+    def find(self, text: str) -> List[Line]:
+        """Return the lines that are `text`, in reading order."""
+        return self._text.get(text, [])
+
+    def startswith(self, prefix: str) -> Optional[Line]:
+        """Return the first line that starts with `prefix`, or None."""
+        return next((x for x in self.lines if x.text.startswith(prefix)), None)
+
+    def below(self, line: Line) -> List[Line]:
+        """Return the column of lines under `line`; down to the first gap of a line or more.
+
+        Lines in the column overlap `line` horizontally.
+        """
+
+        column: List[Line] = []
+        bottom = line.bottom
+        height = line.bottom - line.top
+        for other in self.lines[bisect.bisect_right(self._tops, line.top) :]:
+            if other.top - bottom > height:
+                break
+            if other.x0 <= line.x1 and line.x0 <= other.x1 and other.top >= bottom - height / 2:
+                column.append(other)
+                bottom = other.bottom
+        return column
+
+    def right(self, line: Line) -> List[Line]:
+        """Return the lines on the row of `line`, to its right, from left to right."""
+
+        middle = (line.top + line.bottom) / 2
+        end = bisect.bisect_right(self._tops, middle)
+        start = bisect.bisect_left(self._tops, line.top - (line.bottom - line.top))
+        return sorted(
+            (
+                other
+                for other in self.lines[start:end]
+                if other.x0 >= line.x1 and other.top <= middle <= other.bottom
+            ),
+            key=lambda x: x.x0,
+        )
+
+    def nearest(self, line: Line, pattern: Pattern) -> Optional[Line]:
+        """Return the line, matching `pattern`, nearest to `line`; or None.
+
+        Search the grid in rings of cells around `line`, until no closer
+        match is possible.
+        """
+
+        col, row = self._cell(line)
+        limit = max(
+            col - self._cols[0], self._cols[1] - col, row - self._rows[0], self._rows[1] - row
+        )
+
+        best: Optional[Line] = None
+        best_distance = math.inf
+        for ring in range(limit + 1):
+            if best is not None and (ring - 1) * self.cell > best_distance:
+                break
+            for c in range(col - ring, col + ring + 1):
+                for r in range(row - ring, row + ring + 1):
+                    if max(abs(c - col), abs(r - row)) != ring:
+                        continue
+                    for other in self._grid.get((c, r), ()):
+                        if other is line or not pattern.match(other.text):
+                            continue
+                        distance = math.hypot(other.x0 - line.x0, other.top - line.top)
+                        if distance < best_distance:
+                            best, best_distance = other, distance
+        return best
+
+
+class KrogerLayoutParser(KrogerPdfParser):
+    """Parse Kroger `payslip-pdf` file, locating fields by label and position.
+
+    Produces the same data structures as `KrogerPdfParser`, plus the
+    current amount, hours and rate of each earning, from the earnings
+    detail table. Layout analysis doesn't need the reading order of the
+    text boxes, so their costly hierarchical grouping is skipped.
+    """
+
+    index: LayoutIndex = None
+
+    def __init__(self, payslip_pdf: Path, archive_flag=False) -> None:
+        """Parse Kroger `payslip-pdf` file.
+
+        With `archive_flag`, parse only enough to name the archived file,
+        from the first page alone.
+        """
+
+        # `pdfminer` is imported on first use, not with `kroger.cli`.
+        # pylint: disable=import-outside-toplevel
+        from pdfminer.layout import LAParams, LTTextContainer, LTTextLine
+
+        from .extract import shared_extractor
+
+        self.payslip_pdf = payslip_pdf
+        if archive_flag:
+            self.dump_on_abort = False
+
+        lines: List[Line] = []
+        offset = 0.0  # of the page, down the document.
+        pages = shared_extractor().pages(payslip_pdf, laparams=LAParams(boxes_flow=None))
+        with metrics.phase("extract"), contextlib.closing(pages):
+            for page in pages:
+                done = archive_flag
+                for box in page:
+                    if not isinstance(box, LTTextContainer):
+                        continue
+                    for line in box:
+                        if not isinstance(line, LTTextLine):
+                            continue
+                        if text := line.get_text().rstrip("\n"):
+                            top = offset + page.height - line.y1
+                            bottom = offset + page.height - line.y0
+                            lines.append(Line(text, line.x0, top, line.x1, bottom))
+                            # Everything to parse is above the net pay distribution's last.
+                            done = done or text == "Payment Amount"
+                offset += page.height
+                if done:
+                    break
+
+        with metrics.phase("parse"):
+            self._parse_layout(LayoutIndex(lines), archive_flag)
+        self._release()
+
+    @classmethod
+    def from_lines(
+        cls, lines: Iterable[Line], payslip_pdf: Optional[Path] = None, archive_flag=False
+    ) -> "KrogerLayoutParser":
+        """Return parser of `lines` already extracted from `payslip_pdf`."""
+
+        pdf = cls.__new__(cls)
+        pdf.payslip_pdf = payslip_pdf
+        pdf._parse_layout(LayoutIndex(lines), archive_flag)
+        pdf._release()
+        return pdf
+
+    def _release(self) -> None:
+        self.index = None
+
+    def _parse_layout(self, index: LayoutIndex, archive_flag: bool) -> None:
+
+        self.index = index
+        if not index.lines:
+            self._abort("no text")
+
+        company = [index.lines[0], *index.below(index.lines[0])]
+        self.company = {
+            "name1": self._text(company, 0),
+            "name2": self._text(company, 1),
+            "addr1": self._text(company, 2),
+            "addr2": self._text(company, 3),
+            "division": self._word("Division: ", 1),
+            "location": self._word("HR Location: ", 2),
+        }
+
+        person = self._label_startswith("Person Number: ")
+        employee = index.below(person)
+        self.employee = {
+            "empno": person.text.split()[2],
+            "name": self._text(employee, 0),
+            "addr1": self._text(employee, 1),
+            "addr2": self._text(employee, 2),
+        }
+
+        period = self._nearest("Period", PERIOD)
+        payment_date = self._nearest("Payment Date", PAYMENT_DATE)
+        self.payslip = {
+            "period": period.text,
+            "payment_date": datetime.strptime(payment_date.text, "%m/%d/%y"),
+            "payroll": self._text(index.below(payment_date), 0),
+            "pay_frequency": None,
+            "hourly_rate": None,
+            "has_sunday_pay": False,
+            "has_reg_hours_retro": False,
+            "has_night_premium": False,
+            "total_hours_worked": None,
+            "sick_hours_available": None,
+        }
+        period_begin, _, period_end = period.text.split()
+        self.payslip["period_begin"] = datetime.strptime(period_begin, "%m/%d/%y")
+        self.payslip["period_end"] = datetime.strptime(period_end, "%m/%d/%y")
+
+        if archive_flag:
+            # We've parsed enough to name the archived file properly.
+            return
+
+        self.payslip["pay_frequency"] = self._nearest("Pay Frequency", PAY_FREQUENCY).text
+        self.payslip["hourly_rate"] = self._nearest("Hourly Rate", HOURLY_RATE).text
+        self.payslip["total_hours_worked"] = float(
+            self._label_startswith("Total Hours Worked: ").text.split()[3]
+        )
+        if sick := index.startswith("Sick Hours Available: "):
+            self.payslip["sick_hours_available"] = float(sick.text.split()[3])
+
+        self._parse_w4()
+        self._parse_summary()
+        self._parse_earnings()
+        self._parse_tax_deductions()
+        self._parse_distributions()
+
+    def _parse_w4(self) -> None:
+
+        types = self._below("Type")
+        additional = self._below("Additional Amount")
+        self.w4 = {
+            "line1": self._text(types, 0),
+            "line2": self._text(types, 1),
+            "line3": self._text(types, 2) or "",
+            "marital_status1": self._text(self._below("Marital Status"), 0),
+            "marital_status2": None,
+            "exemptions1": self._text(self._below("Exemptions"), 0),
+            "exemptions2": self._text(self._below("Exemptions"), 1),
+            "additional_amount1": self._text(additional, 0),
+            "additional_amount2": self._text(additional, 1),
+        }
+
+    def _parse_summary(self) -> None:
+
+        self.summary = {}
+        for label, name in SUMMARY.items():
+            amounts = self._amounts(label)
+            self.summary[name] = self._text(amounts, 0)
+            self.summary[f"{name}_ytd"] = self._text(amounts, 1)
+
+        for name in ("gross", "net_pay"):
+            if self.summary[name] is None:
+                self._abort(f"no {name!r} amount")
+            self.summary[name] = float(self.summary[name].replace(",", ""))
+
+    def _parse_earnings(self) -> None:
+
+        # The earnings table is the first under a "Name" header; the taxes, the last.
+        names = self.index.find("Name")
+        lines = self.index.below(names[0]) if names else []
+        self.earnings = [
+            {"name": x.text.strip(), "current": None, "ytd": None, "hours": None, "rate": None}
+            for x in lines
+        ]
+
+        ytds = self._amounts(EARNING_DETAIL_HEADER)
+        details = [x for x in self.index.lines if EARNING_DETAIL.match(x.text)]
+        for i, (earning, line) in enumerate(zip(self.earnings, lines)):
+            # The detail on the row of the earning's name; else, in the same order.
+            detail = next((x for x in self.index.right(line) if x in details), None)
+            if detail is None and i < len(details):
+                detail = details[i]
+            if detail is not None:
+                match = EARNING_DETAIL.match(detail.text)
+                earning["hours"] = match["hours"]
+                earning["rate"] = match["rate"]
+                earning["current"] = match["current"]
+            earning["ytd"] = self._text(ytds, i)
+
+    def _parse_tax_deductions(self) -> None:
+
+        taxes = self._below("Taxes")
+        if taxes and taxes[0].text == "Name":
+            taxes = taxes[1:]
+        currents = self._amounts("Current")
+        ytds = self._amounts("YTD")
+        self.tax_deductions = [
+            {
+                "name": line.text.strip(),
+                "current": self._text(currents, i),
+                "ytd": self._text(ytds, i),
+            }
+            for i, line in enumerate(taxes)
+        ]
+
+    def _parse_distributions(self) -> None:
+
+        self.distributions = [
+            {
+                "payment_method": line.text,
+                "bank_name": None,
+                "branch": None,
+                "account_type": None,
+                "payment_reference": None,
+                "payment_amount": None,
+            }
+            for line in self._below("Payment Method")
+        ]
+        for label, name in DISTRIBUTION.items():
+            for distribution, line in zip(self.distributions, self._below(label)):
+                distribution[name] = line.text
+
+    # -------------------------------------------------------------------------------
+
+    def _label_startswith(self, prefix: str) -> Line:
+        """Return the line starting with `prefix`; abort if there isn't one."""
+
+        line = self.index.startswith(prefix)
+        if line is None:
+            self._abort(f"no {prefix!r} label")
+        return line
+
+    def _nearest(self, label: str, pattern: Pattern) -> Line:
+        """Return the line matching `pattern` nearest to `label`; abort if there isn't one."""
+
+        values = (self.index.nearest(x, pattern) for x in self.index.find(label))
+        value = next(filter(None, values), None)
+        if value is None:
+            self._abort(f"no {label!r} value")
+        return value
+
+    def _below(self, label: str) -> List[Line]:
+        """Return the column under the first `label`."""
+
+        labels = self.index.find(label)
+        return self.index.below(labels[0]) if labels else []
+
+    def _amounts(self, label: str) -> List[Line]:
+        """Return the column of amounts under the first `label` with any."""
+
+        for line in self.index.find(label):
+            amounts = []
+            for value in self.index.below(line):
+                if not AMOUNT.match(value.text):
+                    break
+                amounts.append(value)
+            if amounts:
+                return amounts
+        return []
+
+    def _word(self, prefix: str, n: int) -> Optional[str]:
+        """Return the `n`th word of the line starting with `prefix`, or None."""
+
+        line = self.index.startswith(prefix)
+        return line.text.split()[n] if line else None
+
+    @staticmethod
+    def _text(lines: List[Line], n: int) -> Optional[str]:
+        """Return the text of the `n`th of `lines`, or None."""
+        return lines[n].text if n < len(lines) else None
+
+    def _abort(self, msg: str) -> None:
+        if self.dump_on_abort:
+            self.dump()
+        raise AssertionError(f"{msg} in {str(self.payslip_pdf)!r}")
@@ -0,0 +1,70 @@
+"""Manifest of the `payslip-pdf` files already copied to `archive-path`."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from .cache import file_hash
+
+
+class ArchiveManifest:
+    """Content hashes of archived payslips, and of the files they came from.
+
+    The manifest maps the sha256 of each archived file to its name in
+    `archive-path`, and remembers the `(size, mtime)` and hash of every
+    source file it has seen, so an unchanged source file is recognized
+    by `os.stat` alone, without reading (or parsing) it again.
+    """
+
+    filename = ".kroger-manifest.json"
+
+    def __init__(self, path: Path) -> None:
+        """Load manifest `path`, if it exists."""
+
+        self.path = path
+        self.archived: Dict[str, str] = {}  # hash -> archived filename.
+        self.sources: Dict[str, list] = {}  # source path -> [size, mtime_ns, hash].
+        self._dirty = False
+
+        if path.exists():
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+            self.archived = manifest["archived"]
+            self.sources = manifest["sources"]
+
+    def digest(self, payslip_pdf: Path) -> str:
+        """Return the content hash of `payslip_pdf`, hashing it only if it's new or changed."""
+
+        st = payslip_pdf.stat()
+        key = str(payslip_pdf.resolve())
+        source = self.sources.get(key)
+        if source and source[0] == st.st_size and source[1] == st.st_mtime_ns:
+            return source[2]
+
+        digest = file_hash(payslip_pdf)
+        self.sources[key] = [st.st_size, st.st_mtime_ns, digest]
+        self._dirty = True
+        return digest
+
+    def lookup(self, digest: str) -> Optional[str]:
+        """Return the name of the archived file with hash `digest`, or None."""
+        return self.archived.get(digest)
+
+    def add(self, digest: str, name: str) -> None:
+        """Record that the file with hash `digest` is archived as `name`."""
+
+        self.archived[digest] = name
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest, if changed, atomically."""
+
+        if not self._dirty:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"archived": self.archived, "sources": self.sources}, indent=1),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+        self._dirty = False
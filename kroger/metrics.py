@@ -0,0 +1,117 @@
+"""Per-phase timers and counters, reported by `kroger --profile`.
+
+Hot paths report into the process-wide `metrics`, e.g.:
+
+    with metrics.phase("extract"):
+        text = extractor.text(payslip_pdf)
+    metrics.count("cache hits")
+
+Phases should not nest; the time of each is reported as a share of the
+whole run, and what's left over is reported as `other`. Phases timed in
+worker processes run alongside the main process, and each other, so
+they're reported apart, as seconds summed across workers, not as shares.
+Timing a phase costs about a microsecond, so instrumentation is always on.
+"""
+
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# When `kroger` was imported; see `startup` in `KrogerCLI.main`.
+IMPORTED = time.perf_counter()
+
+
+class Metrics:
+    """Accumulate the seconds spent, and calls made, in each named phase; and named counters."""
+
+    def __init__(self) -> None:
+        """Start with no phases and no counters."""
+
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = Counter()
+        self.counters: Dict[str, int] = Counter()
+        # Phases timed in worker processes; see `merge`.
+        self.worker_seconds: Dict[str, float] = defaultdict(float)
+        self.worker_calls: Dict[str, int] = Counter()
+
+    def reset(self) -> None:
+        """Forget all phases and counters."""
+
+        self.seconds.clear()
+        self.calls.clear()
+        self.counters.clear()
+        self.worker_seconds.clear()
+        self.worker_calls.clear()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in the `with` block, raising or not, to phase `name`."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Add `seconds` spent in `calls` to phase `name`."""
+
+        self.seconds[name] += seconds
+        self.calls[name] += calls
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add `n` to counter `name`."""
+        self.counters[name] += n
+
+    def to_dict(self) -> dict:
+        """Return phases and counters as a `json` serializable `dict`; see `merge`."""
+
+        return {
+            "phases": {
+                name: {"seconds": seconds, "calls": self.calls[name]}
+                for name, seconds in self.seconds.items()
+            },
+            "worker-phases": {
+                name: {"seconds": seconds, "calls": self.worker_calls[name]}
+                for name, seconds in self.worker_seconds.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def merge(self, other: dict) -> None:
+        """Add the phases, as worker phases, and counters of a worker process, from `to_dict`."""
+
+        for key in ("phases", "worker-phases"):
+            for name, phase in other.get(key, {}).items():
+                self.worker_seconds[name] += phase["seconds"]
+                self.worker_calls[name] += phase["calls"]
+        for name, n in other["counters"].items():
+            self.count(name, n)
+
+    def report(self, elapsed: float) -> List[str]:
+        """Return lines describing each phase, as a share of `elapsed` seconds, and counters.
+
+        Worker phases follow, in seconds summed across workers, which may be
+        more than `elapsed`.
+        """
+
+        lines = [f"{'phase':20} {'seconds':>9} {'calls':>7} {'percent':>7}"]
+        for name, seconds in sorted(self.seconds.items(), key=lambda x: -x[1]):
+            lines.append(
+                f"{name:20} {seconds:9.3f} {self.calls[name]:7} {seconds / elapsed:7.1%}"
+            )
+        other = elapsed - sum(self.seconds.values())
+        if other > 0:
+            lines.append(f"{'other':20} {other:9.3f} {'':7} {other / elapsed:7.1%}")
+        lines.append(f"{'total':20} {elapsed:9.3f}")
+        if self.worker_seconds:
+            lines.append(f"{'worker phase':20} {'seconds':>9} {'calls':>7}")
+            for name, seconds in sorted(self.worker_seconds.items(), key=lambda x: -x[1]):
+                lines.append(f"{name:20} {seconds:9.3f} {self.worker_calls[name]:7}")
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"{name:20} {n:9}")
+        return lines
+
+
+metrics = Metrics()
@@ -1,11 +1,8 @@
 """Kroger payslip-pdf tools; signon, parse, print, and archive payslips."""
 
 import pdb
-from time import sleep
 
 from libcli import BaseCmd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
 
 
 class KrogerMyInfoCmd(BaseCmd):
@@ -36,10 +33,17 @@ class KrogerMyInfoCmd(BaseCmd):
             downloaded file, and embed the paydate into the name of an
             archived copy of the file.
 
+            The browser keeps its cookies in `browser-profile`, and signing
+            on is skipped while the SSO session is valid. If `kroger browser`
+            is running, its browser is used instead of starting another.
+
             Configuration file `{self.cli.config["config-file"]}` defines these variables:
                 myinfo-url = `{self.cli.config["myinfo-url"]}`
                 sso-user = "*******"
                 sso-password = "********"
+                sso-timeout = `{self.cli.config["sso-timeout"]}`
+                browser-profile = `{self.cli.config["browser-profile"]}`
+                browser-address = `{self.cli.config["browser-address"]}`
                 """,
             ),
         )
@@ -47,33 +51,21 @@ class KrogerMyInfoCmd(BaseCmd):
     def run(self) -> None:
         """Perform the command."""
 
-        options = webdriver.ChromeOptions()
-        driver = webdriver.Chrome(options=options)
-        driver.get(self.cli.config["myinfo-url"])
-        sleep(5)
-
-        user = driver.find_element(by=By.NAME, value="submittedIdentifier")
-        user.send_keys(self.cli.config["sso-user"])
-
-        # submit = driver.find_element(by=By.XPATH, value="//input[@type='submit']")
-        submit = driver.find_element(by=By.XPATH, value="//button[@id='btnSignIn']/div")
-        submit.click()
-        sleep(5)
-
-        password = driver.find_element(by=By.NAME, value="password")
-        password.send_keys(self.cli.config["sso-password"])
-
-        # submit = driver.find_element(by=By.XPATH, value="//input[@type='submit']")
-        submit = driver.find_element(by=By.XPATH, value="//button[@id='btnSignIn']/div")
-        submit.click()
-        sleep(10)
+        # `selenium` is imported on first use, not with `kroger.cli`.
+        # pylint: disable=import-outside-toplevel
+        from selenium.webdriver.common.by import By
 
-        pay = driver.find_element(by=By.ID, value="itemNode_my_information_pay_0")
-        pay.click()
+        from .sso import MYINFO_HOME, Browser, SsoSession
 
-        sleep(2)
-        payslips = driver.find_element(By.XPATH, value="//a[contains(., 'My Payslips')]")
-        payslips.click()
+        with Browser(self.cli.config, verbose=self.cli.options.verbose) as driver:
+            sso = SsoSession(driver, self.cli.config["sso-timeout"], self.cli.options.verbose)
+            sso.login(
+                self.cli.config["myinfo-url"],
+                self.cli.config["sso-user"],
+                self.cli.config["sso-password"],
+                signed_on=MYINFO_HOME,
+            )
+            sso.click("pay menu", MYINFO_HOME)
+            sso.click("payslips link", (By.XPATH, "//a[contains(., 'My Payslips')]"))
 
-        pdb.set_trace()  # pylint: disable=forgotten-debug-statement
-        driver.quit()
+            pdb.set_trace()  # pylint: disable=forgotten-debug-statement
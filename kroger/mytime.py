@@ -1,59 +1,107 @@
 """Kroger MyTime command."""
 
-import contextlib
+import calendar
+import os
 import re
-from time import localtime, mktime, sleep, strftime
+from datetime import date, datetime, time, timedelta, tzinfo
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+from zoneinfo import ZoneInfo
 
 from libcli import BaseCmd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+
+from .ics import Event, diff_events, read_ics, write_ics
+from .metrics import metrics
+from .schedulestore import ScheduleChanges, ScheduleStore
+
+DAYNAMES = frozenset(["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"])
 
 
 class Shift:
-    """A work shift."""
+    """A work shift, from `start` to `end`, both tz-aware."""
+
+    __slots__ = ("start", "end", "hours")
 
     # Parse strings like: "1:15 PM-8:00 PM [6.75]"
 
     pattern = re.compile(
-        "-".join(
-            [
-                r"(?P<fr_hh>\d{1,2}):(?P<fr_mm>\d{1,2}) (?P<fr_ampm>[AP]M)",
-                r"(?P<to_hh>\d{1,2}):(?P<to_mm>\d{1,2}) (?P<to_ampm>[AP]M)",
-            ]
-        )
+        r"(\d{1,2}):(\d{2}) ([AP])M-(\d{1,2}):(\d{2}) ([AP])M(?: \[(\d+(?:\.\d+)?)\])?"
     )
 
-    def __init__(self, date: int, dayname: str, daynum: int, timestr: str):
-        """Docstring."""
+    def __init__(self, start: datetime, end: datetime, hours: Optional[float] = None):
+        """Shift from `start` to `end`, scheduled to be paid for `hours`."""
+
+        self.start = start
+        self.end = end
+        self.hours = hours  # scraped from website; less than the shift if it has a break.
 
-        self.dayname: str = dayname  # scraped from website
-        self.daynum: int = daynum  # ..scraped from website
-        self.timestr: str = timestr  # scraped from website
-        self.date: int = None  # seconds since the epoch.
-        self.duration: int = None  # number of minutes.
+    @classmethod
+    def parse(cls, day: date, timestr: str, zone: tzinfo) -> Optional["Shift"]:
+        """Return the `Shift` on `day` in `zone` described by `timestr`, or None if it's not one.
 
-        m = re.match(self.pattern, timestr)
+        A shift that ends at or before it starts ends the next day.
+        """
+
+        m = cls.pattern.match(timestr)
         if not m:
-            raise ValueError(f"Can't parse {timestr!r}")
+            return None
+        fr_hh, fr_mm, fr_ampm, to_hh, to_mm, to_ampm, hours = m.groups()
+
+        # 12 AM is hour 0, and 12 PM is hour 12.
+        fr_minutes = (int(fr_hh) % 12 + (12 if fr_ampm == "P" else 0)) * 60 + int(fr_mm)
+        to_minutes = (int(to_hh) % 12 + (12 if to_ampm == "P" else 0)) * 60 + int(to_mm)
+
+        start = datetime.combine(day, time(*divmod(fr_minutes, 60)), zone)
+        end_day = day if to_minutes > fr_minutes else day + timedelta(days=1)
+        end = datetime.combine(end_day, time(*divmod(to_minutes, 60)), zone)
+
+        return cls(start, end, float(hours) if hours else None)
+
+    @classmethod
+    def from_datetimes(cls, start: datetime, end: datetime, zone: tzinfo) -> "Shift":
+        """Return the `Shift` from naive `start` to `end` in `zone`."""
+        return cls(start.replace(tzinfo=zone), end.replace(tzinfo=zone))
 
-        fr_hh = int(m["fr_hh"])
-        fr_mm = int(m["fr_mm"])
-        if m["fr_ampm"] == "PM" and fr_hh < 12:
-            fr_hh += 12
+    def problem(self) -> Optional[str]:
+        """Return what's wrong with the shift, or None; e.g., more hours than its length."""
 
-        to_hh = int(m["to_hh"])
-        to_mm = int(m["to_mm"])
-        if m["to_ampm"] == "PM" and to_hh < 12:
-            to_hh += 12
+        if self.hours is not None and self.hours * 60 > self.duration + 0.5:
+            length = self.duration / 60
+            return f"[{self.hours:.2f}] hours is more than the shift, {length:.2f} hours"
+        return None
 
-        fr_minutes = (fr_hh * 60) + fr_mm
-        self.date = date + (fr_minutes * 60)
+    @property
+    def date(self) -> int:
+        """Return the start, in seconds since the epoch."""
+        return int(self.start.timestamp())
 
-        to_minutes = (to_hh * 60) + to_mm
-        self.duration = to_minutes - fr_minutes
+    @property
+    def duration(self) -> int:
+        """Return the number of minutes worked; across DST changes, elapsed, not by the clock."""
+        return int(self.end.timestamp() - self.start.timestamp()) // 60
+
+    @property
+    def dayname(self) -> str:
+        """Return the abbreviated name of the day the shift starts."""
+        return self.start.strftime("%a")
+
+    @property
+    def daynum(self) -> int:
+        """Return the day of the month the shift starts."""
+        return self.start.day
+
+    @property
+    def timestr(self) -> str:
+        """Return the shift as the website shows it; e.g., "1:15 PM-8:00 PM [6.75]"."""
+
+        hours = self.duration / 60 if self.hours is None else self.hours
+        return f"{_clock(self.start)}-{_clock(self.end)} [{hours:.2f}]"
 
     def __eq__(self, other):
-        return self.date == other.date and self.duration == other.duration
+        return self.start == other.start and self.end == other.end
+
+    def __hash__(self):
+        return hash((self.start, self.end))
 
     def __repr__(self) -> str:
 
@@ -63,7 +111,7 @@ class Shift:
                 [
                     f"dayname={self.dayname!r}",
                     f"daynum={self.daynum!r}",
-                    f"date={strftime('%Y-%m-%d %H:%M', localtime(self.date))}",
+                    f"date={self.start:%Y-%m-%d %H:%M %Z}",
                     f"duration={self.duration//60:02}:{self.duration%60:02}",
                     f"timestr={self.timestr!r}",
                 ]
@@ -72,9 +120,42 @@ class Shift:
         )
 
 
+def schedule_zone(name: str) -> tzinfo:
+    """Return timezone `name`; if empty, the local timezone."""
+
+    name = name or os.environ.get("TZ", "").lstrip(":")
+    if name:
+        return ZoneInfo(name)
+    try:
+        with open("/etc/localtime", "rb") as file:
+            return ZoneInfo.from_file(file, key="localtime")
+    except OSError:
+        # Without DST rules, but better than nothing.
+        return datetime.now().astimezone().tzinfo
+
+
+def _month_day(daynum: int, year: int, mon: int, latest: int) -> date:
+    """Return day `daynum` of month `mon` of `year`; or, if it's after `latest`, or not
+    in that month, of the month before that has it.
+    """
+
+    if not 1 <= daynum <= 31:
+        raise ValueError(f"Invalid day of the month {daynum!r}")
+    while daynum > min(latest, calendar.monthrange(year, mon)[1]):
+        year, mon, latest = (year, mon - 1, 31) if mon > 1 else (year - 1, 12, 31)
+    return date(year, mon, daynum)
+
+
+def _clock(when: datetime) -> str:
+    """Return the time of `when` like the website does; e.g., "1:15 PM"."""
+    return f"{when.hour % 12 or 12}:{when.minute:02} {'PM' if when.hour >= 12 else 'AM'}"
+
+
 class KrogerMyTimeCmd(BaseCmd):
     """Open browser, login to Kroger MyTime, extract `Schedule`, and print `gcalcli` commands."""
 
+    title = "Fry's"
+
     def init_command(self) -> None:
         """Docstring."""
 
@@ -87,15 +168,99 @@ class KrogerMyTimeCmd(BaseCmd):
             MyTime application, extracts the `schedule`, and prints `gcalcli`
             commands to create events in the configured google calendar.
 
+            The browser keeps its cookies in `browser-profile`, and signing
+            on is skipped while the SSO session is valid. If `kroger browser`
+            is running, its browser is used instead of starting another.
+
+            With `--api`, fetch the schedule from its JSON endpoint, `mytime-api`,
+            with the browser's cookies, rather than scraping the rendered page;
+            `--weeks` weeks, if `mytime-api` takes `{{start}}` and `{{end}}` dates.
+
+            With `--format ics`, write the schedule as one iCalendar file
+            instead, to import all at once. Each shift's UID is derived from its
+            start and duration, so importing it again updates, not duplicates.
+
+            With `--diff FILE`, output only the changes since the schedule was
+            last exported to `FILE`: `gcalcli add` (or events) for new shifts,
+            and `gcalcli delete` (or cancelled events) for shifts gone from the
+            schedule; then export the schedule to `FILE` for the next run.
+
+            With `--changes`, compare the schedule, day by day, with the one
+            seen by the last `--changes` run, saved in `schedule-store`; report
+            the days added, removed and changed, and output only the shifts to
+            create and delete. When nothing changed, do nothing; e.g., to poll
+            hourly from `cron`. Past days are kept in `schedule-store`, as the
+            history for the `reconcile` command.
+
             Configuration file `{self.cli.config["config-file"]}` defines these variables:
                 mytime-url = `{self.cli.config["mytime-url"]}`
+                mytime-api = `{self.cli.config["mytime-api"]}`
+                schedule-store = `{self.cli.config["schedule-store"]}`
+                timezone = `{self.cli.config["timezone"]}`
                 google-calendar = "*******"
                 sso-user = "*******"
                 sso-password = "********"
+                sso-timeout = `{self.cli.config["sso-timeout"]}`
+                browser-profile = `{self.cli.config["browser-profile"]}`
+                browser-address = `{self.cli.config["browser-address"]}`
                 """,
             ),
         )
 
+        parser.add_argument(
+            "--headless",
+            action="store_true",
+            help="Run the browser without a window; e.g., from `cron`",
+        )
+
+        parser.add_argument(
+            "--api",
+            action="store_true",
+            help="Fetch the schedule from `mytime-api`",
+        )
+
+        arg = parser.add_argument(
+            "--weeks",
+            type=int,
+            default=2,
+            metavar="N",
+            help="With `--api`, fetch `N` weeks of schedule",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        arg = parser.add_argument(
+            "--format",
+            choices=["gcalcli", "ics"],
+            default="gcalcli",
+            help="Print `gcalcli` commands, or write an iCalendar file",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        arg = parser.add_argument(
+            "-o",
+            "--output",
+            type=Path,
+            default=Path("kroger-schedule.ics"),
+            metavar="FILE",
+            help="With `--format ics`, write to `FILE`",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        group = parser.add_mutually_exclusive_group()
+
+        group.add_argument(
+            "--diff",
+            type=Path,
+            metavar="FILE",
+            help="Output changes since the last export to `FILE`, and update it",
+        )
+
+        group.add_argument(
+            "--changes",
+            action="store_true",
+            help="Output changes since the last run, if any, per `schedule-store`",
+        )
+
         parser.add_argument(
             "--test1",
             action="store_true",
@@ -117,73 +282,191 @@ class KrogerMyTimeCmd(BaseCmd):
     def run(self) -> None:
         """Perform the command."""
 
+        zone = schedule_zone(self.cli.config["timezone"])
+        days = [datetime.now(zone).date()]  # the days the schedule covers; from today.
         if self.options.test1:
-            schedule = self.example_schedule
+            shifts = self.parse_schedule(self.example_schedule, zone, days=days)
         elif self.options.test2:
-            schedule = self.example_schedule2
+            shifts = self.parse_schedule(self.example_schedule2, zone, days=days)
         elif self.options.test3:
-            schedule = self.example_schedule3
+            shifts = self.parse_schedule(self.example_schedule3, zone, days=days)
+        elif self.options.api:
+            shifts = self.get_shifts(zone, days)
         else:
             schedule = self.get_schedule()
             if self.cli.options.verbose:
                 for line in schedule:
                     print("#", line)
+            with metrics.phase("parse schedule"):
+                # Parsed as it's consumed; so, consumed here.
+                shifts = list(self.parse_schedule(schedule, zone, days=days))
+
+        events = [Event.from_shift(x) for x in self.unique_shifts(shifts)]
+        metrics.count("shifts", len(events))
+        days += [x.start.date() for x in events]
+        covered = (min(days), max(days))
+        cancelled: List[Event] = []
+
+        if self.options.changes:
+            store = ScheduleStore(Path(self.cli.config["schedule-store"]).expanduser())
+            changes = store.diff(events, covered)
+            if not changes:
+                if self.cli.options.verbose:
+                    print("# schedule unchanged")
+                return
+            self._print_changes(changes)
+            store.update(events, covered)
+            store.save()
+            events, cancelled = changes.creates, changes.deletes
+            if self.options.format == "ics":
+                # Same UID as before; importing updates, not duplicates, the event.
+                events = sorted(events + changes.updates)
+
+        elif self.options.diff:
+            previous = read_ics(self.options.diff, zone) if self.options.diff.exists() else []
+            creates, cancelled = diff_events(events, previous, covered)
+            print(f"# {len(creates)} to create, {len(cancelled)} to delete")
+            with open(self.options.diff, "w", encoding="utf-8", newline="") as file:
+                write_ics(file, events, self.title, zone=zone)
+            events = creates
+
+        if self.options.format == "ics":
+            with open(self.options.output, "w", encoding="utf-8", newline="") as file:
+                write_ics(file, events, self.title, cancelled, zone)
+            print(
+                f"# wrote {len(events) + len(cancelled)} events to {str(self.options.output)!r}"
+            )
+            return
 
-        _last_shift = None
-        for shift in self.parse_schedule(schedule):
-            if _last_shift and shift == _last_shift:
-                # Shifts are doubled for Today.
-                print("# ignoring repeated shift.")
-                continue
-            _last_shift = shift
+        # `gcalcli` takes times in the system's zone, which may not be the schedule's.
+        for event in cancelled:
+            start = event.aware(zone).astimezone()
+            print(
+                "gcalcli",
+                "delete",
+                "--calendar",
+                self.cli.config["google-calendar"],
+                "--iamaexpert",
+                repr(self.title),
+                f'"{start:%Y-%m-%d %H:%M}"',
+                f'"{start + timedelta(minutes=1):%Y-%m-%d %H:%M}"',
+            )
 
+        for event in events:
+            start = event.aware(zone).astimezone()
             print(
                 "gcalcli",
                 "add",
                 "--calendar",
                 self.cli.config["google-calendar"],
                 "--title",
-                repr("Fry's"),
+                repr(self.title),
                 "--when",
-                strftime('"%Y-%m-%d %H:%M"', localtime(shift.date)),
+                f'"{start:%Y-%m-%d %H:%M}"',
                 "--duration",
-                shift.duration,
+                event.minutes,
                 "--reminder",
                 "30m",
                 "--noprompt",
             )
 
-    def get_schedule(self) -> ["str"]:
-        """Opens a browser, logs in to Kroger's MyTime, and returns the schedule."""
+    @staticmethod
+    def _print_changes(changes: ScheduleChanges) -> None:
+        """Print a line for each day `changes` added, removed or changed."""
 
-        options = webdriver.ChromeOptions()
-        driver = webdriver.Chrome(options=options)
-        driver.get(self.cli.config["mytime-url"])
-        sleep(5)
-
-        user = driver.find_element(by=By.NAME, value="submittedIdentifier")
-        user.send_keys(self.cli.config["sso-user"])
+        def _shifts(day) -> str:
+            return ", ".join(
+                f"{x.start:%H:%M}-{x.start + timedelta(minutes=x.minutes):%H:%M}"
+                + ("" if x.hours is None else f" [{x.hours:.2f}]")
+                for x in sorted(day)
+            )
 
-        # submit = driver.find_element(by=By.XPATH, value="//input[@type='submit']")
-        submit = driver.find_element(by=By.XPATH, value="//button[@id='btnSignIn']/div")
-        submit.click()
-        sleep(5)
+        for what, days in (("added", changes.added), ("removed", changes.removed)):
+            for day, shifts in sorted(days.items()):
+                print(f"# {what:7} {day:%a %Y-%m-%d} {_shifts(shifts)}")
+        for day, (old, new) in sorted(changes.changed.items()):
+            print(f"# changed {day:%a %Y-%m-%d} {_shifts(old)} -> {_shifts(new)}")
 
-        password = driver.find_element(by=By.NAME, value="password")
-        password.send_keys(self.cli.config["sso-password"])
+    @staticmethod
+    def unique_shifts(shifts: Iterable[Shift]) -> Iterator[Shift]:
+        """Yield `shifts`, less repeats."""
 
-        # submit = driver.find_element(by=By.XPATH, value="//input[@type='submit']")
-        submit = driver.find_element(by=By.XPATH, value="//button[@id='btnSignIn']/div")
-        submit.click()
-        sleep(10)
+        _last_shift = None
+        for shift in shifts:
+            if _last_shift and shift == _last_shift:
+                # Shifts are doubled for Today.
+                print("# ignoring repeated shift.")
+                continue
+            _last_shift = shift
+            yield shift
 
-        schedule = driver.find_element(by=By.XPATH, value="//ng-myschedule-list")
-        lines = schedule.text.splitlines()
+    def get_schedule(self) -> ["str"]:
+        """Opens a browser, logs in to Kroger's MyTime, and returns the schedule."""
 
-        driver.quit()
+        # `selenium` is imported on first use, not with `kroger.cli`.
+        # pylint: disable=import-outside-toplevel
+        from .sso import MYTIME_HOME, Browser, SsoSession
+
+        with Browser(
+            self.cli.config, headless=self.options.headless, verbose=self.cli.options.verbose
+        ) as driver:
+            sso = SsoSession(driver, self.cli.config["sso-timeout"], self.cli.options.verbose)
+            sso.login(
+                self.cli.config["mytime-url"],
+                self.cli.config["sso-user"],
+                self.cli.config["sso-password"],
+                signed_on=MYTIME_HOME,
+            )
+            schedule = sso.visible("schedule", MYTIME_HOME)
+            with metrics.phase("scrape"):
+                lines = schedule.text.splitlines()
 
         return lines
 
+    def get_shifts(self, zone: tzinfo, days: Optional[List[date]] = None) -> List[Shift]:
+        """Signs on to Kroger's MyTime, and returns the `Shift`s in `zone` from `mytime-api`.
+
+        The first and last days fetched are appended to `days`, if given.
+        """
+
+        endpoint = self.cli.config["mytime-api"]
+        if not endpoint:
+            self.cli.parser.exit(
+                2, f"error: Missing `mytime-api` in `{self.cli.config['config-file']}`\n"
+            )
+
+        # `selenium` is imported on first use, not with `kroger.cli`.
+        # pylint: disable=import-outside-toplevel
+        from .mytimeapi import ScheduleClient, parse_shifts, schedule_urls
+        from .sso import MYTIME_HOME, Browser, SsoSession
+
+        with Browser(
+            self.cli.config, headless=self.options.headless, verbose=self.cli.options.verbose
+        ) as driver:
+            sso = SsoSession(driver, self.cli.config["sso-timeout"], self.cli.options.verbose)
+            sso.login(
+                self.cli.config["mytime-url"],
+                self.cli.config["sso-user"],
+                self.cli.config["sso-password"],
+                signed_on=MYTIME_HOME,
+            )
+            cookies = driver.get_cookies()
+
+        start = datetime.now(zone).date()  # in the schedule's zone, as `run` counts days.
+        if days is not None:
+            days += [start, start + timedelta(weeks=self.options.weeks, days=-1)]
+
+        shifts = []
+        with ScheduleClient(cookies, self.cli.config["sso-timeout"]) as client:
+            for url in schedule_urls(endpoint, start, self.options.weeks):
+                if self.cli.options.verbose:
+                    print(f"# GET {url}")
+                with metrics.phase("api"):
+                    schedule = client.get_json(url)
+                for start, end in parse_shifts(schedule):
+                    shifts.append(Shift.from_datetimes(start, end, zone))
+        return shifts
+
     # The first day has 4 or 6 lines; each remaining day has 3 lines.
     example_schedule = [
         "Sat",
@@ -269,39 +552,54 @@ class KrogerMyTimeCmd(BaseCmd):
         "12:00 PM-6:00 PM [6.00]",
     ]
 
-    def parse_schedule(self, schedule: ["str"]) -> [Shift]:
-        """Yields `Shift`s from the given `schedule`."""
-
-        # The schedule always begins with today.
-        _t = localtime()
-        year, mon = _t.tm_year, _t.tm_mon
-
-        _first = True
-        while schedule:
-            dayname = schedule.pop(0)
-            daynum = int(schedule.pop(0))
-
-            if not _first and daynum == 1:  # new month.
-                if mon < 12:
-                    mon += 1
-                else:
-                    mon = 1
-                    year += 1
-            _first = False
-            date = mktime((year, mon, daynum, 0, 0, 0, 0, 0, 0))
-
-            while schedule and schedule[0] not in [
-                "Sun",
-                "Mon",
-                "Tue",
-                "Wed",
-                "Thu",
-                "Fri",
-                "Sat",
-            ]:
-                timestr = schedule.pop(0)
+    @staticmethod
+    def parse_schedule(
+        schedule: Iterable[str],
+        zone: tzinfo,
+        year: Optional[int] = None,
+        mon: Optional[int] = None,
+        days: Optional[List[date]] = None,
+    ) -> Iterator[Shift]:
+        """Yields `Shift`s in `zone` from the lines of the given `schedule`, which isn't changed.
+
+        The schedule begins in month `mon` of `year`, default today's; or,
+        if its first day isn't in that month, the month before. Each day of
+        the schedule, with shifts or not, is appended to `days`, if given.
+        """
+
+        # The schedule always begins with today; allow for a week's slack.
+        latest = 31
+        if year is None or mon is None:
+            today = datetime.now(zone)
+            year, mon, latest = today.year, today.month, today.day + 7
+
+        lines = iter(schedule)
+        line = next(lines, None)
+        day = _last_daynum = None
+        while line is not None:
+            dayname = line
+            daynum = int(next(lines))
+
+            if day is None:
+                day = _month_day(daynum, year, mon, latest)
+            else:
+                # Days are in order, with gaps of less than a month.
+                month_days = calendar.monthrange(day.year, day.month)[1]
+                day += timedelta(days=(daynum - _last_daynum) % month_days)
+            _last_daynum = daynum
+            if days is not None:
+                days.append(day)
+
+            line = None
+            for timestr in lines:
+                if timestr in DAYNAMES:
+                    line = timestr
+                    break
                 if timestr == "Today":
                     continue
                 print(f"# {dayname!r} {daynum!r} {timestr!r}")
-                with contextlib.suppress(ValueError):
-                    yield Shift(date, dayname, daynum, timestr)
+                shift = Shift.parse(day, timestr, zone)
+                if shift:
+                    if problem := shift.problem():
+                        print(f"# warning: {timestr!r} on {day}: {problem}")
+                    yield shift
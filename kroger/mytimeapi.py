@@ -0,0 +1,120 @@
+"""Fetch the MyTime schedule from its JSON endpoint, reusing a signed-on browser's cookies.
+
+The endpoint, `mytime-api`, is the XHR the MyTime schedule page itself
+calls; e.g., find it in the browser's developer tools. It may contain
+`{start}` and `{end}` placeholders, which are replaced with the ISO dates
+of each week fetched. Its response is a JSON object with a list of
+`shifts`, each with local `startDateTime` and `endDateTime`:
+
+    {"shifts": [{"startDateTime": "2023-11-26T13:00:00",
+                 "endDateTime": "2023-11-26T19:30:00", ...}, ...]}
+"""
+
+import http.client
+import json
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+
+class ScheduleClient:
+    """Plain HTTP client for the schedule endpoint, reusing one connection per host."""
+
+    def __init__(self, cookies: List[Dict[str, str]], timeout: float = 30) -> None:
+        """Send those of `cookies` (as from `WebDriver.get_cookies`) that match each host."""
+
+        self.cookies = cookies
+        self.timeout = timeout
+        self._connections: Dict[tuple, http.client.HTTPConnection] = {}
+
+    def __enter__(self) -> "ScheduleClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all connections."""
+
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+
+    def get_json(self, url: str):
+        """Return the decoded JSON response to a GET of `url`."""
+
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {"Accept": "application/json"}
+        if cookie := self._cookie_header(parts.hostname or ""):
+            headers["Cookie"] = cookie
+
+        # Retry once on a fresh connection, if the server closed the idle one.
+        for retry in (False, True):
+            connection = self._connection(parts.scheme, parts.netloc, fresh=retry)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if retry:
+                    raise
+
+        if response.status != 200:
+            raise RuntimeError(f"GET {url!r}: {response.status} {response.reason}")
+        return json.loads(body)
+
+    def _connection(self, scheme: str, netloc: str, fresh: bool) -> http.client.HTTPConnection:
+        """Return the open connection to `netloc`, opening one if needed, or `fresh`."""
+
+        key = (scheme, netloc)
+        connection = self._connections.get(key)
+        if connection is not None and fresh:
+            connection.close()
+            connection = None
+        if connection is None:
+            cls = (
+                http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            )
+            connection = cls(netloc, timeout=self.timeout)
+            self._connections[key] = connection
+        return connection
+
+    def _cookie_header(self, host: str) -> Optional[str]:
+        """Return the `Cookie` header for `host`, or None."""
+
+        cookies = [
+            f"{x['name']}={x['value']}"
+            for x in self.cookies
+            if not x.get("domain")
+            or host == x["domain"].lstrip(".")
+            or host.endswith("." + x["domain"].lstrip("."))
+        ]
+        return "; ".join(cookies) or None
+
+
+def schedule_urls(endpoint: str, start: date, weeks: int) -> List[str]:
+    """Return the urls to fetch `weeks` of schedule from `start`, from `endpoint`."""
+
+    if "{start}" not in endpoint:
+        return [endpoint]
+    return [
+        endpoint.format(
+            start=(start + timedelta(weeks=week)).isoformat(),
+            end=(start + timedelta(weeks=week, days=6)).isoformat(),
+        )
+        for week in range(weeks)
+    ]
+
+
+def parse_shifts(response: dict) -> Iterator[tuple]:
+    """Yield the `(start, end)` datetimes of the shifts in `response`."""
+
+    for shift in response.get("shifts", []):
+        yield (
+            datetime.fromisoformat(shift["startDateTime"]),
+            datetime.fromisoformat(shift["endDateTime"]),
+        )
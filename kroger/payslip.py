@@ -0,0 +1,146 @@
+"""Typed records of the fields parsed from a `payslip-pdf` file."""
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from .pdfparser import KrogerPdfParser
+
+
+def to_decimal(value: Union[str, float, None]) -> Optional[Decimal]:
+    """Return amount `value`, such as "1,234.56" or "14.0000 USD", as a `Decimal`.
+
+    Return None for None or blank text. A float is converted by its shortest
+    repr, so 123.4 becomes Decimal("123.4"), not its binary approximation.
+    """
+
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return Decimal(repr(value))
+
+    text = value.replace(",", "").removesuffix("USD").strip()
+    if not text:
+        return None
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Can't parse amount {value!r}") from None
+
+
+@dataclass(slots=True, frozen=True)
+class EarningLine:
+    """An earning; e.g., "Regular Pay"."""
+
+    name: str
+    current: Optional[Decimal]
+    ytd: Optional[Decimal]
+    hours: Optional[Decimal] = None
+    rate: Optional[Decimal] = None
+
+
+@dataclass(slots=True, frozen=True)
+class DeductionLine:
+    """A tax deduction; e.g., "Federal Withholding"."""
+
+    name: str
+    current: Optional[Decimal]
+    ytd: Optional[Decimal]
+
+
+@dataclass(slots=True, frozen=True)
+class Distribution:
+    """Where (part of) the net pay was paid to."""
+
+    payment_method: str
+    bank_name: Optional[str]
+    branch: Optional[str]
+    account_type: Optional[str]
+    payment_reference: Optional[str]
+    payment_amount: Optional[Decimal]
+
+
+@dataclass(slots=True, frozen=True)
+class Payslip:
+    """The fields of a `payslip-pdf` file, with every amount a `Decimal`."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    payslip_pdf: Optional[Path]
+    empno: str
+    division: Optional[str]
+    location: Optional[str]
+    period_begin: date
+    period_end: date
+    payment_date: date
+    payroll: str
+    pay_frequency: str
+    hourly_rate: Optional[Decimal]
+    total_hours_worked: Decimal
+    sick_hours_available: Optional[Decimal]
+    gross: Decimal
+    gross_ytd: Optional[Decimal]
+    non_payroll: Optional[Decimal]
+    non_payroll_ytd: Optional[Decimal]
+    pretax_deductions: Optional[Decimal]
+    pretax_deductions_ytd: Optional[Decimal]
+    tax_deductions: Optional[Decimal]
+    tax_deductions_ytd: Optional[Decimal]
+    after_tax_deduction: Optional[Decimal]
+    after_tax_deduction_ytd: Optional[Decimal]
+    net_pay: Decimal
+    net_pay_ytd: Optional[Decimal]
+    earnings: Tuple[EarningLine, ...]
+    deductions: Tuple[DeductionLine, ...]
+    distributions: Tuple[Distribution, ...]
+
+    @classmethod
+    def from_pdf(cls, pdf: KrogerPdfParser) -> "Payslip":
+        """Return the `Payslip` of fully parsed (not `archive_flag`) `pdf`."""
+
+        payslip = pdf.payslip
+        summary = pdf.summary
+        return cls(
+            payslip_pdf=pdf.payslip_pdf,
+            empno=pdf.employee["empno"],
+            division=pdf.company["division"],
+            location=pdf.company["location"],
+            period_begin=payslip["period_begin"].date(),
+            period_end=payslip["period_end"].date(),
+            payment_date=payslip["payment_date"].date(),
+            payroll=payslip["payroll"],
+            pay_frequency=payslip["pay_frequency"],
+            hourly_rate=to_decimal(payslip["hourly_rate"]),
+            total_hours_worked=to_decimal(payslip["total_hours_worked"]),
+            sick_hours_available=to_decimal(payslip["sick_hours_available"]),
+            **{name: to_decimal(value) for name, value in summary.items()},
+            earnings=tuple(
+                EarningLine(
+                    e["name"],
+                    to_decimal(e["current"]),
+                    to_decimal(e["ytd"]),
+                    to_decimal(e["hours"]),
+                    to_decimal(e["rate"]),
+                )
+                for e in pdf.earnings
+            ),
+            deductions=tuple(
+                DeductionLine(d["name"], to_decimal(d["current"]), to_decimal(d["ytd"]))
+                for d in pdf.tax_deductions
+            ),
+            distributions=tuple(
+                Distribution(
+                    payment_method=d["payment_method"],
+                    bank_name=d["bank_name"],
+                    branch=d["branch"],
+                    account_type=d["account_type"],
+                    payment_reference=d["payment_reference"],
+                    payment_amount=to_decimal(d["payment_amount"]),
+                )
+                for d in pdf.distributions
+            ),
+        )
@@ -1,10 +1,52 @@
 """Kroger payslip-pdf tools; signon, parse, print, and archive payslips."""
 
+import contextlib
 from datetime import datetime
 from pathlib import Path
 from pprint import pprint
+from typing import Callable, List, Optional
 
-from pdfminer.high_level import extract_text
+from .metrics import metrics
+
+# Bump whenever parsing changes the resulting data structures;
+# it invalidates previously cached results (see `kroger.cache`).
+PARSER_VERSION = 2
+
+
+class LineCursor:
+    """Cursor over the lines of text extracted from a `payslip-pdf` file.
+
+    Advancing is O(1); the lines themselves are never modified. Reading
+    past the end raises `IndexError`, like indexing a list.
+    """
+
+    __slots__ = ("lines", "pos", "abort")
+
+    def __init__(self, lines: List[str], abort: Callable[[str], None]) -> None:
+        """Position cursor at the first of `lines`; `expect` failures call `abort`."""
+
+        self.lines = lines
+        self.pos = 0  # number of lines consumed.
+        self.abort = abort
+
+    def __len__(self) -> int:
+        return len(self.lines) - self.pos
+
+    def peek(self, offset: int = 0) -> str:
+        """Return the line `offset` lines after the current line, without consuming it."""
+        return self.lines[self.pos + offset]
+
+    def take(self) -> str:
+        """Consume and return the current line."""
+        line = self.lines[self.pos]
+        self.pos += 1
+        return line
+
+    def expect(self, expected: str) -> None:
+        """Consume the current line, and `abort` unless it is `expected`."""
+        text = self.take()
+        if text != expected:
+            self.abort(f"text {text!r} != expected {expected!r}")
 
 
 class KrogerPdfParser:
@@ -23,59 +65,122 @@ class KrogerPdfParser:
     distributions = None
     lines: [str] = None
     num_lines: int = None
+    cursor: LineCursor = None
     payslip_pdf: Path = None
+    dump_on_abort: bool = True
+
+    # parsed data structures; see `to_dict` and `from_dict`.
+    _state = (
+        "company",
+        "employee",
+        "payslip",
+        "w4",
+        "summary",
+        "earnings",
+        "tax_deductions",
+        "distributions",
+    )
 
     def __init__(self, payslip_pdf: Path, archive_flag=False) -> None:
-        """Parse Kroger `payslip-pdf` file."""
+        """Parse Kroger `payslip-pdf` file.
+
+        Parse the text of the first page alone if possible; the rest is
+        usually fine print. With `archive_flag`, parse only enough to name
+        the archived file.
+        """
+
+        # `pdfminer` is imported on first use, not with `kroger.cli`.
+        # pylint: disable=import-outside-toplevel
+        from pdfminer.layout import LAParams
+
+        from .extract import shared_extractor
+
+        self.payslip_pdf = payslip_pdf
+        extractor = shared_extractor()
+
+        # With `archive_flag`, sort text boxes by position, instead of the
+        # costly hierarchical grouping of `boxes_flow`; the fields parsed
+        # are in the same order either way. Fallback to the full text of
+        # every page if the first isn't enough.
+        laparams = LAParams(boxes_flow=None) if archive_flag else LAParams()
+        self.dump_on_abort = False
+        with contextlib.suppress(AssertionError, IndexError, ValueError):
+            with metrics.phase("extract"):
+                text = extractor.text(payslip_pdf, maxpages=1, laparams=laparams)
+            with metrics.phase("parse"):
+                self._parse(text, archive_flag)
+            self._release()
+            return
+        del self.dump_on_abort
+
+        metrics.count("parsed all pages")
+        with metrics.phase("extract"):
+            text = extractor.text(payslip_pdf)
+        with metrics.phase("parse"):
+            self._parse(text, archive_flag)
+        self._release()
+
+    @classmethod
+    def from_text(
+        cls, text: str, payslip_pdf: Optional[Path] = None, archive_flag=False
+    ) -> "KrogerPdfParser":
+        """Return parser of `text` already extracted from `payslip_pdf`."""
+
+        pdf = cls.__new__(cls)
+        pdf.payslip_pdf = payslip_pdf
+        pdf._parse(text, archive_flag)
+        pdf._release()
+        return pdf
+
+    def _parse(self, text: str, archive_flag: bool) -> None:
 
         # pylint: disable=too-many-branches
         # pylint: disable=too-many-statements
 
-        text = extract_text(payslip_pdf)
         self.lines = text.splitlines()
         self.num_lines = len(self.lines)
-        self.payslip_pdf = payslip_pdf
+        self.cursor = LineCursor(self.lines, self._abort)
 
         # Begin parsing...
 
         self.company = {
-            "name1": self.lines.pop(0),  # Smith's Food and Drug Centers, Inc. (FEIN: 87-
-            "name2": self.lines.pop(0),  # 0258768)
-            "addr1": self.lines.pop(0),  # 1014 Vine Street
-            "addr2": self.lines.pop(0),  # Cincinnati OH 45202
+            "name1": self.cursor.take(),  # Smith's Food and Drug Centers, Inc. (FEIN: 87-
+            "name2": self.cursor.take(),  # 0258768)
+            "addr1": self.cursor.take(),  # 1014 Vine Street
+            "addr2": self.cursor.take(),  # Cincinnati OH 45202
             "division": None,
             "location": None,
         }
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("")
 
-        self.assert_startswith(self.lines[0], "Person Number: ")
+        self.assert_startswith(self.cursor.peek(), "Person Number: ")
         self.employee = {
-            "empno": self.lines.pop(0).split()[2],  # Person Number: 1234567
-            "name": self.lines.pop(0),  # John Doe
-            "addr1": self.lines.pop(0),  # 125 N. Main Street
-            "addr2": self.lines.pop(0),  # Anytown US 12345
+            "empno": self.cursor.take().split()[2],  # Person Number: 1234567
+            "name": self.cursor.take(),  # John Doe
+            "addr1": self.cursor.take(),  # 125 N. Main Street
+            "addr2": self.cursor.take(),  # Anytown US 12345
         }
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("")
 
         # This section may be here, or it may be below.
 
-        if self.lines[0].startswith("Division: "):
-            self.company["division"] = self.lines.pop(0).split()[1]  # 2nd word
-            self.assert_startswith(self.lines[0], "HR Location: ")
-            self.company["location"] = self.lines.pop(0).split()[2]  # 3rd word
-            self.assert_eq(self.lines.pop(0), "")
+        if self.cursor.peek().startswith("Division: "):
+            self.company["division"] = self.cursor.take().split()[1]  # 2nd word
+            self.assert_startswith(self.cursor.peek(), "HR Location: ")
+            self.company["location"] = self.cursor.take().split()[2]  # 3rd word
+            self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Period")
-        self.assert_eq(self.lines.pop(0), "Payment Date")
-        self.assert_eq(self.lines.pop(0), "Payroll")
-        self.assert_eq(self.lines.pop(0), "")
-        self.assert_eq(self.lines.pop(0), "Pay Frequency")
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("Period")
+        self.cursor.expect("Payment Date")
+        self.cursor.expect("Payroll")
+        self.cursor.expect("")
+        self.cursor.expect("Pay Frequency")
+        self.cursor.expect("")
 
         self.payslip = {
-            "period": self.lines.pop(0),  # 09/10/23 - 09/16/23
-            "payment_date": self.lines.pop(0),  # 09/21/23
-            "payroll": self.lines.pop(0),  # Retail Weekly Sun-Sat
+            "period": self.cursor.take(),  # 09/10/23 - 09/16/23
+            "payment_date": self.cursor.take(),  # 09/21/23
+            "payroll": self.cursor.take(),  # Retail Weekly Sun-Sat
             "pay_frequency": None,
             "hourly_rate": None,
             "has_sunday_pay": False,
@@ -100,28 +205,28 @@ class KrogerPdfParser:
         # Continue parsing...
         # -------------------------------------------------------------------------------
 
-        self.assert_eq(self.lines.pop(0), "")
-        self.payslip["pay_frequency"] = self.lines.pop(0)  # Weekly
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("")
+        self.payslip["pay_frequency"] = self.cursor.take()  # Weekly
+        self.cursor.expect("")
 
         # This section may be here, or it may have been above.
 
-        if self.lines[0].startswith("Division: "):
-            self.company["division"] = self.lines.pop(0).split()[1]  # 2nd word
-            self.assert_startswith(self.lines[0], "HR Location: ")
-            self.company["location"] = self.lines.pop(0).split()[2]  # 3rd word
-            self.assert_eq(self.lines.pop(0), "")
+        if self.cursor.peek().startswith("Division: "):
+            self.company["division"] = self.cursor.take().split()[1]  # 2nd word
+            self.assert_startswith(self.cursor.peek(), "HR Location: ")
+            self.company["location"] = self.cursor.take().split()[2]  # 3rd word
+            self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Hourly Rate")
-        self.assert_eq(self.lines.pop(0), "")
-        self.payslip["hourly_rate"] = self.lines.pop(0)  # 14.0000 USD
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("Hourly Rate")
+        self.cursor.expect("")
+        self.payslip["hourly_rate"] = self.cursor.take()  # 14.0000 USD
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Type")
+        self.cursor.expect("Type")
         self.w4 = {
-            "line1": self.lines.pop(0),  # "FEDERAL_2020"
-            "line2": self.lines.pop(0),  # "AZ"
-            "line3": self.lines.pop(0),  # ""
+            "line1": self.cursor.take(),  # "FEDERAL_2020"
+            "line2": self.cursor.take(),  # "AZ"
+            "line3": self.cursor.take(),  # ""
             "marital_status1": None,
             "marital_status2": None,
             "exemptions1": None,
@@ -130,37 +235,39 @@ class KrogerPdfParser:
             "additional_amount2": None,
         }
 
-        self.assert_eq(self.lines.pop(0), "Current")
-        self.assert_eq(self.lines.pop(0), "Year To Date")
-        self.assert_eq(self.lines.pop(0), "")
-        self.assert_eq(self.lines.pop(0), "Name")
+        self.cursor.expect("Current")
+        self.cursor.expect("Year To Date")
+        self.cursor.expect("")
+        self.cursor.expect("Name")
 
         # -------------------------------------------------------------------------------
 
         self.earnings = []
-        while self.lines[0]:
+        while self.cursor.peek():
             self.earnings.append(
                 {
-                    "name": self.lines.pop(0).strip(),
+                    "name": self.cursor.take().strip(),
                     "current": None,
                     "ytd": None,
+                    "hours": None,
+                    "rate": None,
                 }
             )
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("")
 
         # -------------------------------------------------------------------------------
 
-        self.assert_eq(self.lines.pop(0), "Marital Status")
-        self.w4["marital_status1"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("Marital Status")
+        self.w4["marital_status1"] = self.cursor.take()
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "W4 Information")
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("W4 Information")
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Exemptions")
-        self.w4["exemptions1"] = self.lines.pop(0)
-        self.w4["exemptions2"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("Exemptions")
+        self.w4["exemptions1"] = self.cursor.take()
+        self.w4["exemptions2"] = self.cursor.take()
+        self.cursor.expect("")
 
         # -------------------------------------------------------------------------------
 
@@ -179,175 +286,175 @@ class KrogerPdfParser:
             "net_pay_ytd": None,
         }
 
-        if self.lines[0] == "Additional Amount":
-            self.lines.pop(0)
-            self.lines.pop(0)
-            self.lines.pop(0)
-            self.assert_eq(self.lines.pop(0), "")
+        if self.cursor.peek() == "Additional Amount":
+            self.cursor.take()
+            self.cursor.take()
+            self.cursor.take()
+            self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Gross Earnings")
-        self.summary["gross"] = float(self.lines.pop(0))
-        self.summary["gross_ytd"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("Gross Earnings")
+        self.summary["gross"] = float(self.cursor.take())
+        self.summary["gross_ytd"] = self.cursor.take()
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Non Payroll")
-        self.summary["non_payroll"] = self.lines.pop(0)
-        self.summary["non_payroll_ytd"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("Non Payroll")
+        self.summary["non_payroll"] = self.cursor.take()
+        self.summary["non_payroll_ytd"] = self.cursor.take()
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), " Earnings")
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect(" Earnings")
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Summary")
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("Summary")
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Pretax Deductions")
-        self.summary["pretax_deductions"] = self.lines.pop(0)
-        self.summary["pretax_deductions_ytd"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("Pretax Deductions")
+        self.summary["pretax_deductions"] = self.cursor.take()
+        self.summary["pretax_deductions_ytd"] = self.cursor.take()
+        self.cursor.expect("")
 
         # -------------------------------------------------------------------------------
         # This section may be here, or it may be below.
 
-        if self.lines[0] == "Tax Deductions":
-            self.lines.pop(0)
-            self.summary["tax_deductions"] = self.lines.pop(0)
-            self.summary["tax_deductions_ytd"] = self.lines.pop(0)
-            self.assert_eq(self.lines.pop(0), "")
+        if self.cursor.peek() == "Tax Deductions":
+            self.cursor.take()
+            self.summary["tax_deductions"] = self.cursor.take()
+            self.summary["tax_deductions_ytd"] = self.cursor.take()
+            self.cursor.expect("")
 
         # -------------------------------------------------------------------------------
         # This section may be here, or it may be below.
 
-        if self.lines[0] == "After Tax Deduction":
-            self.lines.pop(0)
-            self.summary["after_tax_deduction"] = self.lines.pop(0)
-            self.summary["after_tax_deduction_ytd"] = self.lines.pop(0)
-            self.assert_eq(self.lines.pop(0), "Pretax Deductions")
-            self.assert_eq(self.lines.pop(0), "Tax Deductions")
-            self.assert_eq(self.lines.pop(0), "")
+        if self.cursor.peek() == "After Tax Deduction":
+            self.cursor.take()
+            self.summary["after_tax_deduction"] = self.cursor.take()
+            self.summary["after_tax_deduction_ytd"] = self.cursor.take()
+            self.cursor.expect("Pretax Deductions")
+            self.cursor.expect("Tax Deductions")
+            self.cursor.expect("")
 
         # -------------------------------------------------------------------------------
 
         if (
-            self.lines[0]
+            self.cursor.peek()
             == "Start Date End Date Hours  x  Rate  xi Factor  =  Current Hrs YTD Earnings YTD"
         ):
-            self.lines.pop(0)
+            self.cursor.take()
             for i in range(len(self.earnings)):
-                if not self.lines[0]:
+                if not self.cursor.peek():
                     break
-                self.earnings[i]["ytd"] = self.lines.pop(0)
+                self.earnings[i]["ytd"] = self.cursor.take()
 
             # skip unparsable section
-            while self.lines[0] not in ["Tax Deductions", "After Tax Deduction", "Name"]:
-                # print(f"SKIPPING {self.lines[0]!r}")
-                self.lines.pop(0)
+            while self.cursor.peek() not in ["Tax Deductions", "After Tax Deduction", "Name"]:
+                # print(f"SKIPPING {self.cursor.peek()!r}")
+                self.cursor.take()
 
         # -------------------------------------------------------------------------------
         # This section may be here, or it may have been above.
 
-        if self.lines[0] == "Tax Deductions":
-            self.lines.pop(0)
-            self.summary["tax_deductions"] = self.lines.pop(0)
-            self.summary["tax_deductions_ytd"] = self.lines.pop(0)
-            self.assert_eq(self.lines.pop(0), "")
+        if self.cursor.peek() == "Tax Deductions":
+            self.cursor.take()
+            self.summary["tax_deductions"] = self.cursor.take()
+            self.summary["tax_deductions_ytd"] = self.cursor.take()
+            self.cursor.expect("")
 
-        if self.lines[0] == "Name" and self.lines[1] == "Employee Contribution":
-            self.lines.pop(0)
-            self.lines.pop(0)
-            self.assert_eq(self.lines.pop(0), "Total")
-            self.assert_eq(self.lines.pop(0), "")
+        if self.cursor.peek() == "Name" and self.cursor.peek(1) == "Employee Contribution":
+            self.cursor.take()
+            self.cursor.take()
+            self.cursor.expect("Total")
+            self.cursor.expect("")
 
         # -------------------------------------------------------------------------------
         # This section may be here, or it may have been above.
 
-        if self.lines[0] == "After Tax Deduction":
-            self.lines.pop(0)
-            self.summary["after_tax_deduction"] = self.lines.pop(0)
-            self.summary["after_tax_deduction_ytd"] = self.lines.pop(0)
-            self.assert_eq(self.lines.pop(0), "Pretax Deductions")
-            if self.lines[0] == "":
-                self.lines.pop(0)
-            self.assert_eq(self.lines.pop(0), "Tax Deductions")
-            self.assert_eq(self.lines.pop(0), "")
-
-        # self.assert_eq(self.lines.pop(0), "Name")
-        if self.lines[0] != "Name":
-            self.lines.pop(0)
-            self.lines.pop(0)
+        if self.cursor.peek() == "After Tax Deduction":
+            self.cursor.take()
+            self.summary["after_tax_deduction"] = self.cursor.take()
+            self.summary["after_tax_deduction_ytd"] = self.cursor.take()
+            self.cursor.expect("Pretax Deductions")
+            if self.cursor.peek() == "":
+                self.cursor.take()
+            self.cursor.expect("Tax Deductions")
+            self.cursor.expect("")
+
+        # self.cursor.expect("Name")
+        if self.cursor.peek() != "Name":
+            self.cursor.take()
+            self.cursor.take()
 
         self.tax_deductions = []
-        while self.lines[0]:
+        while self.cursor.peek():
             self.tax_deductions.append(
                 {
-                    "name": self.lines.pop(0).strip(),
+                    "name": self.cursor.take().strip(),
                     "current": None,
                     "ytd": None,
                 }
             )
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("")
 
         while True:
-            if self.lines[0] == "Current":
-                self.lines.pop(0)
+            if self.cursor.peek() == "Current":
+                self.cursor.take()
                 for i in range(len(self.tax_deductions)):
-                    if not self.lines[0]:
+                    if not self.cursor.peek():
                         break
-                    self.tax_deductions[i]["current"] = self.lines.pop(0)
-                self.assert_eq(self.lines.pop(0), "")
-
-            if self.lines[0] == "After Tax(AT) Deductions":
-                self.lines.pop(0)
-                self.assert_eq(self.lines.pop(0), "")
-
-            if self.lines[0] == "Additional Amount":
-                self.lines.pop(0)
-                self.w4["additional_amount1"] = self.lines.pop(0)
-                self.w4["additional_amount2"] = self.lines.pop(0)
-                self.assert_eq(self.lines.pop(0), "")
-
-            if self.lines[0] == "Net Pay":
-                self.lines.pop(0)
-                self.summary["net_pay"] = float(self.lines.pop(0))
-                self.summary["net_pay_ytd"] = self.lines.pop(0)
-                self.assert_eq(self.lines.pop(0), "")
-
-            if self.lines[0] == "YTD":
-                self.lines.pop(0)
+                    self.tax_deductions[i]["current"] = self.cursor.take()
+                self.cursor.expect("")
+
+            if self.cursor.peek() == "After Tax(AT) Deductions":
+                self.cursor.take()
+                self.cursor.expect("")
+
+            if self.cursor.peek() == "Additional Amount":
+                self.cursor.take()
+                self.w4["additional_amount1"] = self.cursor.take()
+                self.w4["additional_amount2"] = self.cursor.take()
+                self.cursor.expect("")
+
+            if self.cursor.peek() == "Net Pay":
+                self.cursor.take()
+                self.summary["net_pay"] = float(self.cursor.take())
+                self.summary["net_pay_ytd"] = self.cursor.take()
+                self.cursor.expect("")
+
+            if self.cursor.peek() == "YTD":
+                self.cursor.take()
                 for i in range(len(self.tax_deductions)):
-                    if not self.lines[0]:
+                    if not self.cursor.peek():
                         break
-                    self.tax_deductions[i]["ytd"] = self.lines.pop(0)
-                self.assert_eq(self.lines.pop(0), "")
+                    self.tax_deductions[i]["ytd"] = self.cursor.take()
+                self.cursor.expect("")
 
-            if self.lines[0].startswith("Total Hours Worked: "):
+            if self.cursor.peek().startswith("Total Hours Worked: "):
                 break
 
-            self.lines.pop(0)
+            self.cursor.take()
 
         # Total Hours Worked: 2.50
-        self.payslip["total_hours_worked"] = float(self.lines.pop(0).split()[3])  # 4th word
-        self.assert_eq(self.lines.pop(0), "")
+        self.payslip["total_hours_worked"] = float(self.cursor.take().split()[3])  # 4th word
+        self.cursor.expect("")
 
         # -------------------------------------------------------------------------------
 
         # Sick Hours Available: 0.00
-        if self.lines[0].startswith("Sick Hours Available: "):
+        if self.cursor.peek().startswith("Sick Hours Available: "):
             self.payslip["sick_hours_available"] = float(
-                self.lines.pop(0).split()[3]
+                self.cursor.take().split()[3]
             )  # 4th word
-            self.assert_eq(self.lines.pop(0), "")
+            self.cursor.expect("")
 
         # -------------------------------------------------------------------------------
 
-        self.assert_eq(self.lines.pop(0), "Net Pay Distribution")
-        self.assert_eq(self.lines.pop(0), "Payment Method")
+        self.cursor.expect("Net Pay Distribution")
+        self.cursor.expect("Payment Method")
 
         self.distributions = []
-        while self.lines[0]:
+        while self.cursor.peek():
             self.distributions.append(
                 {
-                    "payment_method": self.lines.pop(0),
+                    "payment_method": self.cursor.take(),
                     "bank_name": None,
                     "branch": None,
                     "account_type": None,
@@ -355,42 +462,59 @@ class KrogerPdfParser:
                     "payment_amount": None,
                 }
             )
-        self.assert_eq(self.lines.pop(0), "")
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Bank Name")
+        self.cursor.expect("Bank Name")
         for i in range(len(self.distributions)):
-            if not self.lines[0]:
+            if not self.cursor.peek():
                 break
-            self.distributions[i]["bank_name"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+            self.distributions[i]["bank_name"] = self.cursor.take()
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Branch")
+        self.cursor.expect("Branch")
         for i in range(len(self.distributions)):
-            if not self.lines[0]:
+            if not self.cursor.peek():
                 break
-            self.distributions[i]["branch"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+            self.distributions[i]["branch"] = self.cursor.take()
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Account Type")
+        self.cursor.expect("Account Type")
         for i in range(len(self.distributions)):
-            if not self.lines[0]:
+            if not self.cursor.peek():
                 break
-            self.distributions[i]["account_type"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+            self.distributions[i]["account_type"] = self.cursor.take()
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Payment Reference")
+        self.cursor.expect("Payment Reference")
         for i in range(len(self.distributions)):
-            if not self.lines[0]:
+            if not self.cursor.peek():
                 break
-            self.distributions[i]["payment_reference"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+            self.distributions[i]["payment_reference"] = self.cursor.take()
+        self.cursor.expect("")
 
-        self.assert_eq(self.lines.pop(0), "Payment Amount")
+        self.cursor.expect("Payment Amount")
         for i in range(len(self.distributions)):
-            if not self.lines[0]:
+            if not self.cursor.peek():
                 break
-            self.distributions[i]["payment_amount"] = self.lines.pop(0)
-        self.assert_eq(self.lines.pop(0), "")
+            self.distributions[i]["payment_amount"] = self.cursor.take()
+        self.cursor.expect("")
+
+    def _release(self) -> None:
+        """Release the text parsed; only the parsed data structures are needed hereafter."""
+        self.lines = self.cursor = None
+
+    def to_dict(self) -> dict:
+        """Return the parsed data structures."""
+        return {name: getattr(self, name) for name in self._state}
+
+    @classmethod
+    def from_dict(cls, state: dict, payslip_pdf: Path) -> "KrogerPdfParser":
+        """Return parser with `state`, from `to_dict`, without parsing `payslip_pdf`."""
+        pdf = cls.__new__(cls)
+        for name in cls._state:
+            setattr(pdf, name, state[name])
+        pdf.payslip_pdf = payslip_pdf
+        return pdf
 
     def assert_eq(self, text: str, expected: str) -> None:
         """Assert wrapper."""
@@ -403,11 +527,9 @@ class KrogerPdfParser:
             self._abort(f"text {text!r} doesn't start with {expected!r}")
 
     def _abort(self, msg: str) -> None:
-        self.dump()
-        raise AssertionError(
-            f"{msg} around line {self.num_lines - len(self.lines)} "
-            f"of {str(self.payslip_pdf)!r}"
-        )
+        if self.dump_on_abort:
+            self.dump()
+        raise AssertionError(f"{msg} around line {self.cursor.pos} of {str(self.payslip_pdf)!r}")
 
     def dump(self) -> None:
         """Print internal data structures."""
@@ -1,21 +1,20 @@
 """Kroger payslip-pdf tools; signon, parse, print, and archive payslips."""
 
-from datetime import datetime
+from itertools import groupby
 from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
 
 from libcli import BaseCmd
 
-from .pdfparser import KrogerPdfParser
+from .aggregate import FORMATTERS, GROUPINGS, Listing, aggregate, format_json, listing, month
+from .batch import parse_payslips
+from .cache import PayslipCache
+from .payslip import Payslip
 
 
 class KrogerPrintCmd(BaseCmd):
     """Parse and print select fields from a `payslip-pdf` file."""
 
-    last_month = None
-    month_hours = 0
-    month_gross = 0
-    month_net = 0
-
     def init_command(self) -> None:
         """Docstring."""
 
@@ -23,9 +22,27 @@ class KrogerPrintCmd(BaseCmd):
             "print",
             help=KrogerPrintCmd.__doc__,
             description=self.cli.dedent(
-                """
+                f"""
             The `%(prog)s` command parses and prints fields from one
             or more `PAYSLIP-PDF` files.
+
+            Payslips are printed in order of pay period, in any order given,
+            with subtotals for each month. With `--by`, print only totals,
+            grouped by the month, quarter or year the pay period begins, or
+            by deduction name.
+
+            Files are parsed, printed, and released one at a time, so
+            memory does not grow with the number of files; though, to
+            sort, the default listing keeps the few fields it prints.
+            With `--csv` or `--json`, payslips are printed in the order given.
+
+            Parsed payslips are cached, by content, under `archive-path`,
+            so printing previously parsed files doesn't parse them again.
+
+            Configuration file `~/.kroger.toml` defines:
+                archive-path = `{self.cli.config["archive-path"]}`
+                cache-size = `{self.cli.config["cache-size"]}`
+                pdf-engine = `{self.cli.config["pdf-engine"]}`
                 """,
             ),
         )
@@ -37,13 +54,51 @@ class KrogerPrintCmd(BaseCmd):
         )
         self.cli.add_default_to_help(arg)
 
-        arg = parser.add_argument(
+        group = parser.add_mutually_exclusive_group()
+
+        arg = group.add_argument(
             "--csv",
             action="store_true",
             help="Print in `CSV` file format",
         )
         self.cli.add_default_to_help(arg)
 
+        group.add_argument(
+            "--json",
+            action="store_true",
+            help="Print in `JSON` file format",
+        )
+
+        parser.add_argument(
+            "--by",
+            choices=GROUPINGS,
+            help="Print totals by `month`, `quarter` or `year`, or by `deduction` name",
+        )
+
+        arg = parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Parse files across `N` processes; `0` for one per cpu",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        group = parser.add_mutually_exclusive_group()
+
+        group.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Parse every file, without reading or writing the cache",
+        )
+
+        group.add_argument(
+            "--rebuild-cache",
+            action="store_true",
+            help="Parse every file, and replace its entry in the cache",
+        )
+
         arg = parser.add_argument(
             "PAYSLIP_PDF_FILES",
             nargs="+",
@@ -55,69 +110,97 @@ class KrogerPrintCmd(BaseCmd):
     def run(self) -> None:
         """Perform the command."""
 
-        if self.options.csv:
-            print("Paydate,Hours,Gross,Net")
-        else:
-            self._print_header()
-
-        for payslip_pdf in self.options.PAYSLIP_PDF_FILES:
-            self._print(payslip_pdf)
-
-        if not self.options.csv:
-            self._print_month_subtotal()
-
-    def _print(self, payslip_pdf: Path) -> None:
-
-        pdf = KrogerPdfParser(payslip_pdf)
+        output = "csv" if self.options.csv else "json" if self.options.json else "txt"
+
+        cache = None
+        if not self.options.no_cache:
+            cache = PayslipCache.from_config(self.cli.config, rebuild=self.options.rebuild_cache)
+
+        try:
+            payslips = self._payslips(cache)
+            if self.options.by:
+                self._print_lines(FORMATTERS[output](aggregate(payslips, self.options.by)))
+            elif output == "csv":
+                print("Paydate,Hours,Gross,Net")
+                for payslip in payslips:
+                    self._print_csv(payslip)
+            elif output == "json":
+                self._print_lines(format_json(listing(payslips)))
+            else:
+                self._print_txt(payslips)
+        finally:
+            if cache:
+                cache.close()
+
+    def _payslips(self, cache: Optional[PayslipCache]) -> Iterator[Payslip]:
+        """Yield the `Payslip` of each of `PAYSLIP_PDF_FILES`."""
+
+        for pdf in parse_payslips(
+            self.options.PAYSLIP_PDF_FILES,
+            self.options.jobs,
+            cache=cache,
+            engine=self.cli.config["pdf-engine"],
+        ):
+            if self.options.dump:
+                pdf.dump()
+            yield Payslip.from_pdf(pdf)
 
-        if self.options.dump:
-            pdf.dump()
-
-        if self.options.csv:
-            self._print_csv(pdf)
-        else:
-            self._print_txt(pdf)
+    @staticmethod
+    def _print_lines(lines: Iterable[str]) -> None:
+        for line in lines:
+            print(line)
 
-    def _print_csv(self, pdf: KrogerPdfParser) -> None:
+    @staticmethod
+    def _print_csv(payslip: Payslip) -> None:
 
         print(
             ",".join(
                 [
-                    datetime.strftime(pdf.payslip["period_begin"], "%Y-%m-%d"),
-                    datetime.strftime(pdf.payslip["period_end"], "%Y-%m-%d"),
-                    datetime.strftime(pdf.payslip["payment_date"], "%Y-%m-%d"),
-                    str(pdf.payslip["total_hours_worked"]),
-                    str(pdf.summary["gross"]),
-                    str(pdf.summary["net_pay"]),
+                    payslip.period_begin.strftime("%Y-%m-%d"),
+                    payslip.period_end.strftime("%Y-%m-%d"),
+                    payslip.payment_date.strftime("%Y-%m-%d"),
+                    str(payslip.total_hours_worked),
+                    str(payslip.gross),
+                    str(payslip.net_pay),
                 ]
             )
         )
 
-    def _print_txt(self, pdf: KrogerPdfParser) -> None:
+    def _print_txt(self, payslips: Iterable[Payslip]) -> None:
+        """Print `payslips`, in order of pay period, with monthly subtotals.
+
+        Sorting holds every payslip; only its listed fields are held.
+        """
 
-        month = pdf.payslip["period_begin"].month
-        if self.last_month is not None and self.last_month != month:
-            self._print_month_subtotal()
-            print()
+        listings = sorted(map(Listing.from_payslip, payslips), key=lambda x: x.period_begin)
+        months = groupby(listings, key=month)
+        first = True
+        for _, group in months:
+            group = list(group)
+            if not first:
+                print()
+            first = False
             self._print_header()
-            self.month_hours = 0
-            self.month_gross = 0
-            self.month_net = 0
+            for payslip in group:
+                self._print_payslip(payslip)
+            self._print_subtotal(aggregate(group, "month").rows[0][2:])
 
-        self.last_month = month
-        self.month_hours += pdf.payslip["total_hours_worked"]
-        self.month_gross += pdf.summary["gross"]
-        self.month_net += pdf.summary["net_pay"]
+        if first:
+            self._print_header()
+            self._print_subtotal((0, 0, 0))
+
+    @staticmethod
+    def _print_payslip(payslip: Listing) -> None:
 
         print(
             " ".join(
                 [
-                    datetime.strftime(pdf.payslip["period_begin"], "%Y-%m-%d"),
-                    datetime.strftime(pdf.payslip["period_end"], "%Y-%m-%d"),
-                    datetime.strftime(pdf.payslip["payment_date"], "%Y-%m-%d"),
-                    f"{pdf.payslip['total_hours_worked']:6.2f}",
-                    f"{pdf.summary['gross']:9.2f}",
-                    f"{pdf.summary['net_pay']:9.2f}",
+                    payslip.period_begin.strftime("%Y-%m-%d"),
+                    payslip.period_end.strftime("%Y-%m-%d"),
+                    payslip.payment_date.strftime("%Y-%m-%d"),
+                    f"{payslip.total_hours_worked:6.2f}",
+                    f"{payslip.gross:9.2f}",
+                    f"{payslip.net_pay:9.2f}",
                 ]
             )
         )
@@ -127,6 +210,8 @@ class KrogerPrintCmd(BaseCmd):
         print("Begin      End        Paydate     Hours     Gross       Net")
         #     "yyyy-mm-dd yyyy-mm-dd yyyy-mm-dd 123.56 123456.89 123456.89"
 
-    def _print_month_subtotal(self) -> None:
+    @staticmethod
+    def _print_subtotal(totals: Tuple) -> None:
+        hours, gross, net = totals
         print(" " * 32, "------ --------- ---------")
-        print(" " * 32, f"{self.month_hours:6.2f} {self.month_gross:9.2f} {self.month_net:9.2f}")
+        print(" " * 32, f"{hours:6.2f} {gross:9.2f} {net:9.2f}")
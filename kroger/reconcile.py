@@ -0,0 +1,218 @@
+"""Kroger payslip-pdf tools; reconcile scheduled hours with paid hours."""
+
+import bisect
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from libcli import BaseCmd
+
+from .batch import parse_payslips
+from .cache import PayslipCache
+from .payslip import Payslip
+from .schedulestore import ScheduleStore
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    """Find the value of the interval containing a date, by binary search.
+
+    Intervals are `(begin, end)` dates, inclusive. An interval that
+    overlaps an earlier one isn't indexed; its value, and the value of
+    the one it overlaps, are listed in `overlaps`.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[date, date, T]]) -> None:
+        """Index `(begin, end, value)` `intervals`, in any order."""
+
+        self._intervals: List[Tuple[date, date, T]] = []
+        self.overlaps: List[Tuple[T, T]] = []
+        for this in sorted(intervals, key=lambda x: x[0]):
+            if self._intervals and this[0] <= self._intervals[-1][1]:
+                self.overlaps.append((this[2], self._intervals[-1][2]))
+            else:
+                self._intervals.append(this)
+        self._begins = [x[0] for x in self._intervals]
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def find(self, day: date) -> Optional[T]:
+        """Return the value of the interval containing `day`, or None."""
+
+        i = bisect.bisect_right(self._begins, day) - 1
+        if i < 0 or day > self._intervals[i][1]:
+            return None
+        return self._intervals[i][2]
+
+
+class Period:
+    """A pay period; the hours paid by its payslips, and scheduled by MyTime."""
+
+    __slots__ = ("begin", "end", "paid", "scheduled", "shifts", "overlaps")
+
+    def __init__(self, begin: date, end: date) -> None:
+        """Pay period `begin` to `end`, inclusive."""
+
+        self.begin = begin
+        self.end = end
+        self.paid = Decimal(0)
+        self.scheduled = Decimal(0)
+        self.shifts = 0
+        self.overlaps: Optional[Period] = None  # the earlier period this overlaps, if any.
+
+
+class KrogerReconcileCmd(BaseCmd):
+    """Compare hours scheduled by MyTime with hours paid by `payslip-pdf` files."""
+
+    def init_command(self) -> None:
+        """Docstring."""
+
+        parser = self.add_subcommand_parser(
+            "reconcile",
+            help=KrogerReconcileCmd.__doc__,
+            description=self.cli.dedent(
+                f"""
+            The `%(prog)s` command totals the hours of the shifts in
+            `schedule-store` by the pay period (`period_begin` through
+            `period_end`) of `PAYSLIP-PDF` files, default all files in
+            `archive-path`, and prints, for each period with any shifts,
+            the hours paid and scheduled; mismatches are flagged `*`.
+
+            Scheduled hours are the bracketed hours shown by MyTime, less
+            any unpaid breaks. The schedule history is recorded by
+            `mytime --changes`. A period that overlaps an earlier one, as
+            `verify` reports, is skipped.
+
+            Configuration file `~/.kroger.toml` defines:
+                archive-path = `{self.cli.config["archive-path"]}`
+                pdf-engine = `{self.cli.config["pdf-engine"]}`
+                schedule-store = `{self.cli.config["schedule-store"]}`
+                """
+            ),
+        )
+
+        arg = parser.add_argument(
+            "--tolerance",
+            type=Decimal,
+            default=Decimal("0.25"),
+            metavar="HOURS",
+            help="Flag periods whose hours differ by more than `HOURS`",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        parser.add_argument(
+            "--mismatches",
+            action="store_true",
+            help="Print only flagged periods",
+        )
+
+        arg = parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Parse files across `N` processes; `0` for one per cpu",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        parser.add_argument(
+            "PAYSLIP_PDF_FILES",
+            nargs="*",
+            metavar="PAYSLIP-PDF",
+            type=Path,
+            help="List of zero or more Kroger payslip `.pdf` files",
+        )
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        payslip_pdfs = self.options.PAYSLIP_PDF_FILES
+        if not payslip_pdfs:
+            if not self.cli.config["archive-path"]:
+                self.cli.parser.exit(2, "error: Missing `archive-path` in `~/.kroger.toml`\n")
+            archive_path = Path(self.cli.config["archive-path"]).expanduser()
+            payslip_pdfs = sorted(archive_path.glob("Kroger-*.pdf"))
+
+        store = ScheduleStore(Path(self.cli.config["schedule-store"]).expanduser())
+        periods = reconcile(self._payslips(payslip_pdfs), store)
+
+        tolerance = self.options.tolerance
+        flagged = 0
+        print("Begin      End        Shifts  Paid Scheduled   Diff")
+        for period in periods:
+            if period.overlaps:
+                print(
+                    f"# period {period.begin}..{period.end} overlaps"
+                    f" {period.overlaps.begin}..{period.overlaps.end}; skipped"
+                )
+                continue
+            if not period.shifts:
+                continue
+            diff = period.paid - period.scheduled
+            mismatch = abs(diff) > tolerance
+            flagged += mismatch
+            if mismatch or not self.options.mismatches:
+                print(
+                    " ".join(
+                        [
+                            f"{period.begin:%Y-%m-%d}",
+                            f"{period.end:%Y-%m-%d}",
+                            f"{period.shifts:6}",
+                            f"{period.paid:5.2f}",
+                            f"{period.scheduled:9.2f}",
+                            f"{diff:6.2f}",
+                            "*" if mismatch else "",
+                        ]
+                    ).rstrip()
+                )
+        print(f"# {flagged} of {sum(1 for x in periods if x.shifts)} periods mismatched")
+
+    def _payslips(self, payslip_pdfs: List[Path]) -> Iterable[Payslip]:
+        """Yield `Payslip`s parsed from `payslip_pdfs`."""
+
+        cache = PayslipCache.from_config(self.cli.config)
+        try:
+            for pdf in parse_payslips(
+                payslip_pdfs,
+                self.options.jobs,
+                cache=cache,
+                engine=self.cli.config["pdf-engine"],
+            ):
+                yield Payslip.from_pdf(pdf)
+        finally:
+            if cache:
+                cache.close()
+
+
+def reconcile(payslips: Iterable[Payslip], store: ScheduleStore) -> List[Period]:
+    """Return the pay periods of `payslips`, with the hours paid, and scheduled in `store`.
+
+    Payslips for the same period (e.g., corrections) are combined. Each
+    stored day is looked up in an `IntervalIndex` of the periods, so the
+    join is one pass over payslips and one over days. A period that
+    overlaps an earlier one is left unscheduled, with `overlaps` set.
+    """
+
+    periods: Dict[Tuple[date, date], Period] = {}
+    for payslip in payslips:
+        key = (payslip.period_begin, payslip.period_end)
+        period = periods.get(key)
+        if period is None:
+            period = periods[key] = Period(*key)
+        period.paid += payslip.total_hours_worked or 0
+
+    index = IntervalIndex((x.begin, x.end, x) for x in periods.values())
+    for period, other in index.overlaps:
+        period.overlaps = other
+    for day, shifts in store.days.items():
+        if period := index.find(day):
+            for shift in shifts:
+                hours = shift.minutes / 60 if shift.hours is None else shift.hours
+                period.scheduled += Decimal(str(round(hours, 4)))
+                period.shifts += 1
+
+    return sorted(periods.values(), key=lambda x: x.begin)
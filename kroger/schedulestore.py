@@ -0,0 +1,136 @@
+"""Store of the MyTime shifts last seen, to detect changes to the schedule."""
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from .ics import Event
+
+Day = FrozenSet[Event]
+
+
+@dataclass(slots=True, frozen=True)
+class ScheduleChanges:
+    """Changes to the schedule, by date; false if there are none."""
+
+    added: Dict[date, Day] = field(default_factory=dict)  # newly scheduled days.
+    removed: Dict[date, Day] = field(default_factory=dict)  # days no longer scheduled.
+    changed: Dict[date, Tuple[Day, Day]] = field(default_factory=dict)  # (old, new) shifts.
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def creates(self) -> List[Event]:
+        """Return the events to create; of changed days, those at new times."""
+
+        events = [x for day in self.added.values() for x in day]
+        events += [x for old, new in self.changed.values() for x in _moved(new, old)]
+        return sorted(events)
+
+    @property
+    def deletes(self) -> List[Event]:
+        """Return the events to delete; of changed days, those at old times."""
+
+        events = [x for day in self.removed.values() for x in day]
+        events += [x for old, new in self.changed.values() for x in _moved(old, new)]
+        return sorted(events)
+
+    @property
+    def updates(self) -> List[Event]:
+        """Return the events at unchanged times, by `uid`, with changed hours."""
+
+        events = []
+        for old, new in self.changed.values():
+            uids = {x.uid for x in old}
+            events += [x for x in new - old if x.uid in uids]
+        return sorted(events)
+
+
+class ScheduleStore:
+    """The shifts of the schedule last seen, and of past days, keyed by date.
+
+    Saved as JSON mapping each date to its `[start, minutes, hours]` shifts.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Load store `path`, if it exists."""
+
+        self.path = path
+        self.days: Dict[date, Day] = {}
+
+        if path.exists():
+            for day, shifts in json.loads(path.read_text(encoding="utf-8")).items():
+                self.days[date.fromisoformat(day)] = frozenset(
+                    Event(datetime.fromisoformat(x[0]), *x[1:]) for x in shifts
+                )
+
+    def diff(self, events: Iterable[Event], covered: Tuple[date, date]) -> ScheduleChanges:
+        """Return the changes from the stored schedule to `events`.
+
+        `covered` is the first and last day of the schedule `events` are
+        from; stored days in it without `events` are removed. Stored days
+        outside it are past, or beyond the schedule, not removed.
+        """
+
+        days = _by_date(events)
+        first, last = covered
+
+        added, changed = {}, {}
+        for day, shifts in days.items():
+            old = self.days.get(day)
+            if old is None:
+                added[day] = shifts
+            elif old != shifts:
+                changed[day] = (old, shifts)
+        removed = {
+            day: old
+            for day, old in self.days.items()
+            if first <= day <= last and day not in days
+        }
+        return ScheduleChanges(added, removed, changed)
+
+    def update(self, events: Iterable[Event], covered: Tuple[date, date]) -> None:
+        """Replace the stored days `covered`, first to last, with `events`; see `diff`."""
+
+        first, last = covered
+        days = {day: x for day, x in self.days.items() if not first <= day <= last}
+        self.days = days | _by_date(events)
+
+    def save(self) -> None:
+        """Write the store, atomically."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    day.isoformat(): [
+                        [x.start.isoformat(), x.minutes, x.hours] for x in sorted(shifts)
+                    ]
+                    for day, shifts in sorted(self.days.items())
+                },
+                indent=1,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+
+
+def _by_date(events: Iterable[Event]) -> Dict[date, Day]:
+    """Return `events` grouped by date."""
+
+    days: Dict[date, set] = {}
+    for event in events:
+        days.setdefault(event.start.date(), set()).add(event)
+    return {day: frozenset(shifts) for day, shifts in days.items()}
+
+
+def _moved(day: Day, other: Day) -> List[Event]:
+    """Return the events of `day` with no event at the same time, by `uid`, in `other`."""
+
+    uids = {x.uid for x in other}
+    return [x for x in day if x.uid not in uids]
@@ -0,0 +1,206 @@
+"""Sign on to Kroger's SSO; shared by the `myinfo` and `mytime` commands."""
+
+import socket
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .metrics import metrics
+
+USER = (By.NAME, "submittedIdentifier")
+PASSWORD = (By.NAME, "password")
+SUBMIT = (By.XPATH, "//button[@id='btnSignIn']/div")
+
+# Elements shown only after signon.
+MYINFO_HOME = (By.ID, "itemNode_my_information_pay_0")
+MYTIME_HOME = (By.XPATH, "//ng-myschedule-list")
+
+
+class SsoTimeoutError(Exception):
+    """A step of the signon flow did not become ready in time."""
+
+    def __init__(self, step: str, timeout: float) -> None:
+        """Timed out after `timeout` seconds waiting for `step`."""
+
+        super().__init__(step, timeout)
+        self.step = step
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        return f"Timed out after {self.timeout} seconds waiting for {self.step}"
+
+
+class SsoSession:
+    """Drive a browser through the SSO signon flow, waiting for readiness, not sleeping.
+
+    Each step waits up to `timeout` seconds for its element, and records
+    how long it took in `timings`.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: float = 30, verbose: bool = False) -> None:
+        """Drive `driver`; see class docstring."""
+
+        self.driver = driver
+        self.timeout = timeout
+        self.verbose = verbose
+        self.timings: List[Tuple[str, float]] = []
+
+    def wait(self, step: str, condition) -> WebElement:
+        """Wait for, and return the result of, expected `condition`, named `step`."""
+
+        start = time.perf_counter()
+        try:
+            with metrics.phase("sso wait"):
+                result = WebDriverWait(self.driver, self.timeout).until(condition)
+        except TimeoutException:
+            raise SsoTimeoutError(step, self.timeout) from None
+        elapsed = time.perf_counter() - start
+        self.timings.append((step, elapsed))
+        if self.verbose:
+            print(f"# sso: {step} ready in {elapsed:.2f} seconds")
+        return result
+
+    def click(self, step: str, locator: Tuple[str, str]) -> None:
+        """Wait for the element at `locator` to be clickable, and click it."""
+        self.wait(step, EC.element_to_be_clickable(locator)).click()
+
+    def visible(self, step: str, locator: Tuple[str, str]) -> WebElement:
+        """Wait for, and return, the element at `locator` once it is visible."""
+        return self.wait(step, EC.visibility_of_element_located(locator))
+
+    def login(
+        self,
+        url: str,
+        user: str,
+        password: str,
+        signed_on: Optional[Tuple[str, str]] = None,
+    ) -> bool:
+        """Open `url`, and signon as `user` with `password`; return False if already signed on.
+
+        With `signed_on`, the locator of an element shown only after
+        signon, skip signing on when the browser's session is still valid.
+        """
+
+        with metrics.phase("page load"):
+            self.driver.get(url)
+
+        if signed_on:
+            page = self.wait(
+                "session",
+                EC.any_of(
+                    _named("signon", EC.element_to_be_clickable(USER)),
+                    _named("signed-on", EC.visibility_of_element_located(signed_on)),
+                ),
+            )
+            if page == "signed-on":
+                if self.verbose:
+                    print("# sso: reusing session")
+                return False
+
+        self.wait("user field", EC.element_to_be_clickable(USER)).send_keys(user)
+        self.click("user submit", SUBMIT)
+
+        self.wait("password field", EC.element_to_be_clickable(PASSWORD)).send_keys(password)
+        self.click("password submit", SUBMIT)
+
+        # The submit button is on both pages; wait until it's gone.
+        self.wait("signon", EC.invisibility_of_element_located(PASSWORD))
+        return True
+
+
+def _named(name: str, condition):
+    """Return expected `condition`, returning `name` instead of its result."""
+
+    def _condition(driver):
+        return name if condition(driver) else False
+
+    return _condition
+
+
+class Browser:
+    """Context manager for a `webdriver.Chrome`, reusing a browser where possible.
+
+    Attach to the browser served by `kroger browser` when one is listening
+    on `browser-address`; else start a new one, optionally `headless`. Both
+    keep cookies in the `browser-profile` directory, so an SSO session
+    outlives the browser that signed on.
+    """
+
+    def __init__(self, config: dict, headless: bool = False, verbose: bool = False) -> None:
+        """Prepare to open a browser per `config`; see class docstring."""
+
+        self.config = config
+        self.headless = headless
+        self.verbose = verbose
+        self.driver: Optional[WebDriver] = None
+        self.attached = False
+
+    def __enter__(self) -> WebDriver:
+        address = self.config["browser-address"]
+        if address and listening(address):
+            if self.verbose:
+                print(f"# attaching to browser at {address!r}")
+            with metrics.phase("browser start"):
+                self.driver = new_driver(self.config, address=address)
+                self.attached = True
+                # Work in a tab of our own, leaving the broker's alone.
+                self.driver.switch_to.new_window("tab")
+        else:
+            with metrics.phase("browser start"):
+                self.driver = new_driver(self.config, headless=self.headless)
+        return self.driver
+
+    def __exit__(self, *args) -> None:
+        if self.driver is None:
+            return
+        if self.attached:
+            # Close our tab, and stop our `chromedriver`, but not the browser.
+            self.driver.close()
+            self.driver.service.stop()
+        else:
+            self.driver.quit()
+        self.driver = None
+
+
+def new_driver(
+    config: dict,
+    headless: bool = False,
+    address: Optional[str] = None,
+    port: Optional[int] = None,
+) -> WebDriver:
+    """Return a new `webdriver.Chrome` using `config["browser-profile"]`.
+
+    Attach to the browser listening on `address`, if given; else start
+    one, serving the devtools protocol on `port`, if given.
+    """
+
+    options = webdriver.ChromeOptions()
+    if address:
+        options.debugger_address = address
+    else:
+        if profile := config["browser-profile"]:
+            options.add_argument(f"--user-data-dir={Path(profile).expanduser()}")
+        if headless:
+            options.add_argument("--headless=new")
+        if port:
+            options.add_argument(f"--remote-debugging-port={port}")
+    return webdriver.Chrome(options=options)
+
+
+def listening(address: str) -> bool:
+    """Return True if something accepts connections on `host:port` `address`."""
+
+    host, _, port = address.rpartition(":")
+    try:
+        with socket.create_connection((host or "127.0.0.1", int(port)), timeout=0.5):
+            return True
+    except (OSError, ValueError):
+        return False
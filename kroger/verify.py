@@ -0,0 +1,221 @@
+"""Kroger payslip-pdf tools; verify the year-to-date totals of an archive."""
+
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from libcli import BaseCmd
+
+from .batch import parse_payslips
+from .cache import PayslipCache
+from .payslip import Payslip
+
+# (current, year-to-date) `Payslip` fields, of the summary totals.
+TOTALS = [
+    ("gross", "gross_ytd"),
+    ("non_payroll", "non_payroll_ytd"),
+    ("pretax_deductions", "pretax_deductions_ytd"),
+    ("tax_deductions", "tax_deductions_ytd"),
+    ("after_tax_deduction", "after_tax_deduction_ytd"),
+    ("net_pay", "net_pay_ytd"),
+]
+
+# `Payslip` fields every payslip should have.
+REQUIRED = ["gross_ytd", "tax_deductions", "tax_deductions_ytd", "net_pay_ytd"]
+
+ZERO = Decimal(0)
+
+
+class KrogerVerifyCmd(BaseCmd):
+    """Verify the year-to-date totals of `payslip-pdf` files."""
+
+    def init_command(self) -> None:
+        """Docstring."""
+
+        parser = self.add_subcommand_parser(
+            "verify",
+            help=KrogerVerifyCmd.__doc__,
+            description=self.cli.dedent(
+                f"""
+            The `%(prog)s` command sorts `PAYSLIP-PDF` files, default all
+            files in `archive-path`, by `payment_date`, and checks that
+            each payslip's year-to-date amounts equal those of the payslip
+            before it plus its current amounts; that its net pay adds up;
+            and that no pay periods are missing.
+
+            Each problem is printed on a line of its own, followed by a
+            count of the problems found. Files that fail to parse are
+            reported, and skipped.
+
+            Configuration file `~/.kroger.toml` defines:
+                archive-path = `{self.cli.config["archive-path"]}`
+                pdf-engine = `{self.cli.config["pdf-engine"]}`
+                """
+            ),
+        )
+
+        arg = parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Parse files across `N` processes; `0` for one per cpu",
+        )
+        self.cli.add_default_to_help(arg, parser)
+
+        parser.add_argument(
+            "PAYSLIP_PDF_FILES",
+            nargs="*",
+            metavar="PAYSLIP-PDF",
+            type=Path,
+            help="List of zero or more Kroger payslip `.pdf` files",
+        )
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        payslip_pdfs = self.options.PAYSLIP_PDF_FILES
+        if not payslip_pdfs:
+            if not self.cli.config["archive-path"]:
+                self.cli.parser.exit(2, "error: Missing `archive-path` in `~/.kroger.toml`\n")
+            archive_path = Path(self.cli.config["archive-path"]).expanduser()
+            payslip_pdfs = sorted(archive_path.glob("Kroger-*.pdf"))
+
+        problems: List[str] = []
+
+        def _report(problem: str) -> None:
+            problems.append(problem)
+            print(problem)
+
+        def _error(payslip_pdf: Path, e: Exception) -> None:
+            _report(f"{payslip_pdf}: error: {e}")
+
+        payslips = list(self._payslips(payslip_pdfs, _error))
+        total = len(payslips) + len(problems)
+        for payslip, problem in verify(payslips):
+            name = payslip.payslip_pdf.name if payslip.payslip_pdf else ""
+            _report(f"{payslip.payment_date} {name}: {problem}")
+
+        print(f"# {len(problems)} problems in {total} payslips")
+
+    def _payslips(self, payslip_pdfs: List[Path], on_error) -> Iterator[Payslip]:
+        """Yield `Payslip`s parsed from `payslip_pdfs`; pass failures to `on_error`."""
+
+        cache = PayslipCache.from_config(self.cli.config)
+        try:
+            for pdf in parse_payslips(
+                payslip_pdfs,
+                self.options.jobs,
+                cache=cache,
+                on_error=on_error,
+                engine=self.cli.config["pdf-engine"],
+            ):
+                yield Payslip.from_pdf(pdf)
+        finally:
+            if cache:
+                cache.close()
+
+
+def verify(payslips: Iterable[Payslip]) -> Iterator[Tuple[Payslip, str]]:
+    """Yield `(payslip, problem)` for each problem found in `payslips`, in any order.
+
+    The payslips are sorted by `payment_date` and checked in one pass,
+    each against the one before it. Year-to-date amounts restart with
+    the first payment of each year. After a missing or repeated pay
+    period, year-to-date amounts are not compared.
+    """
+
+    prev: Optional[Payslip] = None
+    for payslip in sorted(payslips, key=lambda x: x.payment_date):
+        yield from ((payslip, x) for x in _anomalies(payslip))
+
+        continuous = True
+        if prev is not None:
+            expected = prev.period_end + timedelta(days=1)
+            if payslip.period_begin < expected:
+                continuous = False
+                yield payslip, (
+                    f"period {payslip.period_begin}..{payslip.period_end}"
+                    f" overlaps {prev.period_begin}..{prev.period_end}"
+                )
+            elif payslip.period_begin > expected:
+                continuous = False
+                days = (prev.period_end - prev.period_begin).days + 1
+                missing = (payslip.period_begin - expected).days // days or 1
+                yield payslip, (
+                    f"missing {missing} pay periods"
+                    f" {expected}..{payslip.period_begin - timedelta(days=1)}"
+                )
+
+        if prev is not None and continuous:
+            newyear = payslip.payment_date.year != prev.payment_date.year
+            yield from ((payslip, x) for x in _ytd_problems(payslip, None if newyear else prev))
+
+        prev = payslip
+
+
+def _anomalies(payslip: Payslip) -> Iterator[str]:
+    """Yield the problems `payslip` has on its own."""
+
+    for field in REQUIRED:
+        if getattr(payslip, field) is None:
+            yield f"missing {field}"
+
+    net = (
+        payslip.gross
+        + (payslip.non_payroll or ZERO)
+        - (payslip.pretax_deductions or ZERO)
+        - (payslip.tax_deductions or ZERO)
+        - (payslip.after_tax_deduction or ZERO)
+    )
+    if net != payslip.net_pay:
+        yield f"net_pay {payslip.net_pay} != {net} gross less deductions"
+
+    currents = [x.current for x in payslip.deductions]
+    if (
+        payslip.tax_deductions is not None
+        and None not in currents
+        and (total := sum(currents, ZERO)) != payslip.tax_deductions
+    ):
+        yield f"tax_deductions {payslip.tax_deductions} != {total} sum of deductions"
+
+
+def _ytd_problems(payslip: Payslip, prev: Optional[Payslip]) -> Iterator[str]:
+    """Yield the year-to-date amounts of `payslip` that aren't those of `prev` plus current.
+
+    With no `prev`, the first payment of a year, year-to-date should equal current.
+    """
+
+    for current, ytd in TOTALS:
+        yield from _check(
+            ytd,
+            getattr(payslip, current),
+            getattr(payslip, ytd),
+            getattr(prev, ytd) if prev else ZERO,
+        )
+
+    for kind, lines, prev_lines in [
+        ("earning", payslip.earnings, prev.earnings if prev else ()),
+        ("deduction", payslip.deductions, prev.deductions if prev else ()),
+    ]:
+        prev_ytds: Dict[str, Optional[Decimal]] = {x.name: x.ytd for x in prev_lines}
+        for line in lines:
+            yield from _check(
+                f"{kind} {line.name!r} ytd",
+                line.current,
+                line.ytd,
+                prev_ytds.get(line.name, ZERO),
+            )
+
+
+def _check(
+    name: str, current: Optional[Decimal], ytd: Optional[Decimal], prev_ytd: Optional[Decimal]
+) -> Iterator[str]:
+    """Yield a problem if `ytd` isn't `prev_ytd` plus `current`; unless any is unknown."""
+
+    if current is None or ytd is None or prev_ytd is None:
+        return
+    if ytd != (expected := prev_ytd + current):
+        yield f"{name} {ytd} != {expected} previous plus current"
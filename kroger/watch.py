@@ -0,0 +1,159 @@
+"""Watch a directory for new, completely written files."""
+
+import contextlib
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# sys/inotify.h
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; followed by name[len].
+
+
+class DirectoryWatcher:
+    """Yield batches of new files matching `pattern` in `directory`.
+
+    A file is yielded once its size and modification-time have not
+    changed for `settle` seconds, so partially written downloads are
+    not. All files that settle at about the same time are yielded as one
+    batch. Files already in `directory` when watching starts are yielded
+    in the first batch. A file removed, and dropped again, is yielded again.
+
+    Changes are detected with Linux `inotify` where available, else by
+    scanning `directory` every `interval` seconds.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        pattern: str,
+        settle: float = 2.0,
+        interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        """Prepare to watch `directory`; see class docstring."""
+
+        self.directory = directory
+        self.pattern = pattern
+        self.settle = settle
+        self.interval = interval
+        self.inotify_fd: Optional[int] = _inotify(directory) if use_inotify else None
+
+        # path -> ((size, mtime), time first seen with that size and mtime).
+        self._pending: Dict[Path, Tuple[Tuple[int, int], float]] = {}
+        # path -> (size, mtime) when yielded; forgotten when the file is removed.
+        self._done: Dict[Path, Tuple[int, int]] = {}
+
+    def __enter__(self) -> "DirectoryWatcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop watching."""
+
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+    def __iter__(self) -> Iterator[List[Path]]:
+        """Yield batches of settled files, forever."""
+
+        self._update(self.directory.glob(self.pattern))
+        while True:
+            if ready := self._ready(time.monotonic()):
+                yield ready
+            self._update(self._wait())
+
+    def _wait(self) -> List[Path]:
+        """Wait for, and return, paths that may have changed."""
+
+        # Wake at least every `interval` to re-check pending files.
+        if self.inotify_fd is None:
+            time.sleep(self.interval)
+            paths = list(self.directory.glob(self.pattern))
+            for path in self._done.keys() - set(paths):
+                del self._done[path]
+            return paths
+
+        timeout = self.interval if self._pending else None
+        readable, _, _ = select.select([self.inotify_fd], [], [], timeout)
+        if not readable:
+            return []
+
+        paths = []
+        with contextlib.suppress(BlockingIOError):
+            while buf := os.read(self.inotify_fd, 65536):
+                offset = 0
+                while offset < len(buf):
+                    _, _, _, length = _EVENT.unpack_from(buf, offset)
+                    offset += _EVENT.size
+                    name = buf[offset : offset + length].rstrip(b"\0")
+                    offset += length
+                    if fnmatch.fnmatch(os.fsdecode(name), self.pattern):
+                        paths.append(self.directory / os.fsdecode(name))
+        return paths
+
+    def _update(self, paths) -> None:
+        """Note the size and modification-time of `paths`, and of pending files."""
+
+        now = time.monotonic()
+        for path in {*paths, *self._pending}:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                self._pending.pop(path, None)
+                self._done.pop(path, None)
+                continue
+            signature = (st.st_size, st.st_mtime_ns)
+            if self._done.get(path) == signature:
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                self._pending[path] = (signature, now)
+
+    def _ready(self, now: float) -> List[Path]:
+        """Remove and return pending files that have settled by `now`."""
+
+        ready = sorted(
+            path for path, (_, since) in self._pending.items() if now - since >= self.settle
+        )
+        for path in ready:
+            signature, _ = self._pending.pop(path)
+            self._done[path] = signature
+        return ready
+
+
+def _inotify(directory: Path) -> Optional[int]:
+    """Return an `inotify` file descriptor watching `directory`, or None if unsupported."""
+
+    if not sys.platform.startswith("linux"):
+        return None
+
+    # pylint: disable=import-outside-toplevel
+    import ctypes
+    import ctypes.util
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_DELETE | _IN_MOVED_FROM
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
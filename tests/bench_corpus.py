@@ -0,0 +1,179 @@
+"""Benchmark: throughput, per-phase time and peak memory over a synthetic corpus of payslips.
+
+Generates a corpus of `payslip-pdf` files, cycling through every layout
+variant `KrogerPdfParser` branches on, each with a page of fine print.
+Reports the time per file spent extracting text with `pdfminer`, and
+parsing it; then runs `kroger print`, `print --csv` and `archive` over
+the corpus, each in its own process, and reports files per second and
+peak resident set size.
+
+Results are compared against `bench_baseline.json`; any metric worse
+than its baseline by more than the tolerance is a regression, and the
+benchmark exits non-zero. Timings on a shared machine vary by a third
+from run to run, hence the generous default tolerance; losing, say,
+the first-page-only extraction costs several times over. The baseline
+is machine dependent; after a deliberate change, or on a new machine,
+rewrite it with `--update`.
+
+Run with `make bench`.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from synthetic import PAYMENT_DATE, VARIANTS, payslip_pdf
+
+from kroger.extract import shared_extractor
+from kroger.pdfparser import KrogerPdfParser
+
+BASELINE = Path(__file__).with_name("bench_baseline.json")
+COMMANDS = {
+    "print": ["print", "--no-cache"],
+    "print --csv": ["print", "--no-cache", "--csv"],
+    "archive": ["archive"],
+}
+
+
+def corpus(directory: Path, number: int) -> List[Path]:
+    """Write `number` weekly payslips, cycling through every layout variant, to `directory`."""
+
+    paths = []
+    for n in range(number):
+        path = directory / f"USOnlinePayslip ({n}).pdf"
+        path.write_bytes(
+            payslip_pdf(
+                extra_pages=1,
+                payment_date=PAYMENT_DATE + timedelta(weeks=n),
+                **VARIANTS[n % len(VARIANTS)],
+            )
+        )
+        paths.append(path)
+    return paths
+
+
+def phases(paths: List[Path], repeat: int = 3) -> Dict[str, float]:
+    """Return the best time per file, in usec, to extract, and to parse, each of `paths`."""
+
+    extractor = shared_extractor()
+    best = {"extract usec/file": float("inf"), "parse usec/file": float("inf")}
+    for _ in range(repeat):
+        extract = parse = 0.0
+        for path in paths:
+            start = time.perf_counter()
+            text = extractor.text(path, maxpages=1)
+            middle = time.perf_counter()
+            KrogerPdfParser.from_text(text)
+            extract += middle - start
+            parse += time.perf_counter() - middle
+        best["extract usec/file"] = min(best["extract usec/file"], extract / len(paths) * 1e6)
+        best["parse usec/file"] = min(best["parse usec/file"], parse / len(paths) * 1e6)
+    return best
+
+
+def command(args: List[str], directory: Path) -> Dict[str, float]:
+    """Run `kroger` with `args`, archiving under `directory`; return its seconds and peak RSS."""
+
+    config = directory / "kroger.toml"
+    config.write_text(f'[kroger]\narchive-path = "{directory / "archive"}"\n')
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).parents[1]))
+
+    start = time.perf_counter()
+    with subprocess.Popen(
+        [sys.executable, "-m", "kroger", "--config", str(config), *args],
+        stdout=subprocess.DEVNULL,
+        env=env,
+    ) as proc:
+        # `wait4` returns the resource usage of this child alone; `ru_maxrss` is in KiB.
+        _, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    seconds = time.perf_counter() - start
+
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    return {"seconds": seconds, "peak-rss MiB": rusage.ru_maxrss / 1024}
+
+
+def commands(paths: List[Path], directory: Path, repeat: int = 3) -> Dict[str, float]:
+    """Return files per second, and peak RSS, of each of `COMMANDS` over `paths`."""
+
+    results = {}
+    for label, args in COMMANDS.items():
+        runs = []
+        for n in range(repeat):
+            # A new archive each run; `archive` skips files already archived.
+            rundir = directory / f"{label.replace(' ', '')}-{n}"
+            rundir.mkdir()
+            runs.append(command([*args, *map(str, paths)], rundir))
+        results[f"{label} files/sec"] = len(paths) / min(x["seconds"] for x in runs)
+        results[f"{label} peak-rss MiB"] = max(x["peak-rss MiB"] for x in runs)
+    return results
+
+
+def regressions(
+    results: Dict[str, float], baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    """Return a description of each metric in `results` worse than `baseline` by `tolerance`.
+
+    Higher is better for `files/sec`; lower is better for everything else.
+    """
+
+    problems = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if name.endswith("files/sec"):
+            worse = value < expected * (1 - tolerance)
+        else:
+            worse = value > expected * (1 + tolerance)
+        if worse:
+            problems.append(f"{name} {value:.1f} regressed from baseline {expected:.1f}")
+    return problems
+
+
+def main() -> None:
+    """Run the benchmark; compare against, or update, the baseline."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=64, help="Number of payslips in corpus")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.4, help="Fraction worse than baseline allowed"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline json file")
+    parser.add_argument("--update", action="store_true", help="Rewrite the baseline")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        directory = Path(tmpdir)
+        (directory / "corpus").mkdir()
+        paths = corpus(directory / "corpus", options.files)
+        results = phases(paths)
+        results.update(commands(paths, directory))
+
+    baseline = json.loads(options.baseline.read_text()) if options.baseline.exists() else {}
+    print(f"{len(paths)} files, {len(VARIANTS)} layout variants")
+    for name, value in results.items():
+        print(f"{name:30} {value:10.1f} (baseline {baseline.get(name, float('nan')):10.1f})")
+
+    if options.update or not baseline:
+        results = {name: round(value, 1) for name, value in results.items()}
+        options.baseline.write_text(json.dumps(results, indent=4) + "\n")
+        print(f"Wrote {str(options.baseline)!r}")
+        return
+
+    if problems := regressions(results, baseline, options.tolerance):
+        for problem in problems:
+            print(f"error: {problem}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
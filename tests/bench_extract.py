@@ -0,0 +1,59 @@
+"""Benchmark: per-file cost of extracting and parsing `payslip-pdf` files, by extraction path.
+
+Compares `pdfminer.high_level.extract_text`, a new resource manager per
+file, against a shared `PdfExtractor`, and the text and layout engines.
+
+Run with `make bench`.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from pdfminer.high_level import extract_text
+from pdfminer.layout import LAParams
+from synthetic import payslip_pdf
+
+from kroger.extract import PdfExtractor
+from kroger.layout import KrogerLayoutParser
+from kroger.pdfparser import KrogerPdfParser
+
+
+def main() -> None:
+    """Time each path over the same corpus of payslips, each with a page of fine print."""
+
+    number = 20
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for n in range(number):
+            paths.append(Path(tmpdir, f"{n}.pdf"))
+            paths[-1].write_bytes(payslip_pdf(extra_pages=1))
+
+        extractor = PdfExtractor()
+        functions = {
+            "extract_text, per file": extract_text,
+            "PdfExtractor.text": extractor.text,
+            "PdfExtractor.text, 1 page": lambda x: extractor.text(x, maxpages=1),
+            "PdfExtractor.pages, no flow": lambda x: list(
+                extractor.pages(x, laparams=LAParams(boxes_flow=None))
+            ),
+            "extract_text + from_text": lambda x: KrogerPdfParser.from_text(extract_text(x)),
+            "KrogerPdfParser": KrogerPdfParser,
+            "KrogerLayoutParser": KrogerLayoutParser,
+        }
+
+        baseline = None
+        for label, function in functions.items():
+            seconds = []
+            for _ in range(3):
+                start = time.perf_counter()
+                for path in paths:
+                    function(path)
+                seconds.append(time.perf_counter() - start)
+            usec = min(seconds) / number * 1e6
+            baseline = baseline or usec
+            print(f"{label:30} {usec:10.1f} usec/file {baseline / usec:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
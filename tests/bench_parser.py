@@ -0,0 +1,40 @@
+"""Microbenchmark: per-document cost of `KrogerPdfParser`, excluding `pdfminer`.
+
+Run with `make bench`.
+"""
+
+import timeit
+from functools import partial
+
+from synthetic import payslip_text
+
+from kroger.pdfparser import KrogerPdfParser
+
+
+def main() -> None:
+    """Time parsing already-extracted text of each layout variant."""
+
+    variants = {
+        "division-above": {},
+        "division-below": {"division_above": False},
+        "tax-after": {"tax_before": False},
+        "additional-amount": {"additional_amount": True},
+        "no-sick-hours": {"sick_hours": False},
+    }
+    number = 2000
+    for name, kwargs in variants.items():
+        text = payslip_text(**kwargs)
+        for archive_flag in (False, True):
+            seconds = min(
+                timeit.repeat(
+                    partial(KrogerPdfParser.from_text, text, archive_flag=archive_flag),
+                    number=number,
+                    repeat=5,
+                )
+            )
+            label = f"{name}{' (archive)' if archive_flag else ''}"
+            print(f"{label:30} {seconds / number * 1e6:8.1f} usec/document")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Microbenchmark: cost of `KrogerMyTimeCmd.parse_schedule` over a multi-month schedule.
+
+Run with `make bench`.
+"""
+
+import contextlib
+import io
+import timeit
+from datetime import date
+from zoneinfo import ZoneInfo
+
+from synthetic import schedule_lines
+
+from kroger.mytime import KrogerMyTimeCmd
+
+
+def main() -> None:
+    """Time parsing synthetic schedules of increasing length."""
+
+    parse_schedule = KrogerMyTimeCmd.parse_schedule
+    zone = ZoneInfo("America/New_York")
+    for days in (14, 120, 730):
+        lines = schedule_lines(date(2023, 11, 25), days)
+        number = max(1, 20000 // days)
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds = min(
+                timeit.repeat(
+                    lambda lines=lines: list(parse_schedule(lines, zone, 2023, 11)),
+                    number=number,
+                    repeat=5,
+                )
+            )
+        print(
+            f"{days:4} days {len(lines):6} lines {seconds / number / days * 1e6:8.1f} usec/day"
+        )
+
+
+if __name__ == "__main__":
+    main()
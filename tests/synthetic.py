@@ -0,0 +1,230 @@
+"""Synthetic Kroger payslips, as text and as `.pdf` files; and MyTime schedules.
+
+The layout is a list of text boxes, each a list of lines, in the order
+`pdfminer` extracts them. Keyword arguments select the layout variants
+that `KrogerPdfParser` branches on.
+"""
+
+from datetime import date, timedelta
+from itertools import product
+
+DEDUCTIONS = ["Federal Withholding", "Social Security", "Medicare"]
+PAYMENT_DATE = date(2023, 9, 21)
+
+# Every combination of the layout variants.
+VARIANTS = [
+    dict(division_above=d, tax_before=t, additional_amount=a, sick_hours=s)
+    for d, t, a, s in product([True, False], repeat=4)
+]
+
+
+def payslip_boxes(
+    payment_date: date = PAYMENT_DATE,
+    period_days: int = 7,
+    hours: float = 8.5,
+    rate: float = 14.0,
+    ytd_gross: float = 4321.0,
+    division_above: bool = True,
+    tax_before: bool = True,
+    additional_amount: bool = False,
+    sick_hours: bool = True,
+) -> list:
+    """Return the text boxes of a payslip."""
+
+    # pylint: disable=too-many-arguments,too-many-locals
+
+    period_end = payment_date - timedelta(days=5)
+    period_begin = period_end - timedelta(days=period_days - 1)
+    gross = round(hours * rate, 2)
+    deductions = [round(gross * pct, 2) for pct in (0.05, 0.062, 0.0145)]
+    ytd_deductions = [round(ytd_gross * pct, 2) for pct in (0.05, 0.062, 0.0145)]
+    tax = round(sum(deductions), 2)
+    ytd_tax = round(sum(ytd_deductions), 2)
+    net = round(gross - tax, 2)
+    ytd_net = round(ytd_gross - ytd_tax, 2)
+
+    def mdy(day: date) -> str:
+        return day.strftime("%m/%d/%y")
+
+    division = [["Division: 660", "HR Location: 0660 Phoenix"]]
+    tax_deductions = [["Tax Deductions", f"{tax:,.2f}", f"{ytd_tax:,.2f}"]]
+
+    boxes = [
+        [
+            "Smith's Food and Drug Centers, Inc. (FEIN: 87-",
+            "0258768)",
+            "1014 Vine Street",
+            "Cincinnati OH 45202",
+        ],
+        ["Person Number: 1234567", "John Doe", "125 N. Main Street", "Anytown US 12345"],
+    ]
+    if division_above:
+        boxes += division
+    boxes += [
+        ["Period", "Payment Date", "Payroll"],
+        ["Pay Frequency"],
+        [f"{mdy(period_begin)} - {mdy(period_end)}", mdy(payment_date), "Retail Weekly Sun-Sat"],
+        ["Weekly"],
+    ]
+    if not division_above:
+        boxes += division
+    boxes += [
+        ["Hourly Rate"],
+        [f"{rate:.4f} USD"],
+        ["Type", "FEDERAL_2020", "AZ"],
+        ["Current", "Year To Date"],
+        ["Name", "Regular Pay"],
+        ["Marital Status", "Single"],
+        ["W4 Information"],
+        ["Exemptions", "0", "0"],
+    ]
+    if additional_amount:
+        boxes += [["Additional Amount", "0.00", "0.00"]]
+    boxes += [
+        ["Gross Earnings", f"{gross:.2f}", f"{ytd_gross:,.2f}"],
+        ["Non Payroll", "0.00", "0.00"],
+        [" Earnings"],
+        ["Summary"],
+        ["Pretax Deductions", "0.00", "0.00"],
+    ]
+    if tax_before:
+        boxes += tax_deductions
+    boxes += [
+        [
+            "Start Date End Date Hours  x  Rate  xi Factor  =  Current Hrs YTD Earnings YTD",
+            f"{ytd_gross:,.2f}",
+        ],
+        [f"{mdy(period_begin)} {mdy(period_end)} {hours:.2f} {rate:.2f} 1.0 {gross:.2f}"],
+    ]
+    if not tax_before:
+        boxes += tax_deductions
+    boxes += [
+        ["Name", "Employee Contribution", "Total"],
+        ["Taxes", "Name", *DEDUCTIONS],
+        ["Current", *[f"{x:.2f}" for x in deductions]],
+        ["Net Pay", f"{net:.2f}", f"{ytd_net:,.2f}"],
+        ["YTD", *[f"{x:,.2f}" for x in ytd_deductions]],
+        [f"Total Hours Worked: {hours:.2f}"],
+    ]
+    if sick_hours:
+        boxes += [["Sick Hours Available: 1.25"]]
+    boxes += [
+        ["Net Pay Distribution", "Payment Method", "Direct Deposit"],
+        ["Bank Name", "Bank of Nowhere"],
+        ["Branch", "Main"],
+        ["Account Type", "Checking"],
+        ["Payment Reference", "12345"],
+        ["Payment Amount", f"{net:.2f}"],
+    ]
+    return boxes
+
+
+def payslip_text(**kwargs) -> str:
+    """Return a payslip as `pdfminer.high_level.extract_text` would."""
+    return _text([payslip_boxes(**kwargs)])
+
+
+def payslip_pdf(
+    extra_pages: int = 0,
+    columns: int = 1,
+    split: bool = False,
+    font: str = "Helvetica",
+    **kwargs,
+) -> bytes:
+    """Return a payslip as a `.pdf` file, followed by `extra_pages` of fine print.
+
+    With `columns`, deal the text boxes across that many columns, so
+    they are no longer extracted in the order `KrogerPdfParser` expects.
+    With `split`, continue the payslip on a second page. Text is drawn
+    in standard Type1 `font`.
+    """
+
+    boxes = payslip_boxes(**kwargs)
+    pages = [boxes[: len(boxes) // 2], boxes[len(boxes) // 2 :]] if split else [boxes]
+    fine_print = [[f"Fine print line {i}. " * 5 for i in range(40)]] * 3
+    return _pdf(pages + [fine_print] * extra_pages, columns, font)
+
+
+def schedule_lines(start: date, days: int) -> list:
+    """Return `days` of a MyTime schedule from `start`, as `get_schedule` would.
+
+    Every third day is off; the others have a shift, and every fifth two.
+    """
+
+    lines = []
+    for n in range(days):
+        day = start + timedelta(days=n)
+        lines += [day.strftime("%a"), str(day.day)]
+        if n == 0:
+            lines.append("Today")
+        if n % 3 == 2:
+            lines.append("You have nothing planned.")
+            continue
+        lines.append("9:00 AM-1:30 PM [4.50]")
+        if n % 5 == 0:
+            lines.append("3:45 PM-7:45 PM [4.00]")
+    return lines
+
+
+def _text(pages: list) -> str:
+    return "".join(
+        "".join("".join(line + "\n" for line in box) + "\n" for box in boxes) + "\f"
+        for boxes in pages
+    )
+
+
+def _pdf(pages: list, columns: int = 1, font: str = "Helvetica") -> bytes:
+    """Return a minimal `.pdf` file that draws the text `boxes` of each of `pages`.
+
+    Boxes are dealt, in turn, to each of `columns`.
+    """
+
+    # Lines within a box are 12pt apart; boxes are separated by a 36pt gap,
+    # so `pdfminer` layout analysis reconstructs the same boxes. Columns
+    # are wider than the longest line.
+    height = 3000
+    width = 460
+    streams = []
+    for boxes in pages:
+        ops = ["BT", "/F1 10 Tf"]
+        ys = [height - 40] * columns
+        for n, box in enumerate(boxes):
+            x = 40 + width * (n % columns)
+            y = ys[n % columns]
+            for line in box:
+                text = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+                ops.append(f"1 0 0 1 {x} {y} Tm ({text}) Tj")
+                y -= 12
+            ys[n % columns] = y - 24
+        ops.append("ET")
+        streams.append("\n".join(ops).encode("latin-1"))
+
+    # objects: 1 font, 2 pages, then a content stream and page for each page, then catalog.
+    objs = [b"<< /Type /Font /Subtype /Type1 /BaseFont /%s >>" % font.encode(), b""]
+    kids = []
+    for stream in streams:
+        objs.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objs.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d]"
+            b" /Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>"
+            % (152 + width * columns, height, len(objs))
+        )
+        kids.append(b"%d 0 R" % len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objs) + 1,
+        len(objs),
+        xref,
+    )
+    return bytes(out)
@@ -0,0 +1,88 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+from synthetic import payslip_pdf, payslip_text
+
+from kroger.aggregate import aggregate, format_csv, format_json, format_txt
+from kroger.cli import main
+from kroger.payslip import Payslip
+from kroger.pdfparser import KrogerPdfParser
+
+# Paid 2023-09-21, 2024-09-19, 2023-10-05 and 2023-09-28; out of order, across years.
+PAYMENT_DATES = [date(2023, 9, 21), date(2024, 9, 19), date(2023, 10, 5), date(2023, 9, 28)]
+
+
+def _payslips():
+    return [
+        Payslip.from_pdf(KrogerPdfParser.from_text(payslip_text(payment_date=x)))
+        for x in PAYMENT_DATES
+    ]
+
+
+def test_aggregate_periods():
+    table = aggregate(_payslips(), "month")
+    assert table.columns == ("month", "payslips", "hours", "gross", "net")
+    # Paid 2023-10-05, for the period beginning 2023-09-24.
+    assert [row[:3] for row in table.rows] == [
+        ("2023-09", 3, Decimal("25.5")),
+        ("2024-09", 1, Decimal("8.5")),
+    ]
+
+    assert [(row[0], row[1]) for row in aggregate(_payslips(), "quarter").rows] == [
+        ("2023-Q3", 3),
+        ("2024-Q3", 1),
+    ]
+    year = aggregate(_payslips(), "year")
+    assert year.rows == [
+        ("2023", 3, Decimal("25.5"), Decimal("357.00"), Decimal("311.82")),
+        ("2024", 1, Decimal("8.5"), Decimal("119.00"), Decimal("103.94")),
+    ]
+
+
+def test_aggregate_deduction():
+    table = aggregate(_payslips(), "deduction")
+    assert table.rows == [
+        ("Federal Withholding", 4, Decimal("23.80")),
+        ("Medicare", 4, Decimal("6.92")),
+        ("Social Security", 4, Decimal("29.52")),
+    ]
+
+
+def test_formatters():
+    table = aggregate(_payslips(), "year")
+    assert list(format_txt(table)) == [
+        "Year Payslips Hours  Gross    Net",
+        "2023        3 25.50 357.00 311.82",
+        "2024        1  8.50 119.00 103.94",
+    ]
+    assert list(format_csv(table)) == [
+        "year,payslips,hours,gross,net",
+        "2023,3,25.50,357.00,311.82",
+        "2024,1,8.50,119.00,103.94",
+    ]
+    assert json.loads("\n".join(format_json(table)))[1] == {
+        "year": "2024",
+        "payslips": 1,
+        "hours": "8.50",
+        "gross": "119.00",
+        "net": "103.94",
+    }
+
+
+def test_print_unsorted(tmp_path, capsys):
+    config = tmp_path / "kroger.toml"
+    config.write_text("[kroger]\n")
+    pdfs = []
+    for payment_date in PAYMENT_DATES:
+        pdfs.append(tmp_path / f"{payment_date}.pdf")
+        pdfs[-1].write_bytes(payslip_pdf(payment_date=payment_date))
+
+    main(["--config", str(config), "print", "--no-cache", *map(str, pdfs)])
+    lines = capsys.readouterr().out.splitlines()
+    paydates = [line.split()[2] for line in lines if line[:4].isdigit()]
+    assert paydates == ["2023-09-21", "2023-09-28", "2023-10-05", "2024-09-19"]
+    # Sep 2023 and Sep 2024; each with its own header and subtotal.
+    assert lines.count("Begin      End        Paydate     Hours     Gross       Net") == 2
+    assert " " * 33 + " 25.50    357.00    311.82" in lines
+    assert " " * 33 + "  8.50    119.00    103.94" in lines
@@ -0,0 +1,53 @@
+import shutil
+from datetime import timedelta
+
+from synthetic import PAYMENT_DATE, payslip_pdf
+
+from kroger import archive
+from kroger.cli import main
+
+
+def _config(tmp_path):
+    config = tmp_path / "kroger.toml"
+    config.write_text(f'[kroger]\narchive-path = "{tmp_path / "archive"}"\n')
+    return str(config)
+
+
+def test_archive_sync(tmp_path, monkeypatch):
+    downloads = tmp_path / "Downloads"
+    downloads.mkdir()
+    (downloads / "USOnlinePayslip.pdf").write_bytes(payslip_pdf())
+    (downloads / "USOnlinePayslip (1).pdf").write_bytes(
+        payslip_pdf(payment_date=PAYMENT_DATE + timedelta(weeks=1))
+    )
+    shutil.copy(downloads / "USOnlinePayslip.pdf", downloads / "USOnlinePayslip (2).pdf")
+    (downloads / "unrelated.pdf").write_bytes(b"not a payslip")
+
+    main(["--config", _config(tmp_path), "archive", "--sync", str(downloads)])
+    archived = sorted(p.name for p in (tmp_path / "archive").glob("Kroger-*.pdf"))
+    assert archived == ["Kroger-2023-09-21.pdf", "Kroger-2023-09-28.pdf"]
+
+    # Nothing new; nothing parsed.
+    parsed = []
+
+    def _parse_payslips(payslip_pdfs, *args, **kwargs):
+        parsed.extend(payslip_pdfs)
+        return iter([])
+
+    monkeypatch.setattr(archive, "parse_payslips", _parse_payslips)
+    main(["--config", _config(tmp_path), "archive", "--sync", str(downloads)])
+    main(["--config", _config(tmp_path), "archive", str(downloads / "USOnlinePayslip (2).pdf")])
+    assert not parsed
+
+
+def test_archive_methods(tmp_path):
+    for week, method in enumerate(["copy", "hardlink", "reflink", "move"]):
+        source = tmp_path / f"{method}.pdf"
+        source.write_bytes(payslip_pdf(payment_date=PAYMENT_DATE + timedelta(weeks=week)))
+        inode = source.stat().st_ino
+        main(["--config", _config(tmp_path), "archive", "--method", method, str(source)])
+        target = tmp_path / "archive" / f"Kroger-{PAYMENT_DATE + timedelta(weeks=week)}.pdf"
+        assert target.exists()
+        assert source.exists() == (method != "move")
+        if method == "hardlink":
+            assert target.stat().st_ino == inode
@@ -0,0 +1,27 @@
+from bench_corpus import corpus, regressions
+
+from kroger.pdfparser import KrogerPdfParser
+
+
+def test_corpus(tmp_path):
+    paths = corpus(tmp_path, 17)
+    pdfs = [KrogerPdfParser(path) for path in paths]
+    assert [pdf.payslip["sick_hours_available"] for pdf in pdfs[:2]] == [1.25, None]
+    assert len({pdf.payslip["payment_date"] for pdf in pdfs}) == 17
+
+
+def test_regressions():
+    baseline = {"print files/sec": 30.0, "print peak-rss MiB": 40.0, "parse usec/file": 160.0}
+    assert not regressions(
+        {"print files/sec": 20.0, "print peak-rss MiB": 50.0, "new usec/file": 1e9},
+        baseline,
+        0.4,
+    )
+    assert regressions(
+        {"print files/sec": 15.0, "print peak-rss MiB": 60.0, "parse usec/file": 100.0},
+        baseline,
+        0.4,
+    ) == [
+        "print files/sec 15.0 regressed from baseline 30.0",
+        "print peak-rss MiB 60.0 regressed from baseline 40.0",
+    ]
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from kroger.cache import PayslipCache
+from kroger.pdfparser import KrogerPdfParser
+
+
+def _pdf(path, gross):
+    state = {name: None for name in KrogerPdfParser._state}
+    state["payslip"] = {"payment_date": datetime(2023, 9, 21)}
+    state["summary"] = {"gross": gross}
+    path.write_text(f"not really a pdf {gross}")
+    return KrogerPdfParser.from_dict(state, path)
+
+
+def test_cache_roundtrip(tmp_path):
+    pdf = _pdf(tmp_path / "a.pdf", 123.4)
+    with PayslipCache(tmp_path / "cache.sqlite") as cache:
+        key = cache.key(pdf.payslip_pdf)
+        assert cache.get(key, pdf.payslip_pdf) is None
+        cache.put(key, pdf)
+
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(pdf.payslip_pdf.read_bytes())
+    with PayslipCache(tmp_path / "cache.sqlite") as cache:
+        cached = cache.get(cache.key(copy), copy)
+    assert cached.payslip_pdf == copy
+    assert cached.to_dict() == pdf.to_dict()
+
+
+def test_cache_rebuild(tmp_path):
+    pdf = _pdf(tmp_path / "a.pdf", 123.4)
+    with PayslipCache(tmp_path / "cache.sqlite") as cache:
+        cache.put(cache.key(pdf.payslip_pdf), pdf)
+    with PayslipCache(tmp_path / "cache.sqlite", rebuild=True) as cache:
+        assert cache.get(cache.key(pdf.payslip_pdf), pdf.payslip_pdf) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    pdfs = [_pdf(tmp_path / f"{i}.pdf", float(i)) for i in range(5)]
+    with PayslipCache(tmp_path / "cache.sqlite", max_entries=3) as cache:
+        for pdf in pdfs:
+            cache.put(cache.key(pdf.payslip_pdf), pdf)
+        cache.get(cache.key(pdfs[0].payslip_pdf), pdfs[0].payslip_pdf)
+
+    with PayslipCache(tmp_path / "cache.sqlite") as cache:
+        assert len(cache) == 3
+        hits = [cache.get(cache.key(p.payslip_pdf), p.payslip_pdf) is not None for p in pdfs]
+    assert hits == [True, False, False, True, True]
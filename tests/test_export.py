@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from synthetic import PAYMENT_DATE, payslip_pdf
+
+from kroger.cli import main
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_export(tmp_path):
+    config = tmp_path / "kroger.toml"
+    config.write_text(f'[kroger]\narchive-path = "{tmp_path / "archive"}"\n')
+    files = []
+    for week in range(5):
+        path = tmp_path / f"USOnlinePayslip ({week}).pdf"
+        path.write_bytes(payslip_pdf(payment_date=PAYMENT_DATE + timedelta(weeks=week)))
+        files.append(str(path))
+
+    output = tmp_path / "payslips.parquet"
+    main(["--config", str(config), "export", "-o", str(output), "--batch-size", "2", *files])
+
+    parquet = pq.ParquetFile(output)
+    assert parquet.metadata.num_row_groups == 3
+    rows = parquet.read().to_pylist()
+    assert [row["payment_date"] for row in rows] == [
+        date(2023, 9, 21) + timedelta(weeks=week) for week in range(5)
+    ]
+    assert rows[0]["gross"] == Decimal("119.0")
+    assert rows[0]["hourly_rate"] == Decimal("14.0000")
+    assert [d["name"] for d in rows[0]["deductions"]] == [
+        "Federal Withholding",
+        "Social Security",
+        "Medicare",
+    ]
+    assert rows[0]["earnings"] == [
+        {
+            "name": "Regular Pay",
+            "current": None,
+            "ytd": Decimal("4321.00"),
+            "hours": None,
+            "rate": None,
+        }
+    ]
@@ -0,0 +1,59 @@
+import pytest
+from pdfminer.high_level import extract_pages, extract_text
+from pdfminer.layout import LAParams
+from synthetic import VARIANTS, payslip_pdf
+
+from kroger.extract import PdfExtractor
+from kroger.layout import KrogerLayoutParser
+from kroger.pdfparser import KrogerPdfParser
+
+
+def _layout(pages):
+    return [(type(x).__name__, x.bbox, x.get_text()) for page in pages for x in page]
+
+
+@pytest.mark.parametrize("variant", VARIANTS[:4])
+def test_extract_same_as_pdfminer(tmp_path, variant):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf(extra_pages=1, **variant))
+    extractor = PdfExtractor()
+    for _ in range(2):
+        assert extractor.text(path) == extract_text(path)
+        assert extractor.text(path, maxpages=1) == extract_text(path, maxpages=1)
+        laparams = LAParams(boxes_flow=None)
+        assert _layout(extractor.pages(path, laparams=laparams)) == _layout(
+            extract_pages(path, laparams=laparams)
+        )
+
+
+def test_extract_fonts_shared_by_content(tmp_path):
+    # Both files define their font as object 1; only their content tells them apart.
+    extractor = PdfExtractor()
+    for n, font in enumerate(["Helvetica", "Courier", "Helvetica", "Courier"]):
+        path = tmp_path / f"{n}.pdf"
+        path.write_bytes(payslip_pdf(font=font))
+        assert _layout(extractor.pages(path)) == _layout(extract_pages(path))
+    assert len(extractor.resources._shared_fonts) == 2
+
+
+def test_parse_first_page_only(tmp_path, monkeypatch):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf(extra_pages=2))
+    extracted = []
+    text = PdfExtractor.text
+
+    def _text(self, payslip_pdf, maxpages=0, laparams=None):
+        extracted.append(maxpages)
+        return text(self, payslip_pdf, maxpages, laparams)
+
+    monkeypatch.setattr(PdfExtractor, "text", _text)
+    assert KrogerPdfParser(path).summary["net_pay"] == 103.94
+    assert extracted == [1]
+
+
+def test_parse_layout_split(tmp_path):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf())
+    expected = KrogerLayoutParser(path).to_dict()
+    path.write_bytes(payslip_pdf(split=True, extra_pages=1))
+    assert KrogerLayoutParser(path).to_dict() == expected
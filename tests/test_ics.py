@@ -0,0 +1,95 @@
+import time
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from kroger.cli import main
+from kroger.ics import Event, diff_events, read_ics, write_ics
+
+MON = Event(datetime(2023, 11, 27, 9, 0), 180)
+MON2 = Event(datetime(2023, 11, 27, 15, 45), 240)
+TUE = Event(datetime(2023, 11, 28, 9, 15), 345)
+PAST = Event(datetime(2023, 11, 20, 9, 0), 180)
+WEEK = (date(2023, 11, 26), date(2023, 12, 2))  # the days the schedule covers.
+
+
+def test_write_read(tmp_path):
+    path = tmp_path / "schedule.ics"
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        write_ics(file, [MON, MON2], "Fry's; Store, #660", cancelled=[TUE])
+
+    text = path.read_bytes().decode()
+    assert text.startswith("BEGIN:VCALENDAR\r\n")
+    assert "UID:20231127T0900-180m@rlane-kroger\r\n" in text
+    assert "SUMMARY:Fry's\\; Store\\, #660\r\n" in text
+    assert read_ics(path) == [MON, MON2]  # not the cancelled event.
+
+
+def test_write_read_zone(tmp_path):
+    path = tmp_path / "schedule.ics"
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        write_ics(file, [MON, MON2], "Fry's", zone=ZoneInfo("America/Phoenix"))
+
+    text = path.read_bytes().decode()
+    assert "DTSTART:20231127T160000Z\r\n" in text
+    assert read_ics(path, ZoneInfo("America/Phoenix")) == [MON, MON2]
+    assert read_ics(path, ZoneInfo("America/New_York"))[0].start == datetime(2023, 11, 27, 11)
+
+
+def test_uid_is_stable():
+    assert Event(datetime(2023, 11, 27, 9, 0), 180).uid == MON.uid
+    assert len({MON.uid, MON2.uid, TUE.uid, Event(MON.start, 181).uid}) == 4
+
+
+def test_diff_events():
+    creates, deletes = diff_events([MON, TUE], [PAST, MON, MON2], WEEK)
+    assert creates == [TUE]
+    assert deletes == [MON2]  # not `PAST`, which has dropped off the schedule.
+
+    assert diff_events([MON, TUE], [MON, TUE], WEEK) == ([], [])
+
+    # The first shift, and every shift, cancelled.
+    assert diff_events([TUE], [MON, TUE], WEEK) == ([], [MON])
+    assert diff_events([], [MON, TUE], WEEK) == ([], [MON, TUE])
+
+
+def test_mytime_diff(tmp_path, capsys):
+    config = tmp_path / "kroger.toml"
+    config.write_text('[kroger]\ngoogle-calendar = "Work"\n')
+    diff = tmp_path / "last.ics"
+
+    main(["--config", str(config), "mytime", "--test1", "--diff", str(diff)])
+    first = capsys.readouterr().out
+    assert "# 6 to create, 0 to delete" in first
+    assert first.count("gcalcli add --calendar Work") == 6
+    assert len(read_ics(diff)) == 6
+
+    main(["--config", str(config), "mytime", "--test1", "--diff", str(diff)])
+    again = capsys.readouterr().out
+    assert "# 0 to create, 0 to delete" in again
+    assert "gcalcli" not in again
+
+
+def test_mytime_ics(tmp_path, capsys):
+    config = tmp_path / "kroger.toml"
+    config.write_text("[kroger]\n")
+    output = tmp_path / "schedule.ics"
+
+    main(["--config", str(config), "mytime", "--test1", "--format", "ics", "-o", str(output)])
+    assert "gcalcli" not in capsys.readouterr().out
+    assert len(read_ics(output)) == 6
+
+
+def test_mytime_local_time(tmp_path, capsys, monkeypatch):
+    # Scheduled 5 hours behind UTC; `gcalcli` runs in UTC.
+    config = tmp_path / "kroger.toml"
+    config.write_text('[kroger]\ntimezone = "Etc/GMT+5"\n')
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    try:
+        main(["--config", str(config), "mytime", "--test1"])
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    adds = [x for x in capsys.readouterr().out.splitlines() if x.startswith("gcalcli add")]
+    assert '-25 17:00"' in adds[0]  # "Sat 25", "12:00 PM-4:30 PM".
@@ -0,0 +1,127 @@
+import re
+from decimal import Decimal
+
+import pytest
+from synthetic import VARIANTS, payslip_pdf
+
+from kroger.batch import parse_payslips
+from kroger.cache import PayslipCache
+from kroger.layout import KrogerLayoutParser, LayoutIndex, Line
+from kroger.payslip import Payslip
+from kroger.pdfparser import KrogerPdfParser
+
+
+def _line(text, x0, top, width=40.0):
+    return Line(text, x0, top, x0 + width, top + 10.0)
+
+
+# Label "Total" over 1.00 and 2.00, then a gap; "Rate", on its row, far to the right.
+LINES = [
+    _line("Total", 40, 100),
+    _line("1.00", 40, 112),
+    _line("2.00", 50, 124),
+    _line("3.00", 40, 160),
+    _line("Rate", 400, 100),
+    _line("5.00 USD", 500, 100),
+    _line("9.00 USD", 40, 300),
+]
+
+
+def test_index_find():
+    index = LayoutIndex(reversed(LINES))
+    assert [x.text for x in index.lines[:3]] == ["Total", "Rate", "5.00 USD"]
+    assert index.find("Total") == [LINES[0]]
+    assert index.find("Nothing") == []
+    assert index.startswith("9.00") == LINES[-1]
+    assert index.startswith("Nothing") is None
+
+
+def test_index_below_and_right():
+    index = LayoutIndex(LINES)
+    assert [x.text for x in index.below(LINES[0])] == ["1.00", "2.00"]
+    assert index.below(LINES[4]) == []
+    assert [x.text for x in index.right(LINES[0])] == ["Rate", "5.00 USD"]
+    assert index.right(LINES[1]) == []
+
+
+def test_index_nearest():
+    index = LayoutIndex(LINES)
+    usd = re.compile(r".* USD$")
+    assert index.nearest(LINES[4], usd) == LINES[5]
+    assert index.nearest(LINES[0], usd) == LINES[6]
+    assert index.nearest(LINES[0], re.compile("^Nothing$")) is None
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+def test_parse_layout(tmp_path, variant):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf(extra_pages=1, **variant))
+    text = KrogerPdfParser(path)
+    layout = KrogerLayoutParser(path)
+
+    # The same as parsed by line order, and the earnings detail besides.
+    for name in ("company", "employee", "payslip", "summary", "tax_deductions", "distributions"):
+        assert getattr(layout, name) == getattr(text, name)
+    assert text.earnings[0]["current"] is None
+    assert layout.earnings == [
+        {
+            "name": "Regular Pay",
+            "current": "119.00",
+            "ytd": "4,321.00",
+            "hours": "8.50",
+            "rate": "14.00",
+        }
+    ]
+
+
+@pytest.mark.parametrize("columns", [2, 3])
+def test_parse_layout_any_order(tmp_path, capsys, columns):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf())
+    expected = KrogerLayoutParser(path).to_dict()
+
+    # Boxes dealt across columns; no longer in the order of the text parser.
+    path.write_bytes(payslip_pdf(columns=columns))
+    with pytest.raises(AssertionError):
+        KrogerPdfParser(path)
+    assert KrogerLayoutParser(path).to_dict() == expected
+
+
+def test_parse_layout_archive_flag(tmp_path):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf(columns=2))
+    pdf = KrogerLayoutParser(path, archive_flag=True)
+    assert f"{pdf.payslip['payment_date']:%Y-%m-%d}" == "2023-09-21"
+    assert pdf.summary is None
+
+
+def test_parse_layout_error(capsys):
+    lines = [_line("Smith's", 40, 100), _line("Person Number: 1234567", 40, 200)]
+    with pytest.raises(AssertionError, match="^no 'Period' value in 'bad.pdf'$"):
+        KrogerLayoutParser.from_lines(lines, "bad.pdf")
+    assert "'empno': '1234567'" in capsys.readouterr().out
+
+
+def test_payslip_earnings(tmp_path):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf())
+    earning = Payslip.from_pdf(KrogerLayoutParser(path)).earnings[0]
+    assert (earning.hours, earning.rate, earning.current) == (
+        Decimal("8.50"),
+        Decimal("14.00"),
+        Decimal("119.00"),
+    )
+
+
+def test_parse_payslips_engine(tmp_path):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf())
+    with PayslipCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.key(path) != cache.key(path, "layout")
+        for engine, current in [("text", None), ("layout", "119.00"), ("layout", "119.00")]:
+            (pdf,) = parse_payslips([path], cache=cache, engine=engine)
+            assert pdf.earnings[0]["current"] == current
+        assert len(cache) == 2
+
+    with pytest.raises(ValueError, match="Unknown pdf-engine 'ocr'"):
+        list(parse_payslips([path], engine="ocr"))
@@ -0,0 +1,98 @@
+import json
+import pstats
+import time
+
+import pytest
+from synthetic import payslip_pdf
+
+from kroger.batch import parse_payslips
+from kroger.cli import main
+from kroger.metrics import Metrics, metrics
+from kroger.mytime import KrogerMyTimeCmd
+
+
+def test_metrics():
+    recorded = Metrics()
+    for _ in range(2):
+        with recorded.phase("extract"):
+            pass
+    with pytest.raises(ValueError), recorded.phase("parse"):
+        raise ValueError
+    recorded.count("archived", 3)
+    assert recorded.calls == {"extract": 2, "parse": 1}
+
+    # From workers; apart from the time of the main process.
+    total = Metrics()
+    total.merge(recorded.to_dict())
+    total.merge(json.loads(json.dumps(recorded.to_dict())))
+    assert not total.calls
+    assert total.worker_calls == {"extract": 4, "parse": 2}
+    assert total.counters == {"archived": 6}
+
+    total.add("startup", 1.0)
+    total.worker_seconds.update({"extract": 8.0, "parse": 1.0})
+    assert total.report(5.0) == [
+        "phase                  seconds   calls percent",
+        "startup                  1.000       1   20.0%",
+        "other                    4.000           80.0%",
+        "total                    5.000",
+        "worker phase           seconds   calls",
+        "extract                  8.000       4",
+        "parse                    1.000       2",
+        "archived                     6",
+    ]
+    total.reset()
+    assert not total.to_dict()["phases"]
+
+
+def test_metrics_from_workers(tmp_path):
+    paths = []
+    for n in range(3):
+        paths.append(tmp_path / f"{n}.pdf")
+        paths[-1].write_bytes(payslip_pdf())
+    metrics.reset()
+    assert len(list(parse_payslips(paths, jobs=2))) == 3
+    assert metrics.worker_calls == {"extract": 3, "parse": 3}
+    assert not metrics.calls
+
+
+def test_profile(tmp_path, capsys):
+    config = tmp_path / "kroger.toml"
+    config.write_text(f'[kroger]\narchive-path = "{tmp_path / "archive"}"\n')
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf())
+
+    main(["--config", str(config), "--profile", "print", "--no-cache", str(path)])
+    out, err = capsys.readouterr()
+    assert "2023-09-21" in out
+    phases = [x.split()[2] for x in err.splitlines()[1:]]
+    assert {"startup", "extract", "parse", "other"} == set(phases[:-1])
+    assert phases[-1] == "total"
+
+    prefix = tmp_path / "run"
+    main(["--config", str(config), "--profile-output", str(prefix), "archive", str(path)])
+    assert "wrote" in capsys.readouterr().err
+    phases = json.loads(prefix.with_suffix(".json").read_text())
+    assert phases["counters"] == {"archived": 1}
+    assert set(phases["phases"]) == {"startup", "digest", "extract", "parse", "copy"}
+    assert pstats.Stats(str(prefix.with_suffix(".pstats"))).total_calls
+
+
+def test_parse_schedule_phase(tmp_path, monkeypatch):
+    parse_schedule = KrogerMyTimeCmd.parse_schedule
+
+    def _slow(*args, **kwargs):
+        for shift in parse_schedule(*args, **kwargs):
+            time.sleep(0.01)
+            yield shift
+
+    monkeypatch.setattr(KrogerMyTimeCmd, "parse_schedule", staticmethod(_slow))
+    monkeypatch.setattr(
+        KrogerMyTimeCmd, "get_schedule", lambda self: KrogerMyTimeCmd.example_schedule
+    )
+    config = tmp_path / "kroger.toml"
+    config.write_text("[kroger]\n")
+
+    main(["--config", str(config), "mytime", "--format", "ics", "-o", str(tmp_path / "x.ics")])
+    assert metrics.calls["parse schedule"] == 1
+    assert metrics.seconds["parse schedule"] >= 7 * 0.01  # shifts, with repeats.
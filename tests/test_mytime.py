@@ -0,0 +1,109 @@
+import sys
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from synthetic import schedule_lines
+
+from kroger.mytime import KrogerMyTimeCmd, Shift
+
+ZONE = ZoneInfo("America/New_York")
+
+
+def _parse(lines, year, mon):
+    return list(KrogerMyTimeCmd.parse_schedule(lines, ZONE, year, mon))
+
+
+def _dates(shifts):
+    return [f"{x.start:%Y-%m-%d %H:%M}" for x in shifts]
+
+
+def test_parse_schedule_does_not_change_input():
+    schedule = list(KrogerMyTimeCmd.example_schedule)
+    first = _parse(KrogerMyTimeCmd.example_schedule, 2023, 3)
+    assert KrogerMyTimeCmd.example_schedule == schedule
+    assert _parse(KrogerMyTimeCmd.example_schedule, 2023, 3) == first
+    assert _dates(first)[:3] == ["2023-03-25 12:00", "2023-03-25 12:00", "2023-03-26 13:00"]
+
+
+def test_parse_schedule_iterable():
+    lines = schedule_lines(date(2023, 11, 25), 14)
+    assert _parse(iter(lines), 2023, 11) == _parse(lines, 2023, 11)
+
+
+def test_parse_schedule_rollover():
+    shifts = _parse(schedule_lines(date(2023, 12, 20), 60), 2023, 12)
+    assert _dates(shifts)[0] == "2023-12-20 09:00"
+    assert _dates(shifts)[-1] == "2024-02-16 09:00"
+    assert len(shifts) == 40 + 8
+
+    # Without the 1st of the month.
+    schedule = ["Tue", "30", "9:00 AM-1:30 PM [4.50]", "Thu", "2", "9:00 AM-1:30 PM [4.50]"]
+    assert _dates(_parse(schedule, 2024, 1)) == ["2024-01-30 09:00", "2024-02-02 09:00"]
+
+
+def test_parse_schedule_short_month():
+    # Days 25-31; in a month without a 31st, days are counted on.
+    shifts = _parse(KrogerMyTimeCmd.example_schedule, 2023, 11)
+    assert _dates(shifts)[0] == "2023-11-25 12:00"
+    assert _dates(shifts)[-1] == "2023-12-01 12:00"
+
+    shifts = _parse(KrogerMyTimeCmd.example_schedule, 2023, 2)
+    assert _dates(shifts)[0] == "2023-02-25 12:00"
+    assert _dates(shifts)[-1] == "2023-03-03 12:00"
+
+    # A first day not in the month is in the month before.
+    schedule = ["Tue", "31", "9:00 AM-1:30 PM [4.50]", "Wed", "1", "9:00 AM-1:30 PM [4.50]"]
+    assert _dates(_parse(schedule, 2023, 11)) == ["2023-10-31 09:00", "2023-11-01 09:00"]
+
+
+def test_shift_parse():
+    shift = Shift.parse(date(2023, 11, 26), "1:15 PM-8:00 PM [6.75]", ZONE)
+    assert shift.start == datetime(2023, 11, 26, 13, 15, tzinfo=ZONE)
+    assert shift.end == datetime(2023, 11, 26, 20, 0, tzinfo=ZONE)
+    assert (shift.duration, shift.hours) == (405, 6.75)
+    assert shift.date == int(datetime(2023, 11, 26, 18, 15, tzinfo=timezone.utc).timestamp())
+    assert not hasattr(shift, "__dict__")
+
+    assert Shift.parse(date(2023, 11, 26), "You have nothing planned.", ZONE) is None
+
+    # With an unpaid break.
+    shift = Shift.parse(date(2023, 11, 26), "9:00 AM-5:30 PM [8.00]", ZONE)
+    assert (shift.duration, shift.hours) == (510, 8.0)
+    assert shift.problem() is None
+
+    shift = Shift.parse(date(2023, 11, 26), "9:00 AM-5:30 PM [9.00]", ZONE)
+    assert shift.hours == 9.0
+    assert "more than the shift" in shift.problem()
+
+
+def test_shift_overnight():
+    shift = Shift.parse(date(2023, 12, 31), "10:00 PM-6:30 AM [8.50]", ZONE)
+    assert shift.end == datetime(2024, 1, 1, 6, 30, tzinfo=ZONE)
+    assert shift.duration == 510
+
+    shift = Shift.parse(date(2023, 11, 26), "12:00 AM-12:30 AM [0.50]", ZONE)
+    assert (shift.start.hour, shift.duration) == (0, 30)
+
+
+def test_shift_dst():
+    # Clocks fall back an hour, then spring forward an hour, overnight.
+    fall = Shift.parse(date(2023, 11, 4), "10:00 PM-6:00 AM [9.00]", ZONE)
+    assert fall.duration == 9 * 60
+    spring = Shift.parse(date(2024, 3, 9), "10:00 PM-6:00 AM [7.00]", ZONE)
+    assert spring.duration == 7 * 60
+
+    # Cross-checked against the real length of the shift.
+    assert fall.problem() is None
+    shift = Shift.parse(date(2024, 3, 9), "10:00 PM-6:00 AM [8.00]", ZONE)
+    assert shift.problem() == "[8.00] hours is more than the shift, 7.00 hours"
+
+
+def test_parse_schedule_keeps_long_shift(capsys):
+    schedule = ["Sun", "26", "9:00 AM-5:30 PM [9.00]", "Mon", "27", "9:00 AM-12:00 PM [3.00]"]
+    assert _dates(_parse(schedule, 2023, 11)) == ["2023-11-26 09:00", "2023-11-27 09:00"]
+    assert "# warning: '9:00 AM-5:30 PM [9.00]' on 2023-11-26" in capsys.readouterr().out
+
+
+def test_shift_sizeof():
+    shift = Shift.parse(date(2023, 11, 26), "1:15 PM-8:00 PM [6.75]", ZONE)
+    assert sys.getsizeof(shift) <= 64
@@ -0,0 +1,89 @@
+import threading
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from kroger.mytime import Shift
+from kroger.mytimeapi import ScheduleClient, parse_shifts, schedule_urls
+
+RECORDED = (Path(__file__).parent / "mytime" / "schedule.json").read_bytes()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serve the recorded schedule response, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    requests: list = []
+    clients: set = set()
+
+    def do_GET(self):  # noqa: N802
+        self.requests.append((self.path, self.headers.get("Cookie")))
+        self.clients.add(self.client_address)
+        status, body = (200, RECORDED) if self.path.startswith("/api/") else (404, b"")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    Handler.requests = []
+    Handler.clients = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_schedule_client(server):
+    cookies = [
+        {"name": "session", "value": "s3cret", "domain": "127.0.0.1"},
+        {"name": "other", "value": "x", "domain": ".example.com"},
+    ]
+    endpoint = server + "/api/schedule?start={start}&end={end}"
+    urls = schedule_urls(endpoint, date(2023, 11, 25), 2)
+
+    with ScheduleClient(cookies) as client:
+        responses = [client.get_json(url) for url in urls]
+
+    assert Handler.requests == [
+        ("/api/schedule?start=2023-11-25&end=2023-12-01", "session=s3cret"),
+        ("/api/schedule?start=2023-12-02&end=2023-12-08", "session=s3cret"),
+    ]
+    assert len(Handler.clients) == 1  # one connection, reused.
+    assert list(parse_shifts(responses[0]))[1] == (
+        datetime(2023, 11, 26, 13, 0),
+        datetime(2023, 11, 26, 19, 30),
+    )
+
+
+def test_schedule_client_error(server):
+    with ScheduleClient([]) as client, pytest.raises(RuntimeError, match="404"):
+        client.get_json(server + "/missing")
+
+
+def test_schedule_urls_without_dates():
+    assert schedule_urls("https://x/api", date(2023, 11, 25), 3) == ["https://x/api"]
+
+
+def test_shift_from_datetimes():
+    zone = ZoneInfo("America/Phoenix")
+    scraped = Shift.parse(date(2023, 11, 26), "1:00 PM-7:30 PM [6.50]", zone)
+    shift = Shift.from_datetimes(
+        datetime(2023, 11, 26, 13, 0), datetime(2023, 11, 26, 19, 30), zone
+    )
+    assert shift == scraped
+    assert (shift.dayname, shift.daynum, shift.timestr) == ("Sun", 26, "1:00 PM-7:30 PM [6.50]")
+    shift = Shift.from_datetimes(
+        datetime(2023, 12, 1, 8, 15), datetime(2023, 12, 1, 12, 0), zone
+    )
+    assert shift.timestr == "8:15 AM-12:00 PM [3.75]"
@@ -0,0 +1,50 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from synthetic import DEDUCTIONS, payslip_text
+
+from kroger.payslip import Payslip, to_decimal
+from kroger.pdfparser import KrogerPdfParser
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", None),
+        (" ", None),
+        ("0.00", Decimal("0.00")),
+        ("4,321.00", Decimal("4321.00")),
+        ("14.0000 USD", Decimal("14.0000")),
+        ("(12.50)", Decimal("-12.50")),
+        (123.4, Decimal("123.4")),
+    ],
+)
+def test_to_decimal(value, expected):
+    assert to_decimal(value) == expected
+
+
+def test_to_decimal_error():
+    with pytest.raises(ValueError, match="Can't parse amount 'n/a'"):
+        to_decimal("n/a")
+
+
+def test_from_pdf():
+    payslip = Payslip.from_pdf(KrogerPdfParser.from_text(payslip_text()))
+    assert payslip.payment_date == date(2023, 9, 21)
+    assert payslip.period_begin == date(2023, 9, 10)
+    assert payslip.hourly_rate == Decimal("14.0000")
+    assert payslip.total_hours_worked == Decimal("8.5")
+    assert payslip.gross == Decimal("119.0")
+    assert payslip.gross_ytd == Decimal("4321.00")
+    assert payslip.net_pay == Decimal("103.94")
+    assert [d.name for d in payslip.deductions] == DEDUCTIONS
+    assert sum(d.current for d in payslip.deductions) == payslip.tax_deductions
+    assert payslip.distributions[0].payment_amount == payslip.net_pay
+
+
+def test_slots():
+    payslip = Payslip.from_pdf(KrogerPdfParser.from_text(payslip_text()))
+    assert not hasattr(payslip, "__dict__")
+    assert not hasattr(payslip.earnings[0], "__dict__")
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+from synthetic import DEDUCTIONS, VARIANTS, payslip_pdf, payslip_text
+
+from kroger.pdfparser import KrogerPdfParser, LineCursor
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+def test_parse_text(variant):
+    pdf = KrogerPdfParser.from_text(payslip_text(**variant))
+    assert pdf.company["division"] == "660"
+    assert pdf.employee["empno"] == "1234567"
+    assert pdf.payslip["payment_date"] == datetime(2023, 9, 21)
+    assert pdf.payslip["period_begin"] == datetime(2023, 9, 10)
+    assert pdf.payslip["period_end"] == datetime(2023, 9, 16)
+    assert pdf.payslip["hourly_rate"] == "14.0000 USD"
+    assert pdf.payslip["total_hours_worked"] == 8.5
+    assert pdf.payslip["sick_hours_available"] == (1.25 if variant["sick_hours"] else None)
+    assert pdf.summary["gross"] == 119.0
+    assert pdf.summary["tax_deductions"] == "15.06"
+    assert pdf.summary["net_pay"] == 103.94
+    assert [e["name"] for e in pdf.earnings] == ["Regular Pay"]
+    assert [d["name"] for d in pdf.tax_deductions] == DEDUCTIONS
+    assert [d["current"] for d in pdf.tax_deductions] == ["5.95", "7.38", "1.73"]
+    assert pdf.distributions[0]["payment_amount"] == "103.94"
+
+
+def test_parse_text_archive_flag():
+    pdf = KrogerPdfParser.from_text(payslip_text(), archive_flag=True)
+    assert pdf.payslip["payment_date"] == datetime(2023, 9, 21)
+    assert pdf.summary is None
+
+
+def test_parse_error_reports_line(capsys):
+    text = payslip_text().replace("Pay Frequency", "Pay Freq")
+    with pytest.raises(AssertionError) as err:
+        KrogerPdfParser.from_text(text, "bad.pdf")
+    assert str(err.value) == (
+        "text 'Pay Freq' != expected 'Pay Frequency' around line 18 of 'bad.pdf'"
+    )
+    assert "# PAYSLIP #" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("archive_flag", [False, True])
+def test_parse_pdf(tmp_path, archive_flag):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf(extra_pages=2))
+    pdf = KrogerPdfParser(path, archive_flag=archive_flag)
+    assert pdf.payslip_pdf == path
+    assert pdf.payslip["payment_date"] == datetime(2023, 9, 21)
+
+
+def test_cursor():
+    cursor = LineCursor(["a", "b", ""], abort=pytest.fail)
+    assert len(cursor) == 3
+    assert cursor.peek() == "a"
+    assert cursor.peek(1) == "b"
+    assert cursor.take() == "a"
+    cursor.expect("b")
+    assert cursor.pos == 2
+    assert len(cursor) == 1
+    cursor.take()
+    with pytest.raises(IndexError):
+        cursor.peek()
+
+
+def test_cursor_expect_aborts():
+    messages = []
+    cursor = LineCursor(["a"], abort=messages.append)
+    cursor.expect("b")
+    assert messages == ["text 'a' != expected 'b'"]
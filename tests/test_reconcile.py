@@ -0,0 +1,98 @@
+from datetime import date, datetime, timedelta
+
+from synthetic import PAYMENT_DATE, payslip_pdf
+
+from kroger.cli import main
+from kroger.ics import Event
+from kroger.reconcile import IntervalIndex
+from kroger.schedulestore import ScheduleStore
+
+
+def test_interval_index():
+    index = IntervalIndex(
+        [
+            (date(2023, 9, 17), date(2023, 9, 23), "b"),
+            (date(2023, 9, 10), date(2023, 9, 16), "a"),
+            (date(2023, 10, 1), date(2023, 10, 7), "c"),
+        ]
+    )
+    assert len(index) == 3
+    assert index.find(date(2023, 9, 9)) is None
+    assert index.find(date(2023, 9, 10)) == "a"
+    assert index.find(date(2023, 9, 16)) == "a"
+    assert index.find(date(2023, 9, 17)) == "b"
+    assert index.find(date(2023, 9, 27)) is None  # gap.
+    assert index.find(date(2023, 10, 7)) == "c"
+    assert index.find(date(2023, 10, 8)) is None
+
+    index = IntervalIndex(
+        [
+            (date(2023, 9, 10), date(2023, 9, 16), 2),
+            (date(2023, 9, 3), date(2023, 9, 16), 1),
+            (date(2023, 9, 17), date(2023, 9, 23), 3),
+        ]
+    )
+    assert len(index) == 2
+    assert index.overlaps == [(2, 1)]
+    assert index.find(date(2023, 9, 12)) == 1
+    assert index.find(date(2023, 9, 17)) == 3
+
+
+def test_reconcile(tmp_path, capsys):
+    # Two weekly payslips, for 8.5 and 12 hours; periods 9/10-9/16 and 9/17-9/23.
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    (archive / "Kroger-2023-09-21.pdf").write_bytes(payslip_pdf())
+    (archive / "Kroger-2023-09-28.pdf").write_bytes(
+        payslip_pdf(payment_date=PAYMENT_DATE + timedelta(weeks=1), hours=12.0)
+    )
+
+    store = ScheduleStore(tmp_path / "schedule.json")
+    store.update(
+        [
+            Event(datetime(2023, 9, 9, 9, 0), 240, 4.0),  # before any period.
+            Event(datetime(2023, 9, 11, 9, 0), 270, 4.5),
+            Event(datetime(2023, 9, 16, 12, 0), 240, 4.0),
+            Event(datetime(2023, 9, 18, 9, 0), 510, 8.0),  # with a break.
+            Event(datetime(2023, 9, 30, 9, 0), 240),  # after.
+        ],
+        (date(2023, 9, 9), date(2023, 9, 30)),
+    )
+    store.save()
+
+    config = tmp_path / "kroger.toml"
+    config.write_text(f'[kroger]\narchive-path = "{archive}"\nschedule-store = "{store.path}"\n')
+
+    main(["--config", str(config), "reconcile"])
+    assert capsys.readouterr().out.splitlines() == [
+        "Begin      End        Shifts  Paid Scheduled   Diff",
+        "2023-09-10 2023-09-16      2  8.50      8.50   0.00",
+        "2023-09-17 2023-09-23      1 12.00      8.00   4.00 *",
+        "# 1 of 2 periods mismatched",
+    ]
+
+    main(["--config", str(config), "reconcile", "--mismatches", "--tolerance", "5"])
+    assert capsys.readouterr().out.splitlines()[1:] == ["# 0 of 2 periods mismatched"]
+
+
+def test_reconcile_overlapping_periods(tmp_path, capsys):
+    # A two week period, 9/3-9/16, overlaps the weekly 9/10-9/16.
+    paths = [tmp_path / "biweekly.pdf", tmp_path / "weekly.pdf"]
+    paths[0].write_bytes(payslip_pdf(period_days=14))
+    paths[1].write_bytes(payslip_pdf())
+
+    store = ScheduleStore(tmp_path / "schedule.json")
+    shift = Event(datetime(2023, 9, 12, 9, 0), 540, 8.5)
+    store.update([shift], (shift.start.date(), shift.start.date()))
+    store.save()
+
+    config = tmp_path / "kroger.toml"
+    config.write_text(f'[kroger]\nschedule-store = "{store.path}"\n')
+
+    main(["--config", str(config), "reconcile", *map(str, paths)])
+    assert capsys.readouterr().out.splitlines() == [
+        "Begin      End        Shifts  Paid Scheduled   Diff",
+        "2023-09-03 2023-09-16      1  8.50      8.50   0.00",
+        "# period 2023-09-10..2023-09-16 overlaps 2023-09-03..2023-09-16; skipped",
+        "# 0 of 1 periods mismatched",
+    ]
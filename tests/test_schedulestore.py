@@ -0,0 +1,98 @@
+from datetime import date, datetime, timedelta
+
+from kroger.cli import main
+from kroger.ics import Event
+from kroger.schedulestore import ScheduleStore
+
+SUN = Event(datetime(2023, 11, 26, 13, 0), 390)
+MON = Event(datetime(2023, 11, 27, 9, 0), 180)
+MON2 = Event(datetime(2023, 11, 27, 15, 45), 240)
+MON3 = Event(datetime(2023, 11, 27, 16, 0), 240)
+TUE = Event(datetime(2023, 11, 28, 9, 15), 345)
+PAST = Event(datetime(2023, 11, 20, 9, 0), 180)
+WEEK = (date(2023, 11, 26), date(2023, 12, 2))  # the days the schedule covers.
+
+
+def test_store_roundtrip(tmp_path):
+    path = tmp_path / "schedule.json"
+    store = ScheduleStore(path)
+    assert not store.days
+    store.update([MON, MON2, TUE], WEEK)
+    store.save()
+
+    store = ScheduleStore(path)
+    assert store.days == {
+        date(2023, 11, 27): frozenset([MON, MON2]),
+        date(2023, 11, 28): frozenset([TUE]),
+    }
+    assert not store.diff([MON2, TUE, MON], WEEK)
+
+
+def test_store_diff(tmp_path):
+    store = ScheduleStore(tmp_path / "schedule.json")
+    store.update([PAST], (PAST.start.date(), PAST.start.date()))
+    store.update([MON, MON2, TUE], WEEK)
+
+    changes = store.diff([SUN, MON, MON3], WEEK)
+    assert changes.added == {date(2023, 11, 26): frozenset([SUN])}
+    assert changes.removed == {date(2023, 11, 28): frozenset([TUE])}  # not `PAST`.
+    assert changes.changed == {
+        date(2023, 11, 27): (frozenset([MON, MON2]), frozenset([MON, MON3])),
+    }
+    assert changes.creates == [SUN, MON3]
+    assert changes.deletes == [MON2, TUE]
+    assert not changes.updates
+
+    # Every shift cancelled.
+    assert store.diff([], WEEK).deletes == [MON, MON2, TUE]
+
+
+def test_store_first_shift_cancelled(tmp_path):
+    store = ScheduleStore(tmp_path / "schedule.json")
+    store.update([MON, TUE], WEEK)
+
+    changes = store.diff([TUE], WEEK)
+    assert changes.removed == {date(2023, 11, 27): frozenset([MON])}
+    assert (changes.creates, changes.deletes) == ([], [MON])
+
+    store.update([TUE], WEEK)
+    assert store.days == {date(2023, 11, 28): frozenset([TUE])}
+
+
+def test_store_hours_changed(tmp_path):
+    store = ScheduleStore(tmp_path / "schedule.json")
+    store.update([MON, TUE], WEEK)
+
+    changes = store.diff([MON._replace(hours=2.5), TUE], WEEK)
+    assert changes
+    assert changes.updates == [MON._replace(hours=2.5)]
+    assert (changes.creates, changes.deletes) == ([], [])
+
+
+def test_store_keeps_history(tmp_path):
+    store = ScheduleStore(tmp_path / "schedule.json")
+    store.update([PAST, MON._replace(hours=2.5)], (PAST.start.date(), MON.start.date()))
+    store.update([TUE], (TUE.start.date(), TUE.start.date() + timedelta(days=6)))
+    store.save()
+    assert ScheduleStore(store.path).days == {
+        date(2023, 11, 20): frozenset([PAST]),
+        date(2023, 11, 27): frozenset([MON._replace(hours=2.5)]),
+        date(2023, 11, 28): frozenset([TUE]),
+    }
+
+
+def test_mytime_changes(tmp_path, capsys):
+    store = tmp_path / "schedule.json"
+    config = tmp_path / "kroger.toml"
+    config.write_text(f'[kroger]\nschedule-store = "{store}"\n')
+
+    main(["--config", str(config), "mytime", "--test1", "--changes"])
+    out = capsys.readouterr().out
+    assert out.count("# added") == 5
+    assert out.count("gcalcli add") == 6
+    assert store.exists()
+
+    mtime = store.stat().st_mtime_ns
+    main(["--config", str(config), "mytime", "--test1", "--changes"])
+    assert "gcalcli" not in capsys.readouterr().out
+    assert store.stat().st_mtime_ns == mtime
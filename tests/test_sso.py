@@ -0,0 +1,180 @@
+import shutil
+import socket
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from kroger import sso as sso_module
+from kroger.sso import (
+    MYTIME_HOME,
+    PASSWORD,
+    SUBMIT,
+    USER,
+    Browser,
+    SsoSession,
+    SsoTimeoutError,
+    listening,
+)
+
+PAGES = Path(__file__).parent / "sso"
+
+
+class FakeElement:
+    def __init__(self, driver, locator):
+        self.driver = driver
+        self.locator = locator
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def send_keys(self, text):
+        self.driver.events.append(("send_keys", self.locator, text))
+
+    def click(self):
+        self.driver.events.append(("click", self.locator))
+        self.driver.page += 1
+
+
+class FakeDriver:
+    """The user page, then the password page, then signed on."""
+
+    pages = [{USER, SUBMIT}, {PASSWORD, SUBMIT}, {MYTIME_HOME}]
+
+    def __init__(self, missing=(), page=0):
+        self.missing = set(missing)
+        self.page = page
+        self.events = []
+
+    def get(self, url):
+        self.events.append(("get", url))
+
+    def find_element(self, by, value):
+        locator = (by, value)
+        if locator in self.missing or locator not in self.pages[self.page]:
+            raise NoSuchElementException(value)
+        return FakeElement(self, locator)
+
+
+def test_login_waits_for_each_step():
+    driver = FakeDriver()
+    sso = SsoSession(driver, timeout=1)
+    sso.login("https://sso.example", "me", "secret")
+    assert [step for step, _ in sso.timings] == [
+        "user field",
+        "user submit",
+        "password field",
+        "password submit",
+        "signon",
+    ]
+    assert driver.events == [
+        ("get", "https://sso.example"),
+        ("send_keys", USER, "me"),
+        ("click", SUBMIT),
+        ("send_keys", PASSWORD, "secret"),
+        ("click", SUBMIT),
+    ]
+
+
+def test_login_timeout_names_step(capsys):
+    driver = FakeDriver(missing=[PASSWORD])
+    sso = SsoSession(driver, timeout=0.2, verbose=True)
+    with pytest.raises(SsoTimeoutError, match="0.2 seconds waiting for password field") as e:
+        sso.login("https://sso.example", "me", "secret")
+    assert e.value.step == "password field"
+    assert [step for step, _ in sso.timings] == ["user field", "user submit"]
+    assert "# sso: user submit ready in" in capsys.readouterr().out
+
+
+def test_login_reuses_session(capsys):
+    driver = FakeDriver(page=2)
+    sso = SsoSession(driver, timeout=1, verbose=True)
+    assert not sso.login("https://sso.example", "me", "secret", signed_on=MYTIME_HOME)
+    assert driver.events == [("get", "https://sso.example")]
+    assert [step for step, _ in sso.timings] == ["session"]
+    assert "# sso: reusing session" in capsys.readouterr().out
+
+
+def test_login_expired_session():
+    driver = FakeDriver()
+    sso = SsoSession(driver, timeout=1)
+    assert sso.login("https://sso.example", "me", "secret", signed_on=MYTIME_HOME)
+    assert [step for step, _ in sso.timings][:2] == ["session", "user field"]
+    assert driver.page == 2
+
+
+def test_listening():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        address = f"127.0.0.1:{server.getsockname()[1]}"
+        assert listening(address)
+    assert not listening(address)
+    assert not listening("nonsense")
+
+
+class FakeChrome:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.calls = []
+        self.switch_to = self
+        self.service = self
+
+    def new_window(self, kind):
+        self.calls.append(("new_window", kind))
+
+    def close(self):
+        self.calls.append("close")
+
+    def stop(self):
+        self.calls.append("stop")
+
+    def quit(self):
+        self.calls.append("quit")
+
+
+@pytest.mark.parametrize("attach", [True, False])
+def test_browser(monkeypatch, attach):
+    monkeypatch.setattr(sso_module, "listening", lambda address: attach)
+    monkeypatch.setattr(sso_module, "new_driver", lambda config, **kwargs: FakeChrome(**kwargs))
+    config = {"browser-address": "127.0.0.1:9222", "browser-profile": ""}
+
+    with Browser(config, headless=True) as driver:
+        pass
+
+    if attach:
+        assert driver.kwargs == {"address": "127.0.0.1:9222"}
+        assert driver.calls == [("new_window", "tab"), "close", "stop"]
+    else:
+        assert driver.kwargs == {"headless": True}
+        assert driver.calls == ["quit"]
+
+
+@pytest.fixture(name="chrome")
+def fixture_chrome():
+    if not (shutil.which("chromedriver") or shutil.which("google-chrome")):
+        pytest.skip("no chrome browser")
+
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except WebDriverException as e:
+        pytest.skip(f"can't start chrome: {e.msg}")
+    yield driver
+    driver.quit()
+
+
+def test_login_static_pages(chrome, capsys):
+    sso = SsoSession(chrome, timeout=5, verbose=True)
+    sso.login((PAGES / "signon.html").as_uri(), "me", "secret")
+    schedule = sso.visible("schedule", (By.XPATH, "//ng-myschedule-list"))
+    assert schedule.text.splitlines() == ["Sun", "26", "1:00 PM-7:30 PM [6.50]"]
+    assert chrome.find_element(By.ID, "user").text == "me"
+    assert "# sso: signon ready in" in capsys.readouterr().out
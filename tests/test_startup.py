@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Imported only by the commands that use them.
+HEAVY_MODULES = ["selenium", "pdfminer", "pyarrow", "sqlite3", "concurrent.futures.process"]
+
+# Generous; `kroger.cli` itself takes about 0.1 second.
+IMPORT_BUDGET_USEC = 1_000_000
+
+
+def _importtime(*args):
+    """Return {module: cumulative-usec} of `python -X importtime` running `kroger *args`."""
+
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).parents[1]))
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys; from kroger.cli import main; main(sys.argv[1:])",
+            *args,
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    assert proc.returncode == 0, proc.stderr
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--help"],
+        ["--completion", "bash"],
+        ["print", "--help"],
+        ["archive", "--help"],
+        ["myinfo", "--help"],
+        ["mytime", "--help"],
+    ],
+)
+def test_startup_imports(args):
+    modules = _importtime(*args)
+    assert "kroger.cli" in modules
+    heavy = [m for m in modules if m.split(".")[0] in HEAVY_MODULES or m in HEAVY_MODULES]
+    assert not heavy
+    assert modules["kroger.cli"] < IMPORT_BUDGET_USEC
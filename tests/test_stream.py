@@ -0,0 +1,82 @@
+import contextlib
+import gc
+import os
+import tracemalloc
+
+import pytest
+from synthetic import payslip_pdf
+
+from kroger import batch
+from kroger.batch import parse_payslips
+from kroger.cli import main
+from kroger.extract import shared_extractor
+from kroger.payslip import Payslip
+
+
+def _peak(function, *args):
+    """Return the peak memory allocated by `function(*args)`, printing to /dev/null."""
+
+    gc.collect()
+    with open(os.devnull, "w", encoding="utf-8") as null, contextlib.redirect_stdout(null):
+        tracemalloc.start()
+        try:
+            function(*args)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+@pytest.fixture(name="path")
+def _path(tmp_path, monkeypatch):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(payslip_pdf())
+    # Collect `pdfminer`'s reference cycles often, to see a ceiling in a few files.
+    monkeypatch.setattr(shared_extractor(), "collect_every", 2)
+    return path
+
+
+def test_parse_payslips_memory(path):
+    def _parse(number):
+        for pdf in parse_payslips(path for _ in range(number)):
+            Payslip.from_pdf(pdf)
+
+    _parse(2)
+    assert _peak(_parse, 12) < _peak(_parse, 4) + 16 * 1024
+
+
+# Bytes per file allowed; the paths on the command line, and, to sort, what's listed.
+@pytest.mark.parametrize(
+    "args, per_file",
+    [(["--csv"], 1024), (["--json"], 1024), (["--by", "month"], 1024), ([], 1536)],
+)
+def test_print_memory(tmp_path, path, args, per_file):
+    config = tmp_path / "kroger.toml"
+    config.write_text(f'[kroger]\narchive-path = "{tmp_path / "archive"}"\n')
+
+    def _print(number):
+        main(["--config", str(config), "print", *args, *[str(path)] * number])
+
+    # Parsed once; then, from the cache, quick enough to print a few hundred.
+    _print(2)
+    assert _peak(_print, 200) < _peak(_print, 50) + 150 * per_file
+
+
+def test_parse_payslips_window(path, monkeypatch):
+    monkeypatch.setattr(batch, "WINDOW", 2)
+    read = []
+
+    def _paths():
+        for n in range(20):
+            read.append(n)
+            yield path
+
+    parsed = parse_payslips(_paths(), jobs=2)
+    next(parsed)
+    assert len(read) == 2 * 2
+    assert len(list(parsed)) == 19
+    assert len(read) == 20
+
+    read.clear()
+    parsed = parse_payslips(_paths())
+    next(parsed)
+    assert read == [0]
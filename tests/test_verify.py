@@ -0,0 +1,72 @@
+from dataclasses import replace
+from datetime import date, timedelta
+from decimal import Decimal
+
+from synthetic import payslip_pdf, payslip_text
+
+from kroger.cli import main
+from kroger.payslip import Payslip
+from kroger.pdfparser import KrogerPdfParser
+from kroger.verify import verify
+
+# Weekly, for 200.00 gross; whose deductions are exact to the cent.
+FIRST = date(2023, 12, 14)
+
+
+def _payslip(week: int, ytd_week: int = 0) -> Payslip:
+    payment_date = FIRST + timedelta(weeks=week)
+    # The year-to-date restarts with the first payment of 2024, in week 3.
+    ytd_gross = 200.0 * (ytd_week or (week - 2 if week >= 3 else week + 40))
+    text = payslip_text(payment_date=payment_date, hours=10.0, rate=20.0, ytd_gross=ytd_gross)
+    return Payslip.from_pdf(KrogerPdfParser.from_text(text))
+
+
+def test_verify_consistent():
+    payslips = [_payslip(week) for week in range(6)]
+    assert not list(verify(reversed(payslips)))
+
+
+def test_verify_problems():
+    payslips = [_payslip(week) for week in (0, 1, 2, 3, 6)]
+    payslips[1] = replace(payslips[1], gross_ytd=payslips[1].gross_ytd + 1)
+    payslips[3] = replace(payslips[3], net_pay=Decimal("175.70"))
+    problems = [(x.payment_date, problem) for x, problem in verify(payslips)]
+    assert problems == [
+        (date(2023, 12, 21), "gross_ytd 8201.00 != 8200.00 previous plus current"),
+        (date(2023, 12, 28), "gross_ytd 8400.00 != 8401.00 previous plus current"),
+        (date(2024, 1, 4), "net_pay 175.70 != 174.70 gross less deductions"),
+        (date(2024, 1, 4), "net_pay_ytd 174.70 != 175.70 previous plus current"),
+        (date(2024, 1, 25), "missing 2 pay periods 2023-12-31..2024-01-13"),
+    ]
+
+
+def test_verify_cmd(tmp_path, capsys):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    for week in (0, 1, 3):
+        payment_date = FIRST + timedelta(weeks=week)
+        (archive / f"Kroger-{payment_date}.pdf").write_bytes(
+            payslip_pdf(payment_date=payment_date, hours=10.0, rate=20.0, ytd_gross=200.0 * 41)
+        )
+    (archive / "Kroger-2024-02-01.pdf").write_bytes(b"%PDF-1.4 garbage")
+
+    config = tmp_path / "kroger.toml"
+    config.write_text(f'[kroger]\narchive-path = "{archive}"\n')
+
+    main(["--config", str(config), "verify"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith(f"{archive}/Kroger-2024-02-01.pdf: error: ")
+    assert lines[1:] == [
+        "2023-12-21 Kroger-2023-12-21.pdf: gross_ytd 8200.00 != 8400.00 previous plus current",
+        "2023-12-21 Kroger-2023-12-21.pdf: tax_deductions_ytd 1037.30 != 1062.60"
+        " previous plus current",
+        "2023-12-21 Kroger-2023-12-21.pdf: net_pay_ytd 7162.70 != 7337.40 previous plus current",
+        "2023-12-21 Kroger-2023-12-21.pdf: deduction 'Federal Withholding' ytd 410.00"
+        " != 420.00 previous plus current",
+        "2023-12-21 Kroger-2023-12-21.pdf: deduction 'Social Security' ytd 508.40"
+        " != 520.80 previous plus current",
+        "2023-12-21 Kroger-2023-12-21.pdf: deduction 'Medicare' ytd 118.90"
+        " != 121.80 previous plus current",
+        "2024-01-04 Kroger-2024-01-04.pdf: missing 1 pay periods 2023-12-17..2023-12-23",
+        "# 8 problems in 4 payslips",
+    ]
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+import pytest
+
+from kroger.watch import DirectoryWatcher
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watch(tmp_path, use_inotify):
+    (tmp_path / "USOnlinePayslip.pdf").write_bytes(b"old")
+    (tmp_path / "other.pdf").write_bytes(b"other")
+
+    def _download():
+        time.sleep(0.3)
+        (tmp_path / "USOnlinePayslip (1).pdf").write_bytes(b"new")
+        (tmp_path / "USOnlinePayslip (2).pdf").write_bytes(b"new")
+
+    with DirectoryWatcher(
+        tmp_path, "USOnlinePayslip*.pdf", settle=0.2, interval=0.05, use_inotify=use_inotify
+    ) as watcher:
+        batches = iter(watcher)
+        assert next(batches) == [tmp_path / "USOnlinePayslip.pdf"]
+        threading.Thread(target=_download).start()
+        assert next(batches) == [
+            tmp_path / "USOnlinePayslip (1).pdf",
+            tmp_path / "USOnlinePayslip (2).pdf",
+        ]
+
+
+def test_watch_debounce(tmp_path):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(b"partial")
+    watcher = DirectoryWatcher(tmp_path, "*.pdf", settle=10, use_inotify=False)
+    watcher._update([path])
+    since = watcher._pending[path][1]
+    assert not watcher._ready(since + 5)
+
+    path.write_bytes(b"partial, and then some")
+    watcher._update([])
+    assert not watcher._ready(since + 10)
+    assert watcher._ready(watcher._pending[path][1] + 10) == [path]
+
+    # Unchanged; not yielded again.
+    watcher._update([path])
+    assert not watcher._pending
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watch_forgets_removed(tmp_path, use_inotify):
+    path = tmp_path / "USOnlinePayslip.pdf"
+    path.write_bytes(b"payslip")
+    st = path.stat()
+    with DirectoryWatcher(
+        tmp_path, "*.pdf", settle=0, interval=0.01, use_inotify=use_inotify
+    ) as watcher:
+        watcher._update([path])
+        assert watcher._ready(time.monotonic()) == [path]
+
+        path.unlink()
+        watcher._update(watcher._wait())
+        assert not watcher._done
+
+        # Dropped again, identical; yielded again.
+        path.write_bytes(b"payslip")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        watcher._update(watcher._wait())
+        assert watcher._ready(time.monotonic()) == [path]